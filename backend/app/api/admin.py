@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -9,9 +10,20 @@ from app.models.review import Review, ReviewFlag
 from app.schemas.user import UserRead
 from app.schemas.vendor import VendorSummary
 from app.utils.auth import require_admin
+from app.utils.responses import fast_json
+from app.services.indexes import refresh_vendor
+from app.services.vendor_versions import bump_version
+from app.services.hours_service import schedule_dedup_stats
+from app.services.status_cache import status_cache
+from app.services.response_cache import response_cache
+from app.services.cache import cache
+from app.services.vendor_snapshots import vendor_snapshots
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
+# List endpoints select just the columns they return and serialize the rows directly
+_USER_COLUMNS = [getattr(User, name) for name in UserRead.model_fields]
+
 
 @router.get("/users", response_model=List[UserRead])
 def list_users(
@@ -21,12 +33,12 @@ def list_users(
     db: Session = Depends(get_db),
     _: User = Depends(require_admin),
 ):
-    query = db.query(User)
+    query = db.query(*_USER_COLUMNS)
     if q:
         query = query.filter(
             User.email.ilike(f"%{q}%") | User.username.ilike(f"%{q}%")
         )
-    return query.offset(offset).limit(limit).all()
+    return fast_json([row._asdict() for row in query.offset(offset).limit(limit).all()])
 
 
 @router.patch("/users/{user_id}/disable")
@@ -81,26 +93,23 @@ def list_vendors(
     db: Session = Depends(get_db),
     _: User = Depends(require_admin),
 ):
-    query = db.query(Vendor)
+    query = db.query(
+        Vendor.id, Vendor.name, Vendor.slug,
+        Vendor.status, Vendor.category,
+        Vendor.city, Vendor.state,
+        Vendor.average_rating,
+        Vendor.review_count,
+    )
     if status:
         query = query.filter(Vendor.status == status)
     if q:
         query = query.filter(Vendor.name.ilike(f"%{q}%"))
     total = query.count()
-    vendors = query.offset(offset).limit(limit).all()
-    return {
+    rows = query.offset(offset).limit(limit).all()
+    return fast_json({
         "total": total,
-        "items": [
-            {
-                "id": v.id, "name": v.name, "slug": v.slug,
-                "status": v.status, "category": v.category,
-                "city": v.city, "state": v.state,
-                "average_rating": v.average_rating,
-                "review_count": v.review_count,
-            }
-            for v in vendors
-        ]
-    }
+        "items": [row._asdict() for row in rows],
+    })
 
 
 @router.patch("/vendors/{vendor_id}/approve")
@@ -113,7 +122,9 @@ def approve_vendor(
     if not vendor:
         raise HTTPException(status_code=404, detail="Vendor not found")
     vendor.status = VendorStatus.active
+    bump_version(db, vendor.id)
     db.commit()
+    refresh_vendor(vendor)
     return {"message": "Vendor approved"}
 
 
@@ -127,7 +138,9 @@ def suspend_vendor(
     if not vendor:
         raise HTTPException(status_code=404, detail="Vendor not found")
     vendor.status = VendorStatus.suspended
+    bump_version(db, vendor.id)
     db.commit()
+    refresh_vendor(vendor)
     return {"message": "Vendor suspended"}
 
 
@@ -142,7 +155,9 @@ def toggle_featured(
     if not vendor:
         raise HTTPException(status_code=404, detail="Vendor not found")
     vendor.is_featured = featured
+    bump_version(db, vendor.id)
     db.commit()
+    refresh_vendor(vendor)
     return {"message": f"Vendor featured={featured}"}
 
 
@@ -153,27 +168,26 @@ def list_flagged_reviews(
     db: Session = Depends(get_db),
     _: User = Depends(require_admin),
 ):
-    flagged_ids = (
-        db.query(ReviewFlag.review_id)
+    flag_counts = (
+        db.query(ReviewFlag.review_id, func.count(ReviewFlag.id).label("flag_count"))
         .group_by(ReviewFlag.review_id)
         .subquery()
     )
-    reviews = (
-        db.query(Review)
-        .filter(Review.id.in_(flagged_ids))
+    rows = (
+        db.query(
+            Review.id, Review.vendor_id, Review.user_id,
+            Review.rating, Review.body, Review.is_hidden,
+            Review.created_at, flag_counts.c.flag_count,
+            User.username,
+        )
+        .join(flag_counts, flag_counts.c.review_id == Review.id)
+        .outerjoin(User, User.id == Review.user_id)
+        .order_by(Review.id)
         .offset(offset)
         .limit(limit)
         .all()
     )
-    return [
-        {
-            "id": r.id, "vendor_id": r.vendor_id, "user_id": r.user_id,
-            "rating": r.rating, "body": r.body, "is_hidden": r.is_hidden,
-            "created_at": r.created_at, "flag_count": len(r.flags),
-            "username": r.user.username if r.user else None,
-        }
-        for r in reviews
-    ]
+    return fast_json([row._asdict() for row in rows])
 
 
 @router.patch("/reviews/{review_id}/hide")
@@ -186,7 +200,9 @@ def hide_review(
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     review.is_hidden = True
+    bump_version(db, review.vendor_id)
     db.commit()
+    vendor_snapshots.invalidate(review.vendor_id)
     return {"message": "Review hidden"}
 
 
@@ -200,7 +216,9 @@ def unhide_review(
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
     review.is_hidden = False
+    bump_version(db, review.vendor_id)
     db.commit()
+    vendor_snapshots.invalidate(review.vendor_id)
     return {"message": "Review unhidden"}
 
 
@@ -219,3 +237,23 @@ def admin_stats(
         "flagged_reviews": db.query(ReviewFlag).count(),
         "total_favorites": db.query(Favorite).count(),
     }
+
+
+@router.get("/cache-stats")
+def cache_stats(_: User = Depends(require_admin)):
+    """Hit rates of the hours and response caches and of the shared cache backend (per worker process)."""
+    return {
+        "schedule_dedup": schedule_dedup_stats(),
+        "status_cache": {
+            "entries": len(status_cache),
+            "hits": status_cache.hits,
+            "misses": status_cache.misses,
+        },
+        "response_cache": {
+            "entries": len(response_cache),
+            "hits": response_cache.hits,
+            "misses": response_cache.misses,
+        },
+        "cache_backend": cache.stats(),
+        "vendor_snapshots": vendor_snapshots.stats(),
+    }
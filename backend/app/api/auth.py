@@ -2,9 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User
-from app.schemas.user import UserCreate, UserRead, Token, LoginRequest
+from app.schemas.user import UserCreate, UserRead, UserUpdate, Token, LoginRequest
 from app.utils.auth import get_password_hash, verify_password, create_access_token, get_current_user
 from app.utils.geo import generate_slug
+from app.services.vendor_versions import bump_reviewed_versions
+from app.services.vendor_snapshots import vendor_snapshots
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
@@ -45,3 +47,22 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)):
 @router.get("/me", response_model=UserRead)
 def me(current_user: User = Depends(get_current_user)):
     return current_user
+
+
+@router.patch("/me", response_model=UserRead)
+def update_me(
+    payload: UserUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    data = payload.model_dump(exclude_unset=True)
+    for k, v in data.items():
+        setattr(current_user, k, v)
+
+    # Review lists show the reviewer's avatar
+    reviewed = bump_reviewed_versions(db, current_user.id) if "avatar_url" in data else []
+    db.commit()
+    db.refresh(current_user)
+    for vendor_id in reviewed:
+        vendor_snapshots.invalidate(vendor_id)
+    return current_user
@@ -5,11 +5,13 @@ from typing import List
 from app.database import get_db
 from app.models.favorite import Favorite
 from app.models.vendor import Vendor, VendorStatus
-from app.models.hours import VendorHoursWeekly, VendorHoursException
 from app.models.user import User
 from app.schemas.vendor import VendorSummary
 from app.utils.auth import get_current_user
-from app.services.hours_service import compute_open_status
+from app.utils.responses import fast_json
+from app.services.vendor_cards import CardLoader
+from app.services.indexes import refresh_vendor
+from app.services.vendor_versions import bump_version
 
 router = APIRouter(prefix="/api/favorites", tags=["favorites"])
 
@@ -19,27 +21,14 @@ def get_favorites(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    favs = db.query(Favorite).filter(Favorite.user_id == current_user.id).all()
-    result = []
-    for fav in favs:
-        v = fav.vendor
-        if not v:
-            continue
-        weekly = db.query(VendorHoursWeekly).filter(VendorHoursWeekly.vendor_id == v.id).all()
-        exceptions = db.query(VendorHoursException).filter(VendorHoursException.vendor_id == v.id).all()
-        open_status = compute_open_status(v.id, v.timezone, weekly, exceptions)
-        result.append({
-            "id": v.id, "name": v.name, "slug": v.slug, "category": v.category,
-            "status": v.status, "city": v.city, "state": v.state,
-            "latitude": v.latitude, "longitude": v.longitude,
-            "average_rating": v.average_rating or 0.0, "review_count": v.review_count or 0,
-            "favorite_count": v.favorite_count or 0, "cover_photo_url": v.cover_photo_url,
-            "tags": [t.tag for t in v.tags],
-            "distance_miles": None,
-            "is_open": open_status.is_open,
-            "open_status_label": open_status.status_label,
-        })
-    return result
+    vendors = (
+        db.query(Vendor)
+        .join(Favorite, Favorite.vendor_id == Vendor.id)
+        .filter(Favorite.user_id == current_user.id)
+        .order_by(Favorite.id)
+        .all()
+    )
+    return fast_json(CardLoader(db).cards(vendors))
 
 
 @router.post("/{vendor_id}", status_code=201)
@@ -61,7 +50,9 @@ def add_favorite(
     fav = Favorite(user_id=current_user.id, vendor_id=vendor_id)
     db.add(fav)
     vendor.favorite_count = (vendor.favorite_count or 0) + 1
+    bump_version(db, vendor_id)
     db.commit()
+    refresh_vendor(vendor)
     return {"message": "Added to favorites"}
 
 
@@ -80,4 +71,7 @@ def remove_favorite(
     vendor = db.query(Vendor).filter(Vendor.id == vendor_id).first()
     if vendor and vendor.favorite_count:
         vendor.favorite_count = max(0, vendor.favorite_count - 1)
+        bump_version(db, vendor_id)
     db.commit()
+    if vendor:
+        refresh_vendor(vendor)
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import date
 
 from app.database import get_db
 from app.models.vendor import Vendor
@@ -8,7 +9,12 @@ from app.models.hours import VendorHoursWeekly, VendorHoursException
 from app.models.user import User, UserRole
 from app.schemas.hours import WeeklyHourCreate, WeeklyHourRead, ExceptionCreate, ExceptionRead
 from app.utils.auth import get_current_user
-from app.services.hours_service import compute_open_status, get_weekly_schedule_display
+from app.services.status_cache import status_cache
+from app.services.hours_service import schedule_display, store_schedule_display
+from app.services.indexes import refresh_vendor_hours
+from app.services.open_ranges import store_open_ranges
+from app.services.vendor_versions import bump_version, not_modified, vendor_etag
+from app.services.vendor_snapshots import vendor_snapshots
 
 router = APIRouter(prefix="/api/vendors/{vendor_id}/hours", tags=["hours"])
 
@@ -25,7 +31,10 @@ def _check_vendor_access(vendor_id: int, db: Session, current_user: User) -> Ven
 # ─── Weekly hours ───────────────────────────────────────────────────────────
 
 @router.get("/weekly", response_model=List[WeeklyHourRead])
-def get_weekly_hours(vendor_id: int, db: Session = Depends(get_db)):
+def get_weekly_hours(vendor_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    unchanged = not_modified(request, response, vendor_etag(db, vendor_id))
+    if unchanged is not None:
+        return unchanged
     return db.query(VendorHoursWeekly).filter(VendorHoursWeekly.vendor_id == vendor_id).all()
 
 
@@ -37,14 +46,18 @@ def replace_weekly_hours(
     current_user: User = Depends(get_current_user),
 ):
     """Full replace of weekly schedule."""
-    _check_vendor_access(vendor_id, db, current_user)
+    vendor = _check_vendor_access(vendor_id, db, current_user)
     db.query(VendorHoursWeekly).filter(VendorHoursWeekly.vendor_id == vendor_id).delete()
     rows = []
     for h in payload:
         row = VendorHoursWeekly(vendor_id=vendor_id, **h.model_dump())
         db.add(row)
         rows.append(row)
+    store_schedule_display(vendor, rows)
+    store_open_ranges(db, vendor)
+    bump_version(db, vendor_id)
     db.commit()
+    refresh_vendor_hours(vendor)
     for r in rows:
         db.refresh(r)
     return rows
@@ -56,16 +69,43 @@ def clear_weekly_hours(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    _check_vendor_access(vendor_id, db, current_user)
+    vendor = _check_vendor_access(vendor_id, db, current_user)
     db.query(VendorHoursWeekly).filter(VendorHoursWeekly.vendor_id == vendor_id).delete()
+    store_schedule_display(vendor, [])
+    store_open_ranges(db, vendor)
+    bump_version(db, vendor_id)
     db.commit()
+    refresh_vendor_hours(vendor)
 
 
 # ─── Exception hours ────────────────────────────────────────────────────────
 
 @router.get("/exceptions", response_model=List[ExceptionRead])
-def get_exceptions(vendor_id: int, db: Session = Depends(get_db)):
-    return db.query(VendorHoursException).filter(VendorHoursException.vendor_id == vendor_id).all()
+def get_exceptions(
+    vendor_id: int,
+    request: Request,
+    response: Response,
+    start: Optional[date] = None,        # inclusive
+    end: Optional[date] = None,          # inclusive
+    limit: int = Query(default=100, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Date-ordered exceptions, optionally within [start, end]. Past dates are archived."""
+    unchanged = not_modified(request, response, vendor_etag(db, vendor_id))
+    if unchanged is not None:
+        return unchanged
+    query = db.query(VendorHoursException).filter(VendorHoursException.vendor_id == vendor_id)
+    if start is not None:
+        query = query.filter(VendorHoursException.exception_date >= start)
+    if end is not None:
+        query = query.filter(VendorHoursException.exception_date <= end)
+    return (
+        query.order_by(VendorHoursException.exception_date, VendorHoursException.id)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
 
 
 @router.post("/exceptions", response_model=ExceptionRead, status_code=201)
@@ -75,7 +115,7 @@ def add_exception(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    _check_vendor_access(vendor_id, db, current_user)
+    vendor = _check_vendor_access(vendor_id, db, current_user)
     # Upsert by date
     existing = db.query(VendorHoursException).filter(
         VendorHoursException.vendor_id == vendor_id,
@@ -84,13 +124,19 @@ def add_exception(
     if existing:
         for k, v in payload.model_dump().items():
             setattr(existing, k, v)
+        store_open_ranges(db, vendor)
+        bump_version(db, vendor_id)
         db.commit()
+        refresh_vendor_hours(vendor)
         db.refresh(existing)
         return existing
 
     exc = VendorHoursException(vendor_id=vendor_id, **payload.model_dump())
     db.add(exc)
+    store_open_ranges(db, vendor)
+    bump_version(db, vendor_id)
     db.commit()
+    refresh_vendor_hours(vendor)
     db.refresh(exc)
     return exc
 
@@ -102,7 +148,7 @@ def delete_exception(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    _check_vendor_access(vendor_id, db, current_user)
+    vendor = _check_vendor_access(vendor_id, db, current_user)
     exc = db.query(VendorHoursException).filter(
         VendorHoursException.id == exception_id,
         VendorHoursException.vendor_id == vendor_id,
@@ -110,21 +156,25 @@ def delete_exception(
     if not exc:
         raise HTTPException(status_code=404, detail="Exception not found")
     db.delete(exc)
+    store_open_ranges(db, vendor)
+    bump_version(db, vendor_id)
     db.commit()
+    refresh_vendor_hours(vendor)
 
 
 @router.get("/status")
-def get_open_status(vendor_id: int, db: Session = Depends(get_db)):
+def get_open_status(vendor_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """Returns current open/closed status with next open window."""
-    from app.models.vendor import Vendor
-    vendor = db.query(Vendor).filter(Vendor.id == vendor_id).first()
-    if not vendor:
+    unchanged = not_modified(request, response, vendor_etag(db, vendor_id, with_status=True))
+    if unchanged is not None:
+        return unchanged
+    vendor = vendor_snapshots.get(db, vendor_id)
+    if vendor is None:
         raise HTTPException(status_code=404, detail="Vendor not found")
 
-    weekly = db.query(VendorHoursWeekly).filter(VendorHoursWeekly.vendor_id == vendor_id).all()
-    exceptions = db.query(VendorHoursException).filter(VendorHoursException.vendor_id == vendor_id).all()
-    status = compute_open_status(vendor_id, vendor.timezone, weekly, exceptions)
-    schedule = get_weekly_schedule_display(vendor_id, vendor.timezone, weekly, exceptions)
+    cached = status_cache.lookup(db, [vendor])[vendor.id]
+    status = cached.status
+    schedule = schedule_display(vendor, cached.schedule)
 
     return {
         "is_open": status.is_open,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -8,6 +8,9 @@ from app.models.vendor import Vendor
 from app.models.user import User, UserRole
 from app.schemas.review import ReviewCreate, ReviewRead, ReviewUpdate
 from app.utils.auth import get_current_user, get_current_user_optional
+from app.services.indexes import refresh_vendor
+from app.services.vendor_versions import bump_version, not_modified, vendor_etag
+from app.services.vendor_snapshots import vendor_snapshots
 
 router = APIRouter(prefix="/api/vendors/{vendor_id}/reviews", tags=["reviews"])
 
@@ -31,14 +34,21 @@ def _to_read(review: Review, db: Session) -> dict:
 @router.get("", response_model=List[ReviewRead])
 def get_reviews(
     vendor_id: int,
+    request: Request,
+    response: Response,
     limit: int = Query(default=20, le=100),
     offset: int = 0,
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user_optional),
 ):
+    is_admin = current_user is not None and current_user.role == UserRole.admin
+    unchanged = not_modified(request, response, vendor_etag(db, vendor_id, variant=["admin"] if is_admin else ()))
+    if unchanged is not None:
+        return unchanged
+
     query = db.query(Review).filter(Review.vendor_id == vendor_id)
     # Admins see hidden reviews too
-    if not current_user or current_user.role != UserRole.admin:
+    if not is_admin:
         query = query.filter(Review.is_hidden == False)
     reviews = query.order_by(Review.created_at.desc()).offset(offset).limit(limit).all()
     return [_to_read(r, db) for r in reviews]
@@ -62,6 +72,7 @@ def create_review(
         # Update existing review
         existing.rating = payload.rating
         existing.body = payload.body
+        bump_version(db, vendor_id)
         db.commit()
         db.refresh(existing)
         _update_vendor_rating(vendor, db)
@@ -69,6 +80,7 @@ def create_review(
 
     review = Review(vendor_id=vendor_id, user_id=current_user.id, **payload.model_dump())
     db.add(review)
+    bump_version(db, vendor_id)
     db.commit()
     db.refresh(review)
     _update_vendor_rating(vendor, db)
@@ -91,6 +103,7 @@ def update_review(
 
     for k, v in payload.model_dump(exclude_unset=True).items():
         setattr(review, k, v)
+    bump_version(db, vendor_id)
     db.commit()
     db.refresh(review)
 
@@ -113,6 +126,7 @@ def delete_review(
         raise HTTPException(status_code=403, detail="Not authorized")
 
     db.delete(review)
+    bump_version(db, vendor_id)
     db.commit()
 
     vendor = db.query(Vendor).filter(Vendor.id == vendor_id).first()
@@ -140,7 +154,9 @@ def flag_review(
 
     flag = ReviewFlag(review_id=review_id, user_id=current_user.id, reason=reason)
     db.add(flag)
+    bump_version(db, review.vendor_id)
     db.commit()
+    vendor_snapshots.invalidate(review.vendor_id)
     return {"message": "Review flagged"}
 
 
@@ -155,4 +171,6 @@ def _update_vendor_rating(vendor: Vendor, db: Session):
     vendor.average_rating = round(float(result[0] or 0), 2)
     vendor.review_count = result[1] or 0
     vendor.trending_score = vendor.average_rating * 0.5 + (vendor.review_count * 0.1)
+    bump_version(db, vendor.id)
     db.commit()
+    refresh_vendor(vendor)
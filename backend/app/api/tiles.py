@@ -0,0 +1,86 @@
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.vendor import Vendor, VendorStatus
+from app.utils.geo import mercator_project, tile_bounds
+from app.utils.mvt import EXTENT, encode_point_layer
+from app.services.status_cache import status_cache
+from app.services.tile_cache import tile_cache, tile_ttl, BUFFER, MAX_TILE_ZOOM
+
+router = APIRouter(prefix="/api/tiles", tags=["tiles"])
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+
+def _render_tile(db: Session, z: int, x: int, y: int):
+    """
+    Encode the active vendors inside tile z/x/y (plus its edge buffer).
+    Returns (tile bytes, vendor ids, earliest open/close transition among them).
+    """
+    west, _, _, north = tile_bounds(z, x - BUFFER, y - BUFFER)
+    _, south, east, _ = tile_bounds(z, x + BUFFER, y + BUFFER)
+    vendors = (
+        db.query(
+            Vendor.id, Vendor.slug, Vendor.category, Vendor.average_rating,
+            Vendor.timezone, Vendor.latitude, Vendor.longitude,
+        )
+        .filter(
+            Vendor.status == VendorStatus.active,
+            Vendor.latitude.between(south, north),
+            Vendor.longitude.between(west, east),
+        )
+        .order_by(Vendor.id)
+        .all()
+    )
+    if not vendors:
+        return b"", set(), None
+
+    cached = status_cache.lookup(db, vendors)
+    transition = min(c.expires_at for c in cached.values())
+
+    n = 1 << z
+    features = []
+    for v in vendors:
+        mx, my = mercator_project(v.latitude, v.longitude)
+        status = cached[v.id].status
+        features.append((
+            v.id,
+            (round((mx * n - x) * EXTENT), round((my * n - y) * EXTENT)),
+            {
+                "id": v.id,
+                "slug": v.slug,
+                "category": getattr(v.category, "value", v.category),
+                "is_open": status.is_open,
+                "rating": float(v.average_rating) if v.average_rating is not None else None,
+            },
+        ))
+    return encode_point_layer("vendors", features), set(cached), transition
+
+
+@router.get("/{z}/{x}/{y}.mvt")
+def vendor_tile(z: int, x: int, y: int, db: Session = Depends(get_db)):
+    """
+    Vendor pins as a Mapbox Vector Tile (layer "vendors"; properties id, slug,
+    category, is_open, rating). Tiles are cached per z/x/y until a vendor drawn in
+    them changes location, status or hours, opens or closes, or the short TTL lapses.
+    """
+    if not 0 <= z <= MAX_TILE_ZOOM or not (0 <= x < (1 << z) and 0 <= y < (1 << z)):
+        raise HTTPException(status_code=404, detail="Tile out of range")
+
+    key = (z, x, y)
+    tile = tile_cache.get(key)
+    cache_status = "HIT"
+    if tile is None:
+        data, vendor_ids, transition = _render_tile(db, z, x, y)
+        tile = tile_cache.put(key, data, vendor_ids, tile_ttl(transition))
+        cache_status = "MISS"
+
+    return Response(
+        content=tile.data,
+        media_type=MVT_MEDIA_TYPE,
+        headers={
+            "Cache-Control": f"public, max-age={tile.max_age()}",
+            "X-Tile-Cache": cache_status,
+        },
+    )
@@ -1,31 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, literal, tuple_
 from sqlalchemy.orm import Session
-from typing import Optional, List
-from datetime import datetime
+from typing import Optional, List, Set, Tuple
+from datetime import datetime, timedelta
+import base64
+import binascii
+import bisect
+import json
+import math
+import numpy as np
+import pytz
 
 from app.database import get_db
 from app.models.vendor import Vendor, VendorTag, VendorPhoto, VendorStatus
-from app.models.hours import VendorHoursWeekly, VendorHoursException
 from app.models.favorite import Favorite
 from app.models.user import User, UserRole
 from app.schemas.vendor import VendorCreate, VendorRead, VendorUpdate, VendorSummary
 from app.utils.auth import get_current_user, require_vendor_or_admin, require_admin
-from app.utils.geo import haversine_distance, bounding_box, generate_slug
-from app.services.hours_service import compute_open_status, get_weekly_schedule_display, vendor_open_on_day_at_time
+from app.utils.geo import haversine_distance, rank_by_distance, bounding_box, generate_slug
+from app.utils.responses import fast_json
+from app.services.spatial_index import spatial_index
+from app.services.suggest_index import suggest_index
+from app.services.fuzzy_index import fuzzy_index
+from app.services.facet_index import facet_index, to_bitmap, to_ids
+from app.services.cluster_index import cluster_index
+from app.services.open_index import open_index
+from app.services.status_cache import status_cache
+from app.services.hours_service import LOOKAHEAD_DAYS, batch_open_intervals, schedule_display, store_schedule_display
+from app.services.vendor_cards import CardLoader
+from app.services.response_cache import response_cache, quantize, localize, expiry, cell_margin_miles
+from app.services.indexes import refresh_vendor, remove_vendor
+from app.services.vendor_versions import bump_version, not_modified, vendor_etag
+from app.services.cache import cache
+from app.services.vendor_snapshots import VendorSnapshot, vendor_snapshots
+from app.services import open_ranges, postgis, fulltext
 
 router = APIRouter(prefix="/api/vendors", tags=["vendors"])
 
+DETAIL_TTL_SECONDS = 600
 
-def _enrich_vendor(vendor: Vendor, db: Session, user=None, user_lat=None, user_lng=None) -> dict:
+# Search walks the database this many rows at a time at most
+MAX_CHUNK_SIZE = 100
+# Largest candidate set a geohash cell's search keeps in the response cache
+MAX_CELL_CANDIDATES = 1000
+
+
+def _enrich_vendor(vendor: VendorSnapshot, db: Session, user=None, user_lat=None, user_lng=None) -> dict:
     """Attach computed fields to a vendor dict."""
-    tags = [t.tag for t in vendor.tags]
-    photos = vendor.photos
 
     # Hours
-    weekly = db.query(VendorHoursWeekly).filter(VendorHoursWeekly.vendor_id == vendor.id).all()
-    exceptions = db.query(VendorHoursException).filter(VendorHoursException.vendor_id == vendor.id).all()
-    open_status = compute_open_status(vendor.id, vendor.timezone, weekly, exceptions)
-    schedule = get_weekly_schedule_display(vendor.id, vendor.timezone, weekly, exceptions)
+    cached = status_cache.lookup(db, [vendor])[vendor.id]
+    open_status = cached.status
+    schedule = schedule_display(vendor, cached.schedule)
 
     distance = None
     if user_lat is not None and user_lng is not None and vendor.latitude and vendor.longitude:
@@ -39,9 +65,9 @@ def _enrich_vendor(vendor: Vendor, db: Session, user=None, user_lat=None, user_l
         is_favorited = fav is not None
 
     return {
-        **{c.name: getattr(vendor, c.name) for c in vendor.__table__.columns},
-        "tags": tags,
-        "photos": [{"id": p.id, "url": p.url, "caption": p.caption, "is_cover": p.is_cover, "sort_order": p.sort_order} for p in photos],
+        **vendor.columns(),
+        "tags": list(vendor.tags),
+        "photos": [dict(p) for p in vendor.photos],
         "is_open": open_status.is_open,
         "open_status_label": open_status.status_label,
         "closes_at": open_status.closes_at,
@@ -53,112 +79,509 @@ def _enrich_vendor(vendor: Vendor, db: Session, user=None, user_lat=None, user_l
     }
 
 
-@router.get("/search", response_model=List[VendorSummary])
-def search_vendors(
-    q: Optional[str] = None,
-    category: Optional[str] = None,
-    tags: Optional[str] = None,          # comma-separated
-    open_now: Optional[bool] = None,
-    open_day: Optional[int] = None,       # 0=Mon…6=Sun
-    open_time: Optional[str] = None,      # "HH:MM"
-    lat: Optional[float] = None,
-    lng: Optional[float] = None,
-    distance_miles: Optional[float] = 25.0,
-    sort_by: Optional[str] = "trending",  # trending | rating | distance | newest
-    limit: int = Query(default=30, le=100),
-    offset: int = 0,
-    db: Session = Depends(get_db),
-):
-    query = db.query(Vendor).filter(Vendor.status == VendorStatus.active)
-
-    # Text search
-    if q:
-        query = query.filter(
+def _text_filter(q: str, full_text: bool = False, fuzzy_ids: Optional[Set[int]] = None):
+    """
+    Predicate for q: a full-text match when asked for (and available), else substring ILIKE.
+    Fuzzy candidate ids widen it, so fuzzy search returns everything exact search does.
+    """
+    if full_text and fulltext.enabled:
+        clause = fulltext.matches(q)
+    else:
+        clause = (
             Vendor.name.ilike(f"%{q}%") |
             Vendor.description.ilike(f"%{q}%") |
             Vendor.city.ilike(f"%{q}%")
         )
+    if fuzzy_ids:
+        clause = clause | Vendor.id.in_(fuzzy_ids)
+    return clause
+
+
+def _matches_hours_filters(schedule, open_status, open_now, open_day, open_time) -> bool:
+    # Open now filter
+    if open_now is True and not open_status.is_open:
+        return False
+    if open_now is False and open_status.is_open:
+        return False
+
+    # Open on specific day/time filter
+    if open_day is not None or open_time is not None:
+        check_day = open_day if open_day is not None else datetime.now().weekday()
+        check_time = open_time if open_time is not None else datetime.now().strftime("%H:%M")
+        if not schedule.is_open_on_day_at_time(check_day, check_time):
+            return False
+    return True
+
+
+# ─── Keyset pagination ──────────────────────────────────────────────────────
+#
+# Every sort mode walks a total order that ends in Vendor.id, so a page is "the
+# next `limit` matches after the last key seen" — cost depends on page size, not
+# on the number of matches. The cursor is an opaque token carrying
+# (sort mode, phase, last key). Trending walks two phases — open vendors first,
+# then closed — because open/closed is computed in Python, not stored.
+
+SORT_MODES = ("trending", "rating", "distance", "newest", "relevance")
+
+_TRENDING_SCORE = (
+    func.coalesce(Vendor.average_rating, 0.0) * 0.4 + func.coalesce(Vendor.review_count, 0) * 0.1
+)
+
+# SQL ordering keys (all descending) for the non-distance sort modes
+_SORT_KEYS = {
+    "trending": [_TRENDING_SCORE],
+    "rating": [func.coalesce(Vendor.average_rating, 0.0)],
+    "newest": [Vendor.created_at],
+}
+
+
+def _sort_keys(sort_by: str, q: Optional[str]) -> list:
+    if sort_by == "relevance":
+        return [fulltext.rank(q)]
+    return _SORT_KEYS[sort_by]
+
+
+def _encode_cursor(sort_by: str, phase: int, key: list) -> str:
+    payload = json.dumps([sort_by, phase, key], default=lambda o: o.isoformat(), separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(token: str, sort_by: str) -> Tuple[int, list]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        cursor_sort, phase, key = json.loads(raw)
+        if cursor_sort != sort_by or phase not in ((0, 1) if sort_by == "trending" else (0,)) or type(phase) is not int:
+            raise ValueError("cursor does not match sort mode")
+        # Every sort mode orders by one value, then Vendor.id
+        if not isinstance(key, list) or len(key) != 2 or type(key[1]) is not int:
+            raise ValueError("cursor key must be [sort value, vendor id]")
+        if sort_by == "newest":
+            key[0] = datetime.fromisoformat(key[0])
+        elif type(key[0]) not in (int, float) or not math.isfinite(key[0]):
+            raise ValueError("cursor sort value must be a number")
+        return phase, key
+    except (ValueError, TypeError, IndexError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _base_query(db: Session, text_filter, category: Optional[str], tag_list: Optional[List[str]],
+                match_all_tags: bool = False, candidate_ids: Optional[Set[int]] = None,
+                hours_filters: Optional[list] = None):
+    query = db.query(Vendor).filter(Vendor.status == VendorStatus.active)
+
+    # Open-now / open-at predicates over the open-range tables
+    if hours_filters:
+        query = query.filter(*hours_filters)
+
+    # Ids already selected in memory (bitmap tag filter, open-slot index)
+    if candidate_ids is not None:
+        query = query.filter(Vendor.id.in_(candidate_ids))
+
+    # Text search
+    if text_filter is not None:
+        query = query.filter(text_filter)
 
     # Category filter
     if category:
         query = query.filter(Vendor.category == category)
 
-    # Tag filter
-    if tags:
-        tag_list = [t.strip() for t in tags.split(",")]
-        query = query.join(VendorTag).filter(VendorTag.tag.in_(tag_list))
-
-    # Bounding box pre-filter by distance
-    if lat is not None and lng is not None and distance_miles:
-        min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, distance_miles)
+    # Tag filter (EXISTS, so a vendor matching several tags appears once)
+    if tag_list and match_all_tags:
+        for tag in tag_list:
+            query = query.filter(Vendor.tags.any(VendorTag.tag == tag))
+    elif tag_list:
+        query = query.filter(Vendor.tags.any(VendorTag.tag.in_(tag_list)))
+
+    return query
+
+
+def _text_match_ids(db: Session, q: str, fuzzy: bool, full_text: bool = False) -> Set[int]:
+    fuzzy_ids = fuzzy_index.candidates(q) if fuzzy and fuzzy_index.ready else None
+    return {row.id for row in db.query(Vendor.id).filter(_text_filter(q, full_text, fuzzy_ids)).all()}
+
+
+def _radius_locator(lat: float, lng: float, miles: Optional[float]):
+    """Exact haversine for bounding-box candidates, one vectorized pass per chunk."""
+    def locate(vendors):
+        located = [v for v in vendors if v.latitude is not None and v.longitude is not None]
+        distances = {}
+        if located:
+            coords = np.array([(v.latitude, v.longitude) for v in located], dtype=np.float64)
+            dists, mask, _ = rank_by_distance(lat, lng, coords, miles=miles)
+            distances = {v.id: d for v, d, ok in zip(located, dists.tolist(), mask.tolist()) if ok}
+        if miles:
+            return [(v, distances[v.id]) if v.id in distances else (None, None) for v in vendors]
+        return [(v, distances.get(v.id)) for v in vendors]
+    return locate
+
+
+def _sql_chunks(query, keys: list, descending: bool, distance_expr=None, locate=None):
+    """
+    Keyset chunk fetcher over `query` ordered by `keys` + Vendor.id.
+    fetch(after, size) returns up to `size` (key, distance, vendor) triples that
+    follow the key `after`; vendor is None for rows `locate` rejected.
+    """
+    cols = list(keys) + [Vendor.id]
+    query = query.add_columns(*cols)
+    if distance_expr is not None:
+        query = query.add_columns(distance_expr)
+    query = query.order_by(*[c.desc() if descending else c.asc() for c in cols])
+    row_key = tuple_(*cols)
+
+    def fetch(after, size: int):
+        chunk = query
+        if after is not None:
+            bound = tuple_(*[literal(value, col.type) for col, value in zip(cols, after)])
+            chunk = chunk.filter(row_key < bound if descending else row_key > bound)
+        rows = chunk.limit(size).all()
+        vendors = [r[0] for r in rows]
+        if distance_expr is not None:
+            located = [(r[0], r[-1]) for r in rows]
+        elif locate is not None:
+            located = locate(vendors)
+        else:
+            located = [(v, None) for v in vendors]
+        return [(list(r[1 : 1 + len(cols)]), d, v) for r, (v, d) in zip(rows, located)]
+    return fetch
+
+
+def _nearest_hits(db: Session, base, lat: float, lng: float, miles: Optional[float],
+                  text_filter, category: Optional[str], tag_list: Optional[List[str]],
+                  match_all_tags: bool, k: Optional[int],
+                  candidate_ids: Optional[Set[int]] = None,
+                  hours_filters: Optional[list] = None) -> List[Tuple[float, int]]:
+    """Sorted (distance, vendor_id) pairs for an in-memory nearest-first walk."""
+    if miles and spatial_index.ready:
+        # Radius search runs against the in-memory spatial index
+        hits = spatial_index.within(
+            lat, lng, miles,
+            status=VendorStatus.active.value,
+            category=category,
+            tags=set(tag_list) if tag_list else None,
+            match_all_tags=match_all_tags,
+            k=k,
+        )
+        pairs = sorted((d, p.id) for d, p in hits)
+        if candidate_ids is not None:
+            pairs = [pair for pair in pairs if pair[1] in candidate_ids]
+        if (text_filter is not None or hours_filters) and pairs:
+            filters = ([text_filter] if text_filter is not None else []) + (hours_filters or [])
+            matching = {
+                row.id for row in
+                db.query(Vendor.id).filter(Vendor.id.in_([vid for _, vid in pairs]), *filters).all()
+            }
+            pairs = [pair for pair in pairs if pair[1] in matching]
+        return pairs
+
+    # No index yet: rank lightweight (id, lat, lng) rows from SQL
+    query = base.with_entities(Vendor.id, Vendor.latitude, Vendor.longitude).filter(
+        Vendor.latitude.isnot(None), Vendor.longitude.isnot(None)
+    )
+    if miles:
+        min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, miles)
         query = query.filter(
             Vendor.latitude.between(min_lat, max_lat),
             Vendor.longitude.between(min_lng, max_lng),
         )
-
-    vendors = query.all()
-
-    # Post-filter with precise haversine + hours check
-    result = []
-    for v in vendors:
-        distance = None
-        if lat is not None and lng is not None and v.latitude and v.longitude:
-            distance = haversine_distance(lat, lng, v.latitude, v.longitude)
-            if distance_miles and distance > distance_miles:
+    rows = query.all()
+    if not rows:
+        return []
+    coords = np.array([(r.latitude, r.longitude) for r in rows], dtype=np.float64)
+    dists, _, order = rank_by_distance(lat, lng, coords, miles=miles, k=k)
+    return sorted((float(dists[i]), rows[i].id) for i in order)
+
+
+def _nearest_chunks(pairs: List[Tuple[float, int]], base, complete=None):
+    """
+    Keyset chunk fetcher over sorted (distance, vendor_id) pairs; loads only each chunk's rows.
+    Rows are loaded through `base`, so vendors whose status, category or tags changed
+    since the in-memory index last saw them come back as None and are skipped.
+    If `pairs` is a top-k prefix, `complete()` returns all pairs once a chunk runs past it.
+    """
+    def fetch(after, size: int):
+        nonlocal pairs, complete
+        start = bisect.bisect_right(pairs, tuple(after)) if after is not None else 0
+        if complete is not None and start + size > len(pairs):
+            pairs, complete = complete(), None
+        chunk = pairs[start : start + size]
+        by_id = {}
+        if chunk:
+            by_id = {v.id: v for v in base.filter(Vendor.id.in_([vid for _, vid in chunk])).all()}
+        return [([d, vid], d, by_id.get(vid)) for d, vid in chunk]
+    return fetch
+
+
+def _candidate_page(entry, lat: float, lng: float, radius: Optional[float], sort_by: str,
+                    start_phase: int, after, limit: int, skip: int) -> Tuple[List[dict], Optional[str]]:
+    """
+    A page of a cell's cached candidates for the caller's own origin: the cards within
+    `radius` of (lat, lng), with distance_miles filled in, in sort order (nearest first
+    for sort_by=distance), following the cursor position. Returns (cards, next cursor).
+    """
+    located = [
+        (phase_key, item) for phase_key, item in zip(entry.keys, entry.items)
+        if item["latitude"] is not None and item["longitude"] is not None
+    ]
+    if not located:
+        return [], None
+    coords = np.array([(item["latitude"], item["longitude"]) for _, item in located], dtype=np.float64)
+    dists, mask, _ = rank_by_distance(lat, lng, coords, miles=radius)
+    rows = []
+    for ((phase, key), item), d, ok in zip(located, dists.tolist(), mask.tolist()):
+        if ok:
+            rows.append((phase, [d, item["id"]] if sort_by == "distance" else key, {**item, "distance_miles": round(d, 2)}))
+
+    if sort_by == "distance":
+        rows.sort(key=lambda row: row[1])
+        follows = lambda phase, key: after is None or key > after
+    else:
+        # Walk order: phase ascending, then key descending
+        follows = lambda phase, key: phase > start_phase or (phase == start_phase and (after is None or key < after))
+    start = next((i for i, (phase, key, _) in enumerate(rows) if follows(phase, key)), len(rows)) + skip
+    page = rows[start : start + limit]
+    next_cursor = None
+    if page and start + limit < len(rows):
+        phase, key, _ = page[-1]
+        next_cursor = _encode_cursor(sort_by, phase, key)
+    return [card for _, _, card in page], next_cursor
+
+
+def _keyset_page(fetch_chunk, after, accept, limit: int, chunk_size: int, skip: int, prepare=None):
+    """
+    Walk chunks following `after`, keeping vendors that `accept` turns into a card.
+    `prepare`, if given, sees each chunk's vendors first so per-vendor work can be batched.
+    Returns (items, last_key, skip): items are (key, card) pairs, last_key is the key of
+    the final item when the page filled up, or None when the ordering ran out first.
+    """
+    items = []
+    if limit <= 0 or chunk_size <= 0:
+        return items, None, skip
+    while True:
+        chunk = fetch_chunk(after, chunk_size)
+        if prepare is not None:
+            prepare([v for _, _, v in chunk if v is not None])
+        for key, distance, v in chunk:
+            after = key
+            item = accept(v, distance) if v is not None else None
+            if item is None:
                 continue
+            if skip:
+                skip -= 1
+                continue
+            items.append((key, item))
+            if len(items) == limit:
+                return items, key, 0
+        if not chunk or len(chunk) < chunk_size:
+            return items, None, skip
 
-        # Load hours once
-        weekly = db.query(VendorHoursWeekly).filter(VendorHoursWeekly.vendor_id == v.id).all()
-        exceptions = db.query(VendorHoursException).filter(VendorHoursException.vendor_id == v.id).all()
-        open_status = compute_open_status(v.id, v.timezone, weekly, exceptions)
-
-        # Open now filter
-        if open_now is True and not open_status.is_open:
-            continue
-        if open_now is False and open_status.is_open:
-            continue
 
-        # Open on specific day/time filter
+@router.get("/search", response_model=List[VendorSummary])
+def search_vendors(
+    response: Response,
+    q: Optional[str] = None,
+    category: Optional[str] = None,
+    tags: Optional[str] = None,          # comma-separated
+    open_now: Optional[bool] = None,
+    open_day: Optional[int] = None,       # 0=Mon…6=Sun
+    open_time: Optional[str] = None,      # "HH:MM"
+    lat: Optional[float] = None,
+    lng: Optional[float] = None,
+    distance_miles: Optional[float] = 25.0,
+    sort_by: Optional[str] = "trending",  # trending | rating | distance | newest | relevance
+    limit: int = Query(default=30, ge=1, le=100),
+    offset: int = Query(default=0, ge=0), # ignored when a cursor is given
+    cursor: Optional[str] = None,         # X-Next-Cursor from the previous page
+    fuzzy: bool = False,                  # typo-tolerant matching of q against names and tags
+    text_mode: str = "substring",         # substring | fulltext (implied by sort_by=relevance)
+    tag_mode: str = "any",                # any | all
+    db: Session = Depends(get_db),
+):
+    has_origin = lat is not None and lng is not None
+    # Full-text matching is opt-in: substring matching also finds partial words ("ruck")
+    full_text = bool(q) and fulltext.enabled and (text_mode == "fulltext" or sort_by == "relevance")
+    if (
+        sort_by not in SORT_MODES
+        or (sort_by == "distance" and not has_origin)
+        or (sort_by == "relevance" and not full_text)
+    ):
+        sort_by = "trending"
+    by_distance = sort_by == "distance"
+    radius = distance_miles if has_origin and distance_miles else None
+    filters_key = ("search", q, category, tags, open_now, open_day, open_time, sort_by, fuzzy, text_mode, tag_mode)
+
+    # A radius or distance sort makes the result depend on the origin. Those searches
+    # cache their geohash cell's candidate set and page it per request from the real
+    # origin; the others cache pages and only recompute distance_miles.
+    cell_search = radius is not None or by_distance
+    if cell_search:
+        cell, center_lat, center_lng = quantize(lat, lng) if radius else (None, lat, lng)
+        cache_key = filters_key + ("cell", cell, radius)
+    else:
+        cache_key = filters_key + (limit, offset, cursor)
+    cached = response_cache.get(cache_key)
+    if cached is not None and not cell_search:
+        if cached.next_cursor:
+            response.headers["X-Next-Cursor"] = cached.next_cursor
+        return fast_json(localize(cached.items, lat, lng), response)
+
+    start_phase, after = _decode_cursor(cursor, sort_by) if cursor else (0, None)
+    skip = 0 if cursor else offset
+    if cached is not None and cached.keys is not None:
+        page, next_cursor = _candidate_page(cached, lat, lng, radius, sort_by, start_phase, after, limit, skip)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return fast_json(page, response)
+
+    tag_list = [t.strip() for t in tags.split(",")] if tags else None
+    match_all_tags = tag_mode == "all"
+
+    # In-memory candidate generation, before any hours / distance post-filter:
+    # fuzzy text matches (ORed into the text predicate), and tag filters as
+    # bitset unions / intersections
+    candidate_ids = None
+    fuzzy_ids = fuzzy_index.candidates(q) if fuzzy and q and fuzzy_index.ready else None
+    if tag_list and facet_index.ready:
+        candidate_ids = set(to_ids(facet_index.select(tags=tag_list, match_all_tags=match_all_tags)))
+        tag_list = None
+    # Open-now / open-at as SQL range predicates, or else slot-index lookups
+    # (the per-vendor check below stays exact either way)
+    now_utc = datetime.utcnow()
+    hours_filters = []
+    if open_ranges.enabled:
+        if open_now is not None:
+            clause = open_ranges.open_now_clause(db, now_utc)
+            hours_filters.append(clause if open_now else ~clause)
         if open_day is not None or open_time is not None:
             check_day = open_day if open_day is not None else datetime.now().weekday()
             check_time = open_time if open_time is not None else datetime.now().strftime("%H:%M")
-            if not vendor_open_on_day_at_time(v.id, v.timezone, weekly, exceptions, check_day, check_time):
-                continue
-
-        tags_list = [t.tag for t in v.tags]
-        result.append({
-            "id": v.id,
-            "name": v.name,
-            "slug": v.slug,
-            "category": v.category,
-            "status": v.status,
-            "city": v.city,
-            "state": v.state,
-            "latitude": v.latitude,
-            "longitude": v.longitude,
-            "average_rating": v.average_rating or 0.0,
-            "review_count": v.review_count or 0,
-            "favorite_count": v.favorite_count or 0,
-            "cover_photo_url": v.cover_photo_url,
-            "tags": tags_list,
-            "distance_miles": round(distance, 2) if distance is not None else None,
-            "is_open": open_status.is_open,
-            "open_status_label": open_status.status_label,
-        })
-
-    # Sort
-    if sort_by == "rating":
-        result.sort(key=lambda x: x["average_rating"], reverse=True)
-    elif sort_by == "distance" and lat is not None:
-        result.sort(key=lambda x: (x["distance_miles"] is None, x["distance_miles"] or 0))
-    elif sort_by == "newest":
-        pass  # already fetched newest first via DB default
-    else:  # trending
-        result.sort(
-            key=lambda x: (not x["is_open"], -(x["average_rating"] * 0.4 + (x["review_count"] * 0.1))),
-        )
-
-    return result[offset : offset + limit]
+            hours_filters.append(open_ranges.open_at_clause(check_day, check_time))
+    elif open_index.ready and (open_now is True or open_day is not None or open_time is not None):
+        open_ids = open_index.open_now(now_utc) if open_now is True else None
+        if open_day is not None or open_time is not None:
+            check_day = open_day if open_day is not None else datetime.now().weekday()
+            check_time = open_time if open_time is not None else datetime.now().strftime("%H:%M")
+            open_at = open_index.open_at(check_day, check_time)
+            open_ids = open_at if open_ids is None else open_ids & open_at
+        candidate_ids = open_ids if candidate_ids is None else candidate_ids & open_ids
+
+    text_filter = _text_filter(q, full_text, fuzzy_ids) if q else None
+    hours_filtered = open_now is not None or open_day is not None or open_time is not None
+
+    # Trending ranks open vendors first: walk open, then closed (unless open_now pins one side)
+    phases = [True, False] if sort_by == "trending" and open_now is None else [None]
+
+    base = _base_query(db, text_filter, category, tag_list, match_all_tags, candidate_ids, hours_filters)
+
+    def walk(lat: float, lng: float, radius: Optional[float], start_phase: int, after, limit: int, skip: int):
+        """
+        Cards following (start_phase, after), searching from (lat, lng). Returns
+        ([(phase, key, card)], next cursor, loader); tags, hours and open status are
+        loaded a chunk at a time, at one instant.
+        """
+        cards = CardLoader(db, now_utc)
+
+        def accept_for(want_open):
+            def accept(v: Vendor, distance: Optional[float]):
+                schedule, open_status = cards.schedules[v.id], cards.statuses[v.id]
+                if want_open is not None and open_status.is_open != want_open:
+                    return None
+                if not _matches_hours_filters(schedule, open_status, open_now, open_day, open_time):
+                    return None
+                return cards.card(v, distance)
+            return accept
+
+        if sort_by == "distance":
+            if postgis.enabled:
+                # Radius filter, KNN ordering and LIMIT all run in PostGIS
+                origin = postgis.point(lat, lng)
+                knn = postgis.knn_order(origin)
+                query = base.filter(postgis.within_miles(origin, radius)) if radius else base
+                fetch = _sql_chunks(query, [knn], descending=False, distance_expr=knn / postgis.METERS_PER_MILE)
+            else:
+                # A plain first page only needs the top skip+limit hits
+                k = skip + limit if after is None and candidate_ids is None and text_filter is None and not hours_filtered else None
+
+                def nearest(k=None):
+                    return _nearest_hits(db, base, lat, lng, radius, text_filter, category, tag_list, match_all_tags, k,
+                                         candidate_ids, hours_filters)
+                pairs = nearest(k)
+                fetch = _nearest_chunks(pairs, base, nearest if k is not None and len(pairs) == k else None)
+        else:
+            query, distance_expr, locate = base, None, None
+            if has_origin and postgis.enabled:
+                origin = postgis.point(lat, lng)
+                if radius:
+                    query = query.filter(postgis.within_miles(origin, radius))
+                distance_expr = postgis.knn_order(origin) / postgis.METERS_PER_MILE
+            elif radius and spatial_index.ready:
+                distances = {
+                    p.id: d for d, p in spatial_index.within(
+                        lat, lng, radius,
+                        status=VendorStatus.active.value,
+                        category=category,
+                        tags=set(tag_list) if tag_list else None,
+                        match_all_tags=match_all_tags,
+                    )
+                }
+                query = query.filter(Vendor.id.in_(list(distances)))
+                locate = lambda vendors: [(v, distances.get(v.id)) for v in vendors]
+            elif has_origin:
+                # Bounding box pre-filter, exact radius checked per chunk
+                if radius:
+                    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius)
+                    query = query.filter(
+                        Vendor.latitude.between(min_lat, max_lat),
+                        Vendor.longitude.between(min_lng, max_lng),
+                    )
+                locate = _radius_locator(lat, lng, radius)
+            fetch = _sql_chunks(query, _sort_keys(sort_by, q), descending=True, distance_expr=distance_expr, locate=locate)
+
+        rows, next_cursor = [], None
+        for phase in range(start_phase, len(phases)):
+            items, last_key, skip = _keyset_page(
+                fetch,
+                after if phase == start_phase else None,
+                accept_for(phases[phase]),
+                limit - len(rows),
+                min(limit, MAX_CHUNK_SIZE),
+                skip,
+                cards.load,
+            )
+            rows.extend((phase, key, card) for key, card in items)
+            if last_key is not None:
+                next_cursor = _encode_cursor(sort_by, phase, last_key)
+                break
+        return rows, next_cursor, cards
+
+    # Vendors the SQL hours filter excluded are never loaded, so their next opening
+    # is unknown: such entries are only reused within the current minute
+    minute_bound = bool(hours_filters)
+
+    if cell_search and cached is None:
+        # Everything the cell could show: the radius widened by the cell's half-diagonal
+        wide = radius + cell_margin_miles(center_lat) if radius else None
+        rows, _, cards = walk(center_lat, center_lng, wide, 0, None, MAX_CELL_CANDIDATES + 1, 0)
+        area = (center_lat, center_lng, wide) if radius else None
+        expires_at = expiry(cards.expires_at, minute_bound=minute_bound)
+        if len(rows) <= MAX_CELL_CANDIDATES:
+            cached = response_cache.put(
+                cache_key, [card for _, _, card in rows], None, area, expires_at,
+                keys=[(phase, key) for phase, key, _ in rows],
+            )
+            page, next_cursor = _candidate_page(cached, lat, lng, radius, sort_by, start_phase, after, limit, skip)
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
+            return fast_json(page, response)
+        # Too many to hold: remember that, and page from the database
+        response_cache.put(cache_key, [], None, area, expiry(None))
+
+    rows, next_cursor, cards = walk(lat, lng, radius, start_phase, after, limit, skip)
+    page = [card for _, _, card in rows]
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if not cell_search:
+        response_cache.put(cache_key, page, next_cursor, None, expiry(cards.expires_at, minute_bound=minute_bound))
+    return fast_json(page, response)
 
 
 @router.get("/featured", response_model=List[VendorSummary])
@@ -168,49 +591,189 @@ def featured_vendors(
     limit: int = 10,
     db: Session = Depends(get_db),
 ):
-    vendors = (
-        db.query(Vendor)
-        .filter(Vendor.status == VendorStatus.active)
-        .order_by(Vendor.is_featured.desc(), Vendor.trending_score.desc())
-        .limit(limit * 3)
-        .all()
-    )
+    if not (lat and lng):
+        lat = lng = None
+    # The selection ignores location; distances are filled in per request
+    cache_key = ("featured", limit)
+    cached = response_cache.get(cache_key)
+    if cached is None:
+        vendors = (
+            db.query(Vendor)
+            .filter(Vendor.status == VendorStatus.active)
+            .order_by(Vendor.is_featured.desc(), Vendor.trending_score.desc())
+            .limit(limit)
+            .all()
+        )
+        cards = CardLoader(db)
+        page = cards.cards(vendors)
+        response_cache.put(cache_key, page, None, None, expiry(cards.expires_at))
+    else:
+        page = cached.items
+
+    return fast_json(localize(page, lat, lng))
+
+
+@router.get("/suggest")
+def suggest_vendors(
+    q: str,
+    lat: Optional[float] = None,
+    lng: Optional[float] = None,
+    limit: int = Query(default=5, le=20),
+):
+    """Typeahead suggestions served from the in-memory prefix index (no DB access)."""
+    return suggest_index.suggest(q, limit=limit, lat=lat, lng=lng)
+
+
+@router.get("/facets")
+def vendor_facets(
+    q: Optional[str] = None,
+    category: Optional[str] = None,
+    tags: Optional[str] = None,          # comma-separated
+    tag_mode: str = "any",                # any | all
+    lat: Optional[float] = None,
+    lng: Optional[float] = None,
+    distance_miles: Optional[float] = 25.0,
+    fuzzy: bool = False,
+    text_mode: str = "substring",         # substring | fulltext
+    db: Session = Depends(get_db),
+):
+    """
+    Per-tag and per-category result counts for a search, from the bitmap index.
+    Category counts ignore the category filter and tag counts ignore the tag filter
+    (or, with tag_mode=all, count what adding each tag would leave), so every chip
+    shows the result count it would lead to.
+    """
+    if not facet_index.ready:
+        raise HTTPException(status_code=503, detail="Facet index is not ready")
+    tag_list = [t.strip() for t in tags.split(",")] if tags else None
+    match_all_tags = tag_mode == "all"
+
+    base = facet_index.select(status=VendorStatus.active.value)
+    if q:
+        base &= to_bitmap(_text_match_ids(db, q, fuzzy, text_mode == "fulltext"))
+    if lat is not None and lng is not None and distance_miles:
+        if spatial_index.ready:
+            nearby = (p.id for _, p in spatial_index.within(lat, lng, distance_miles))
+        else:
+            min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, distance_miles)
+            rows = db.query(Vendor.id, Vendor.latitude, Vendor.longitude).filter(
+                Vendor.latitude.between(min_lat, max_lat),
+                Vendor.longitude.between(min_lng, max_lng),
+            ).all()
+            nearby = []
+            if rows:
+                coords = np.array([(r.latitude, r.longitude) for r in rows], dtype=np.float64)
+                _, _, order = rank_by_distance(lat, lng, coords, miles=distance_miles)
+                nearby = [rows[i].id for i in order]
+        base &= to_bitmap(nearby)
+
+    in_category = base & facet_index.select(category=category) if category else base
+    tagged = facet_index.select(tags=tag_list, match_all_tags=match_all_tags) if tag_list else -1
+    return {
+        "total": (in_category & tagged).bit_count(),
+        "categories": facet_index.counts(base & tagged, "category"),
+        "tags": facet_index.counts(in_category & tagged if match_all_tags else in_category, "tag"),
+    }
+
 
-    result = []
-    for v in vendors:
-        weekly = db.query(VendorHoursWeekly).filter(VendorHoursWeekly.vendor_id == v.id).all()
-        exceptions = db.query(VendorHoursException).filter(VendorHoursException.vendor_id == v.id).all()
-        open_status = compute_open_status(v.id, v.timezone, weekly, exceptions)
-        distance = None
-        if lat and lng and v.latitude and v.longitude:
-            distance = haversine_distance(lat, lng, v.latitude, v.longitude)
-
-        result.append({
-            "id": v.id, "name": v.name, "slug": v.slug, "category": v.category,
-            "status": v.status, "city": v.city, "state": v.state,
-            "latitude": v.latitude, "longitude": v.longitude,
-            "average_rating": v.average_rating or 0.0, "review_count": v.review_count or 0,
-            "favorite_count": v.favorite_count or 0, "cover_photo_url": v.cover_photo_url,
-            "tags": [t.tag for t in v.tags],
-            "distance_miles": round(distance, 2) if distance else None,
-            "is_open": open_status.is_open,
-            "open_status_label": open_status.status_label,
-        })
-
-    return result[:limit]
+@router.get("/map")
+def vendor_map(
+    bbox: str,                            # west,south,east,north
+    zoom: int = Query(ge=0, le=22),
+):
+    """
+    Clusters and individual vendors for a map viewport, from the multi-zoom cluster
+    index (no DB access). Clusters carry a count, centroid and the zoom at which they
+    split; single vendors — and every vendor at street-level zoom — come back as points.
+    """
+    if not cluster_index.ready:
+        raise HTTPException(status_code=503, detail="Cluster index is not ready")
+    try:
+        west, south, east, north = (float(v) for v in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox must be west,south,east,north")
+    if south > north:
+        raise HTTPException(status_code=400, detail="bbox south must not exceed north")
+    if west > east:
+        # Viewport crosses the antimeridian: query both halves
+        left = cluster_index.query(west, south, 180.0, north, zoom)
+        right = cluster_index.query(-180.0, south, east, north, zoom)
+        return {
+            "zoom": zoom,
+            "clusters": left["clusters"] + right["clusters"],
+            "points": left["points"] + right["points"],
+        }
+    return cluster_index.query(west, south, east, north, zoom)
+
+
+MAX_TIMELINE_VENDORS = 500
+
+
+@router.get("/timeline")
+def vendor_timeline(
+    ids: str,                             # comma-separated vendor ids
+    days: int = Query(default=LOOKAHEAD_DAYS, ge=1, le=LOOKAHEAD_DAYS),
+    db: Session = Depends(get_db),
+):
+    """
+    Open intervals in UTC for each vendor over the next `days` days, so clients can
+    tell open from closed locally instead of polling. Computed from weekly hours and
+    exceptions with the same wall-clock/DST rules as open status; unknown ids are skipped.
+    """
+    try:
+        id_list = list(dict.fromkeys(int(v) for v in ids.split(",") if v.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if len(id_list) > MAX_TIMELINE_VENDORS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_TIMELINE_VENDORS} ids per request")
+
+    start = datetime.now(pytz.utc).replace(second=0, microsecond=0)
+    end = start + timedelta(days=days)
+    vendors = db.query(Vendor.id, Vendor.timezone).filter(Vendor.id.in_(id_list)).all() if id_list else []
+    cached = status_cache.lookup(db, vendors, start)
+    intervals = batch_open_intervals((c.schedule for c in cached.values()), start, end)
+    timezones = {v.id: v.timezone for v in vendors}
+    return {
+        "start": start,
+        "end": end,
+        "vendors": [
+            {
+                "vendor_id": vid,
+                "timezone": timezones[vid],
+                "intervals": [{"opens_at": a, "closes_at": b} for a, b in intervals[vid]],
+            }
+            for vid in id_list if vid in intervals
+        ],
+    }
 
 
 @router.get("/{slug}", response_model=VendorRead)
 def get_vendor(
     slug: str,
+    request: Request,
+    response: Response,
     lat: Optional[float] = None,
     lng: Optional[float] = None,
     db: Session = Depends(get_db),
 ):
-    vendor = db.query(Vendor).filter(Vendor.slug == slug).first()
-    if not vendor:
-        raise HTTPException(status_code=404, detail="Vendor not found")
-    return _enrich_vendor(vendor, db, None, lat, lng)
+    etag = vendor_etag(db, slug=slug, with_status=True)
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
+    # The ETag pins the version and open status, so a body cached under it never goes
+    # stale. The body is cached without distance_miles, which is the only per-caller part.
+    cache_key = f"vendor-detail:{slug}:{etag}"
+    body = cache.get(cache_key) if etag else None
+    if body is None:
+        vendor = vendor_snapshots.get(db, slug=slug)
+        if vendor is None:
+            raise HTTPException(status_code=404, detail="Vendor not found")
+        body = _enrich_vendor(vendor, db)
+        cache.set(cache_key, body, ttl=DETAIL_TTL_SECONDS)
+    if lat is None or lng is None or not body["latitude"] or not body["longitude"]:
+        return body
+    distance = haversine_distance(lat, lng, body["latitude"], body["longitude"])
+    return {**body, "distance_miles": round(distance, 2)}
 
 
 @router.post("", response_model=VendorRead, status_code=201)
@@ -239,9 +802,14 @@ def create_vendor(
     for tag in (payload.tags or []):
         db.add(VendorTag(vendor_id=vendor.id, tag=tag.lower().strip()))
 
+    # No hours yet: every day shows as closed
+    store_schedule_display(vendor, [])
+    bump_version(db, vendor.id)
+
     db.commit()
     db.refresh(vendor)
-    return _enrich_vendor(vendor, db, current_user)
+    refresh_vendor(vendor)
+    return _enrich_vendor(vendor_snapshots.get(db, vendor.id), db, current_user)
 
 
 @router.patch("/{vendor_id}", response_model=VendorRead)
@@ -269,9 +837,11 @@ def update_vendor(
         for tag in tags:
             db.add(VendorTag(vendor_id=vendor_id, tag=tag.lower().strip()))
 
+    bump_version(db, vendor_id)
     db.commit()
     db.refresh(vendor)
-    return _enrich_vendor(vendor, db, current_user)
+    refresh_vendor(vendor)
+    return _enrich_vendor(vendor_snapshots.get(db, vendor.id), db, current_user)
 
 
 @router.delete("/{vendor_id}", status_code=204)
@@ -285,3 +855,4 @@ def delete_vendor(
         raise HTTPException(status_code=404, detail="Vendor not found")
     db.delete(vendor)
     db.commit()
+    remove_vendor(vendor_id)
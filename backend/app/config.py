@@ -18,6 +18,15 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
 
+    # Use PostGIS (geography column + KNN) for distance search when the extension exists
+    ENABLE_POSTGIS: bool = True
+
+    # Shared cache for all replicas (redis://[:password@]host:port/db); in-process LRU if unset
+    REDIS_URL: Optional[str] = None
+
+    # How long a cached vendor snapshot is served before its version is re-checked
+    VENDOR_CACHE_STALENESS_SECONDS: float = 2.0
+
     MAPBOX_TOKEN: Optional[str] = None
     GOOGLE_MAPS_API_KEY: Optional[str] = None
 
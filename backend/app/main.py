@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 
@@ -17,8 +18,17 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.config import settings
-from app.database import Base, engine
-from app.api import auth, vendors, hours, reviews, favorites, admin
+from app.database import Base, engine, SessionLocal
+from app.api import auth, vendors, hours, reviews, favorites, admin, tiles
+from app.services.indexes import load_indexes, run_resync
+from app.services.postgis import setup_postgis
+from app.services.fulltext import setup_fulltext
+from app.services.status_cache import status_cache
+from app.services.hours_archive import ensure_exception_indexes, run_archiver
+from app.services.hours_service import backfill_schedule_displays
+from app.services.open_ranges import setup_open_ranges
+from app.services.vendor_versions import backfill_versions
+from app.utils.responses import CompressionMiddleware
 
 
 @asynccontextmanager
@@ -26,11 +36,70 @@ async def lifespan(app: FastAPI):
     print(f"[lifespan] Connecting with URL: {settings.get_database_url()[:40]}...", flush=True)
     try:
         Base.metadata.create_all(bind=engine)
+        ensure_exception_indexes(engine)
         print("[lifespan] DB tables created/verified OK", flush=True)
     except Exception as e:
         print(f"[lifespan] DB ERROR: {e}", flush=True)
         # Don't crash — let the healthcheck fail gracefully so logs are visible
+    try:
+        if setup_postgis(engine):
+            print("[lifespan] PostGIS enabled — distance search uses KNN", flush=True)
+        else:
+            print("[lifespan] PostGIS not available — using in-memory distance search", flush=True)
+    except Exception as e:
+        print(f"[lifespan] PostGIS setup ERROR: {e}", flush=True)
+    try:
+        if setup_fulltext(engine):
+            print("[lifespan] Full-text search vector/index verified OK", flush=True)
+    except Exception as e:
+        print(f"[lifespan] Full-text setup ERROR: {e}", flush=True)
+    try:
+        db = SessionLocal()
+        try:
+            rendered = backfill_schedule_displays(db)
+        finally:
+            db.close()
+        if rendered:
+            print(f"[lifespan] Stored weekly schedule displays for {rendered} vendors", flush=True)
+    except Exception as e:
+        print(f"[lifespan] Schedule display backfill ERROR: {e}", flush=True)
+    try:
+        db = SessionLocal()
+        try:
+            created = backfill_versions(db)
+        finally:
+            db.close()
+        if created:
+            print(f"[lifespan] Created version counters for {created} vendors", flush=True)
+    except Exception as e:
+        print(f"[lifespan] Vendor version backfill ERROR: {e}", flush=True)
+    try:
+        db = SessionLocal()
+        try:
+            if setup_open_ranges(db):
+                print("[lifespan] Open-hours range tables ready — open filters run in SQL", flush=True)
+        finally:
+            db.close()
+    except Exception as e:
+        # Search falls back to the in-memory open index
+        print(f"[lifespan] Open-hours range setup ERROR: {e}", flush=True)
+    try:
+        db = SessionLocal()
+        try:
+            counts = load_indexes(db)
+        finally:
+            db.close()
+        print(f"[lifespan] Vendor indexes built: {counts}", flush=True)
+    except Exception as e:
+        # Search falls back to the SQL bounding-box path until the index is ready
+        print(f"[lifespan] Vendor index ERROR: {e}", flush=True)
+    sweeper = asyncio.create_task(status_cache.run_sweeper())
+    archiver = asyncio.create_task(run_archiver(SessionLocal))
+    resync = asyncio.create_task(run_resync(SessionLocal))
     yield
+    sweeper.cancel()
+    archiver.cancel()
+    resync.cancel()
 
 
 app = FastAPI(
@@ -47,7 +116,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
+app.add_middleware(CompressionMiddleware)
 
 app.include_router(auth.router)
 app.include_router(vendors.router)
@@ -55,6 +126,7 @@ app.include_router(hours.router)
 app.include_router(reviews.router)
 app.include_router(favorites.router)
 app.include_router(admin.router)
+app.include_router(tiles.router)
 
 
 @app.get("/api/health")
@@ -1,6 +1,13 @@
 from .user import User
-from .vendor import Vendor, VendorPhoto, VendorTag
-from .hours import VendorHoursWeekly, VendorHoursException
+from .vendor import Vendor, VendorPhoto, VendorTag, VendorVersion
+from .hours import (
+    VendorHoursWeekly,
+    VendorHoursException,
+    VendorHoursExceptionHistory,
+    VendorScheduleDisplay,
+    VendorOpenRange,
+    VendorOpenExceptionRange,
+)
 from .review import Review, ReviewFlag
 from .favorite import Favorite
 
@@ -9,8 +16,13 @@ __all__ = [
     "Vendor",
     "VendorPhoto",
     "VendorTag",
+    "VendorVersion",
     "VendorHoursWeekly",
     "VendorHoursException",
+    "VendorHoursExceptionHistory",
+    "VendorScheduleDisplay",
+    "VendorOpenRange",
+    "VendorOpenExceptionRange",
     "Review",
     "ReviewFlag",
     "Favorite",
@@ -7,9 +7,16 @@ Design decisions for DST-safe storage:
   then compare the local time against the stored intervals. This means "11:00 AM" always
   means 11:00 AM in the vendor's local time, regardless of DST.
 - exceptions store a calendar date + local start/end times + vendor timezone for the same reason.
+- the rendered weekly schedule (get_weekly_schedule_display) is stored per vendor and
+  rewritten in the same transaction as every weekly-hours edit, so reads skip the rows.
+- vendor_open_ranges / vendor_open_exception_ranges are derived from the two tables above
+  (open minute ranges in local wall-clock time) so open-now / open-at filters run in SQL.
+- exceptions are read by (vendor_id, exception_date) window; rows whose date has passed are
+  moved to vendor_hours_exceptions_history by the archival job so the live table stays small.
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, Date, ForeignKey, Time
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Index, JSON, Time
+from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -38,6 +45,21 @@ class VendorHoursWeekly(Base):
     vendor = relationship("Vendor", back_populates="weekly_hours")
 
 
+class VendorScheduleDisplay(Base):
+    """
+    Pre-rendered weekly schedule: the 7-day list get_weekly_schedule_display returns,
+    regenerated whenever the vendor's weekly hours are replaced or cleared.
+    """
+
+    __tablename__ = "vendor_schedule_displays"
+
+    vendor_id = Column(Integer, ForeignKey("vendors.id"), primary_key=True)
+    schedule = Column(JSON, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    vendor = relationship("Vendor", back_populates="schedule_display")
+
+
 class VendorHoursException(Base):
     """
     Date-specific overrides: holiday closures or one-off extended hours.
@@ -46,6 +68,9 @@ class VendorHoursException(Base):
     """
 
     __tablename__ = "vendor_hours_exceptions"
+    __table_args__ = (
+        Index("ix_vendor_hours_exceptions_vendor_date", "vendor_id", "exception_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     vendor_id = Column(Integer, ForeignKey("vendors.id"), nullable=False)
@@ -56,3 +81,63 @@ class VendorHoursException(Base):
     note = Column(String)                  # e.g., "Christmas closure"
 
     vendor = relationship("Vendor", back_populates="hour_exceptions")
+
+
+class VendorHoursExceptionHistory(Base):
+    """
+    Archived VendorHoursException rows whose date has passed.
+    Same columns (and ids) as the live table, plus when the row was archived.
+    """
+
+    __tablename__ = "vendor_hours_exceptions_history"
+
+    id = Column(Integer, primary_key=True)
+    vendor_id = Column(Integer, ForeignKey("vendors.id"), nullable=False, index=True)
+    exception_date = Column(Date, nullable=False)
+    is_closed = Column(Boolean, default=False)
+    start_time_local = Column(String(5))
+    end_time_local = Column(String(5))
+    note = Column(String)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    vendor = relationship("Vendor", back_populates="hour_exception_history")
+
+
+class VendorOpenRange(Base):
+    """
+    Derived: one open range of the weekly schedule as local minutes of the week
+    [start_minute, end_minute), Mon 00:00 = 0. Rewritten with every hours edit.
+    """
+
+    __tablename__ = "vendor_open_ranges"
+    __table_args__ = (
+        Index("ix_vendor_open_ranges_vendor_minutes", "vendor_id", "start_minute", "end_minute"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    vendor_id = Column(Integer, ForeignKey("vendors.id"), nullable=False)
+    start_minute = Column(Integer, nullable=False)
+    end_minute = Column(Integer, nullable=False)
+
+    vendor = relationship("Vendor", back_populates="open_ranges")
+
+
+class VendorOpenExceptionRange(Base):
+    """
+    Derived: open ranges of an upcoming exception date as local minutes of that day
+    [start_minute, end_minute). A row with NULL minutes marks a date closed all day.
+    Any row for a date means the weekly ranges do not apply on it.
+    """
+
+    __tablename__ = "vendor_open_exception_ranges"
+    __table_args__ = (
+        Index("ix_vendor_open_exception_ranges_vendor_date", "vendor_id", "local_date"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    vendor_id = Column(Integer, ForeignKey("vendors.id"), nullable=False)
+    local_date = Column(Date, nullable=False)
+    start_minute = Column(Integer)
+    end_minute = Column(Integer)
+
+    vendor = relationship("Vendor", back_populates="open_exception_ranges")
@@ -70,8 +70,13 @@ class Vendor(Base):
     tags = relationship("VendorTag", back_populates="vendor", cascade="all, delete-orphan")
     weekly_hours = relationship("VendorHoursWeekly", back_populates="vendor", cascade="all, delete-orphan")
     hour_exceptions = relationship("VendorHoursException", back_populates="vendor", cascade="all, delete-orphan")
+    hour_exception_history = relationship("VendorHoursExceptionHistory", back_populates="vendor", cascade="all, delete-orphan")
+    schedule_display = relationship("VendorScheduleDisplay", back_populates="vendor", uselist=False, cascade="all, delete-orphan")
+    open_ranges = relationship("VendorOpenRange", back_populates="vendor", cascade="all, delete-orphan")
+    open_exception_ranges = relationship("VendorOpenExceptionRange", back_populates="vendor", cascade="all, delete-orphan")
     reviews = relationship("Review", back_populates="vendor", cascade="all, delete-orphan")
     favorites = relationship("Favorite", back_populates="vendor", cascade="all, delete-orphan")
+    version_counter = relationship("VendorVersion", back_populates="vendor", uselist=False, cascade="all, delete-orphan")
 
 
 class VendorPhoto(Base):
@@ -96,3 +101,17 @@ class VendorTag(Base):
     tag = Column(String, nullable=False, index=True)
 
     vendor = relationship("Vendor", back_populates="tags")
+
+
+class VendorVersion(Base):
+    """
+    Counter bumped in the same transaction as every write to a vendor, its tags,
+    hours or reviews; GET endpoints derive their ETags from it.
+    """
+
+    __tablename__ = "vendor_versions"
+
+    vendor_id = Column(Integer, ForeignKey("vendors.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    vendor = relationship("Vendor", back_populates="version_counter")
@@ -114,6 +114,7 @@ class VendorRead(BaseModel):
     opens_at: Optional[str] = None
     next_open_day: Optional[str] = None
     weekly_schedule: Optional[list] = None
+    distance_miles: Optional[float] = None
 
     class Config:
         from_attributes = True
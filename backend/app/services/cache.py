@@ -0,0 +1,353 @@
+"""
+Pluggable cache backends: TTLs, tag invalidation and hit/miss counters behind one interface.
+
+Key design:
+- `CacheBackend` is what callers use: get / get_many / set / delete_many /
+  invalidate_tags / clear, plus `stats()`. It is an ABC, so a backend that misses
+  one of those methods fails when it is constructed, not on first use. Values
+  must be JSON-serializable; the shared backend hands them back as plain JSON
+  types (enums and datetimes become strings), so cache bodies that a response
+  model can re-read.
+- `LocalCache` is a bounded in-process LRU (OrderedDict under a lock, monotonic
+  TTLs, tag -> keys sets). It returns the stored objects themselves, so callers
+  must not mutate what they get. It is per worker, like the specialized indexes.
+- `RedisCache` speaks RESP to any Redis-compatible server over a small socket pool,
+  with no client library. Values are orjson-encoded with their TTL as SET PX.
+  A tag is a counter key: entries store the tag versions they were written under and
+  read as misses once `invalidate_tags` has INCRed any of them, so invalidation is
+  one round trip, reaches every replica and leaves no per-tag key sets to grow.
+  Connection or server errors count as misses (and failed writes are dropped), so
+  an unavailable server degrades to uncached responses, never to errors.
+- `cache` is this process's backend: RedisCache when REDIS_URL is set, else a
+  LocalCache. The specialized caches (status_cache, tile_cache, response_cache)
+  keep their own structures: their invalidation is geometric or heap-driven.
+"""
+
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+import orjson
+
+from app.config import settings
+
+DEFAULT_TTL_SECONDS = 300
+LOCAL_MAX_ENTRIES = 10000
+REDIS_POOL_SIZE = 8
+REDIS_TIMEOUT_SECONDS = 0.5
+
+
+class CacheBackend(ABC):
+    name = "base"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_many([key]).get(key)
+
+    @abstractmethod
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """{key: value} for the keys that are cached (missing keys are absent)."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()) -> None:
+        """Store value for ttl seconds (DEFAULT_TTL_SECONDS if None), dropped early if a tag is invalidated."""
+
+    @abstractmethod
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """Drop these keys."""
+
+    @abstractmethod
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        """Drop every entry written with any of these tags."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every entry."""
+
+    def delete(self, key: str) -> None:
+        self.delete_many([key])
+
+    def _count(self, found: int, requested: int) -> None:
+        self.hits += found
+        self.misses += requested - found
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "sets": self.sets,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# ─── In-process LRU ──────────────────────────────────────────────────────────
+
+class LocalCache(CacheBackend):
+    name = "local"
+
+    def __init__(self, max_entries: int = LOCAL_MAX_ENTRIES):
+        super().__init__()
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Any, float, Tuple[str, ...]]]" = OrderedDict()
+        self._tag_keys: Dict[str, set] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(keys)
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if entry[1] <= now:
+                    self._drop(key)
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = entry[0]
+            self._count(len(found), len(keys))
+        return found
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()) -> None:
+        expires_at = time.monotonic() + (DEFAULT_TTL_SECONDS if ttl is None else ttl)
+        tags = tuple(tags)
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (value, expires_at, tags)
+            for tag in tags:
+                self._tag_keys.setdefault(tag, set()).add(key)
+            self.sets += 1
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._drop(key)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tag_keys.get(tag, ())):
+                    self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tag_keys.clear()
+
+    def stats(self) -> dict:
+        return {**super().stats(), "entries": len(self), "evictions": self.evictions}
+
+
+# ─── Redis protocol ──────────────────────────────────────────────────────────
+
+class RedisError(Exception):
+    pass
+
+
+def _encode_command(args: Tuple) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+class _RespConnection:
+    def __init__(self, host: str, port: int, password: Optional[str], db: int, timeout: float):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.reader = self.sock.makefile("rb")
+        if password:
+            self.execute([("AUTH", password)])
+        if db:
+            self.execute([("SELECT", db)])
+
+    def execute(self, commands: List[Tuple]) -> List[Any]:
+        """Send commands as one pipeline and read every reply; error replies raise afterwards."""
+        self.sock.sendall(b"".join(_encode_command(c) for c in commands))
+        replies = [self._read() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def _read(self) -> Any:
+        line = self.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest
+        if kind == b"-":
+            return RedisError(rest.decode(errors="replace"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self.reader.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError("connection closed")
+            return data[:-2]
+        if kind == b"*":
+            length = int(rest)
+            return None if length < 0 else [self._read() for _ in range(length)]
+        raise RedisError(f"unexpected reply {line[:20]!r}")
+
+    def close(self) -> None:
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RedisCache(CacheBackend):
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "sporkd:", pool_size: int = REDIS_POOL_SIZE,
+                 timeout: float = REDIS_TIMEOUT_SECONDS):
+        super().__init__()
+        parsed = urlparse(url)
+        self._host = parsed.hostname or "localhost"
+        self._port = parsed.port or 6379
+        self._password = unquote(parsed.password) if parsed.password else None
+        self._db = int(parsed.path.lstrip("/") or 0)
+        self._timeout = timeout
+        self.prefix = prefix
+        self.pool_size = pool_size
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._idle: List[_RespConnection] = []
+
+    def _execute(self, commands: List[Tuple]) -> Optional[List[Any]]:
+        """Replies for a pipeline, or None if the server could not be reached or errored."""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        try:
+            if conn is None:
+                conn = _RespConnection(self._host, self._port, self._password, self._db, self._timeout)
+            replies = conn.execute(commands)
+        except (OSError, ValueError, RedisError) as e:
+            if conn is not None:
+                conn.close()
+            self.errors += 1
+            if self.errors == 1 or self.errors % 1000 == 0:
+                print(f"[cache] Redis ERROR ({self.errors} so far): {e}", flush=True)
+            return None
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                conn = None
+        if conn is not None:
+            conn.close()
+        return replies
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    def _tag_key(self, tag: str) -> str:
+        return self.prefix + "tag:" + tag
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        replies = self._execute([("MGET", *[self._key(k) for k in keys])])
+        entries = {}
+        for key, raw in zip(keys, replies[0] if replies else ()):
+            if raw is not None:
+                try:
+                    entries[key] = orjson.loads(raw)   # [{tag: version}, value]
+                except orjson.JSONDecodeError:
+                    continue
+        tags = sorted({tag for tag_versions, _ in entries.values() for tag in tag_versions})
+        if tags:
+            replies = self._execute([("MGET", *[self._tag_key(t) for t in tags])])
+            if replies is None:
+                entries = {}
+            else:
+                current = {t: int(v or 0) for t, v in zip(tags, replies[0])}
+                entries = {
+                    k: e for k, e in entries.items()
+                    if all(current[t] == v for t, v in e[0].items())
+                }
+        found = {k: e[1] for k, e in entries.items()}
+        self._count(len(found), len(keys))
+        return found
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()) -> None:
+        tags = sorted(set(tags))
+        versions = {}
+        if tags:
+            replies = self._execute([("MGET", *[self._tag_key(t) for t in tags])])
+            if replies is None:
+                return
+            versions = {t: int(v or 0) for t, v in zip(tags, replies[0])}
+        ttl_ms = max(1, int((DEFAULT_TTL_SECONDS if ttl is None else ttl) * 1000))
+        payload = orjson.dumps([versions, value])
+        if self._execute([("SET", self._key(key), payload, "PX", ttl_ms)]) is not None:
+            self.sets += 1
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        keys = [self._key(k) for k in keys]
+        if keys:
+            self._execute([("DEL", *keys)])
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        commands = [("INCR", self._tag_key(t)) for t in set(tags)]
+        if commands:
+            self._execute(commands)
+
+    def clear(self) -> None:
+        cursor = b"0"
+        while True:
+            replies = self._execute([("SCAN", cursor, "MATCH", self.prefix + "*", "COUNT", 500)])
+            if replies is None:
+                return
+            cursor, keys = replies[0]
+            if keys:
+                self._execute([("DEL", *keys)])
+            if cursor == b"0":
+                return
+
+    def stats(self) -> dict:
+        return {**super().stats(), "errors": self.errors}
+
+
+def make_cache(url: Optional[str] = None) -> CacheBackend:
+    """RedisCache for a redis:// URL, else a LocalCache."""
+    return RedisCache(url) if url else LocalCache()
+
+
+cache = make_cache(settings.REDIS_URL)
@@ -0,0 +1,200 @@
+"""
+Process-local multi-zoom cluster index for the vendor map.
+
+Key design:
+- Vendor locations are projected to Web Mercator [0, 1) and bucketed into a nested
+  grid at every zoom 0…MAX_CLUSTER_ZOOM, with CELLS_PER_TILE cells across each
+  256px tile (roughly a 64px cluster radius). Cell (x, y) at zoom z contains
+  cells (2x…2x+1, 2y…2y+1) at zoom z+1, so the levels form a quadtree.
+- Each cell keeps its member ids plus running lat/lng sums, so adding, moving or
+  removing a vendor touches one cell per zoom and the centroid stays exact.
+- A viewport query at zoom z returns that zoom's occupied cells inside the bbox:
+  multi-vendor cells as clusters (count, centroid, expansion zoom), single-vendor
+  cells — and everything above MAX_CLUSTER_ZOOM — as individual points.
+- The expansion zoom is the first deeper zoom where a cluster splits into several
+  child cells, i.e. the zoom the map should fly to when the cluster is clicked.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.utils.geo import mercator_project
+
+MAX_CLUSTER_ZOOM = 16
+CELLS_PER_TILE = 4
+
+
+@dataclass
+class MapPoint:
+    id: int
+    slug: str
+    name: str
+    category: str
+    latitude: float
+    longitude: float
+
+
+@dataclass
+class Cell:
+    ids: Set[int] = field(default_factory=set)
+    sum_lat: float = 0.0
+    sum_lng: float = 0.0
+
+
+def _cell_key(x: float, y: float, zoom: int) -> Tuple[int, int]:
+    n = CELLS_PER_TILE << zoom
+    return int(x * n), int(y * n)
+
+
+def point_from_vendor(vendor) -> Optional[MapPoint]:
+    if vendor.latitude is None or vendor.longitude is None:
+        return None
+    return MapPoint(
+        id=vendor.id,
+        slug=vendor.slug,
+        name=vendor.name,
+        category=getattr(vendor.category, "value", vendor.category),
+        latitude=vendor.latitude,
+        longitude=vendor.longitude,
+    )
+
+
+class ClusterIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._levels: List[Dict[Tuple[int, int], Cell]] = [{} for _ in range(MAX_CLUSTER_ZOOM + 1)]
+        self._points: Dict[int, MapPoint] = {}
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def build(self, points: List[MapPoint]) -> None:
+        with self._lock:
+            self._levels = [{} for _ in range(MAX_CLUSTER_ZOOM + 1)]
+            self._points = {}
+            for p in points:
+                self._add(p)
+            self.ready = True
+
+    def upsert(self, point: MapPoint) -> None:
+        with self._lock:
+            self._discard(point.id)
+            self._add(point)
+
+    def remove(self, vendor_id: int) -> None:
+        with self._lock:
+            self._discard(vendor_id)
+
+    def _add(self, p: MapPoint) -> None:
+        self._points[p.id] = p
+        x, y = mercator_project(p.latitude, p.longitude)
+        for zoom, level in enumerate(self._levels):
+            cell = level.setdefault(_cell_key(x, y, zoom), Cell())
+            cell.ids.add(p.id)
+            cell.sum_lat += p.latitude
+            cell.sum_lng += p.longitude
+
+    def _discard(self, vendor_id: int) -> None:
+        p = self._points.pop(vendor_id, None)
+        if p is None:
+            return
+        x, y = mercator_project(p.latitude, p.longitude)
+        for zoom, level in enumerate(self._levels):
+            key = _cell_key(x, y, zoom)
+            cell = level.get(key)
+            if cell is None:
+                continue
+            cell.ids.discard(vendor_id)
+            cell.sum_lat -= p.latitude
+            cell.sum_lng -= p.longitude
+            if not cell.ids:
+                del level[key]
+
+    def _expansion_zoom(self, zoom: int, key: Tuple[int, int]) -> int:
+        cx, cy = key
+        while zoom < MAX_CLUSTER_ZOOM:
+            children = [
+                (2 * cx + dx, 2 * cy + dy)
+                for dx in (0, 1) for dy in (0, 1)
+                if (2 * cx + dx, 2 * cy + dy) in self._levels[zoom + 1]
+            ]
+            zoom += 1
+            if len(children) != 1:
+                return zoom
+            cx, cy = children[0]
+        return MAX_CLUSTER_ZOOM + 1
+
+    def query(self, west: float, south: float, east: float, north: float, zoom: int) -> dict:
+        """Clusters and points inside the bbox at the given map zoom."""
+        x0, y1 = mercator_project(south, west)
+        x1, y0 = mercator_project(north, east)
+        clusters, points = [], []
+
+        with self._lock:
+            if zoom > MAX_CLUSTER_ZOOM:
+                points = [
+                    p for p in self._points.values()
+                    if south <= p.latitude <= north and west <= p.longitude <= east
+                ]
+            else:
+                level = self._levels[zoom]
+                (cx0, cy0), (cx1, cy1) = _cell_key(x0, y0, zoom), _cell_key(x1, y1, zoom)
+                span = (cx1 - cx0 + 1) * (cy1 - cy0 + 1)
+                if span <= len(level):
+                    keys = [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1) if (cx, cy) in level]
+                else:
+                    keys = [k for k in level if cx0 <= k[0] <= cx1 and cy0 <= k[1] <= cy1]
+                for key in keys:
+                    cell = level[key]
+                    count = len(cell.ids)
+                    if count == 1:
+                        points.append(self._points[next(iter(cell.ids))])
+                        continue
+                    clusters.append({
+                        "id": f"{zoom}/{key[0]}/{key[1]}",
+                        "count": count,
+                        "latitude": cell.sum_lat / count,
+                        "longitude": cell.sum_lng / count,
+                        "expansion_zoom": self._expansion_zoom(zoom, key),
+                    })
+
+        return {
+            "zoom": zoom,
+            "clusters": clusters,
+            "points": [
+                {"id": p.id, "slug": p.slug, "name": p.name, "category": p.category,
+                 "latitude": p.latitude, "longitude": p.longitude}
+                for p in points
+            ],
+        }
+
+
+cluster_index = ClusterIndex()
+
+
+def load_cluster_index(db) -> int:
+    """(Re)build the index from every active vendor with a location. Returns the count."""
+    from app.models.vendor import Vendor, VendorStatus
+
+    vendors = (
+        db.query(Vendor)
+        .filter(
+            Vendor.status == VendorStatus.active,
+            Vendor.latitude.isnot(None),
+            Vendor.longitude.isnot(None),
+        )
+        .all()
+    )
+    cluster_index.build([p for p in (point_from_vendor(v) for v in vendors) if p])
+    return len(cluster_index)
+
+
+def refresh_vendor(vendor) -> None:
+    """Sync one vendor into the index after a committed write."""
+    point = point_from_vendor(vendor)
+    if point is None or getattr(vendor.status, "value", vendor.status) != "active":
+        cluster_index.remove(vendor.id)
+    else:
+        cluster_index.upsert(point)
@@ -0,0 +1,157 @@
+"""
+Process-local bitmap index over vendor facets (tags, category, status).
+
+Key design:
+- One bitset per facet value, stored as a Python int with bit N set for vendor id N.
+  Ints are arbitrary-precision and word-packed, and support & | and bit_count()
+  natively, so a filter combination costs a few big-int operations, not a SQL join.
+- AND / OR tag filters are intersections / unions of tag bitsets; facet counts for
+  a query are popcounts of (query bitset & value bitset).
+- Vendor writes call `upsert` / `remove`, which clear the vendor's bit from its old
+  facet values and set it on the new ones.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+FacetKey = Tuple[str, str]  # ("tag" | "category" | "status", value)
+
+
+def to_bitmap(ids: Iterable[int]) -> int:
+    ids = np.fromiter(ids, dtype=np.int64)
+    if ids.size == 0:
+        return 0
+    bits = np.zeros(int(ids.max()) + 1, dtype=np.uint8)
+    bits[ids] = 1
+    return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+
+def to_ids(bitmap: int) -> List[int]:
+    if not bitmap:
+        return []
+    raw = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    bits = np.unpackbits(np.frombuffer(raw, dtype=np.uint8), bitorder="little")
+    return np.flatnonzero(bits).tolist()
+
+
+def facet_keys(vendor) -> Set[FacetKey]:
+    keys = {
+        ("category", getattr(vendor.category, "value", vendor.category)),
+        ("status", getattr(vendor.status, "value", vendor.status)),
+    }
+    keys.update(("tag", t.tag) for t in vendor.tags)
+    return keys
+
+
+class FacetIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bitmaps: Dict[FacetKey, int] = {}
+        self._vendor_keys: Dict[int, Set[FacetKey]] = {}
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._vendor_keys)
+
+    def build(self, vendor_keys: Dict[int, Set[FacetKey]]) -> None:
+        members: Dict[FacetKey, List[int]] = defaultdict(list)
+        for vendor_id, keys in vendor_keys.items():
+            for key in keys:
+                members[key].append(vendor_id)
+        bitmaps = {key: to_bitmap(ids) for key, ids in members.items()}
+        with self._lock:
+            self._bitmaps = bitmaps
+            self._vendor_keys = {vid: set(keys) for vid, keys in vendor_keys.items()}
+            self.ready = True
+
+    def upsert(self, vendor_id: int, keys: Set[FacetKey]) -> None:
+        with self._lock:
+            self._discard(vendor_id)
+            bit = 1 << vendor_id
+            for key in keys:
+                self._bitmaps[key] = self._bitmaps.get(key, 0) | bit
+            self._vendor_keys[vendor_id] = set(keys)
+
+    def remove(self, vendor_id: int) -> None:
+        with self._lock:
+            self._discard(vendor_id)
+
+    def _discard(self, vendor_id: int) -> None:
+        mask = ~(1 << vendor_id)
+        for key in self._vendor_keys.pop(vendor_id, ()):
+            bitmap = self._bitmaps.get(key, 0) & mask
+            if bitmap:
+                self._bitmaps[key] = bitmap
+            else:
+                self._bitmaps.pop(key, None)
+
+    def bitmap(self, kind: str, value: str) -> int:
+        return self._bitmaps.get((kind, value), 0)
+
+    def select(
+        self,
+        status: Optional[str] = None,
+        category: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        match_all_tags: bool = False,
+    ) -> int:
+        """Bitset of vendors matching the status, category and tag filters (None = no filter)."""
+        with self._lock:
+            result = -1  # all bits set: the identity for &
+            if status is not None:
+                result &= self.bitmap("status", status)
+            if category is not None:
+                result &= self.bitmap("category", category)
+            if tags:
+                tag_bitmaps = [self.bitmap("tag", t) for t in tags]
+                if match_all_tags:
+                    for bm in tag_bitmaps:
+                        result &= bm
+                else:
+                    union = 0
+                    for bm in tag_bitmaps:
+                        union |= bm
+                    result &= union
+        if result == -1:
+            result = self.universe()
+        return result
+
+    def universe(self) -> int:
+        with self._lock:
+            result = 0
+            for key, bm in self._bitmaps.items():
+                if key[0] == "status":
+                    result |= bm
+            return result
+
+    def counts(self, base: int, kind: str) -> Dict[str, int]:
+        """Per-value counts of `kind` facets within the `base` bitset (zero counts omitted)."""
+        with self._lock:
+            items = [(key[1], bm) for key, bm in self._bitmaps.items() if key[0] == kind]
+        counts = {}
+        for value, bm in items:
+            n = (base & bm).bit_count()
+            if n:
+                counts[value] = n
+        return dict(sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])))
+
+
+facet_index = FacetIndex()
+
+
+def load_facet_index(db) -> int:
+    """(Re)build the index from every vendor. Returns the count."""
+    from app.models.vendor import Vendor
+    from sqlalchemy.orm import selectinload
+
+    vendors = db.query(Vendor).options(selectinload(Vendor.tags)).all()
+    facet_index.build({v.id: facet_keys(v) for v in vendors})
+    return len(facet_index)
+
+
+def refresh_vendor(vendor) -> None:
+    """Sync one vendor into the index after a committed write."""
+    facet_index.upsert(vendor.id, facet_keys(vendor))
@@ -0,0 +1,125 @@
+"""
+PostgreSQL full-text search over vendors.
+
+Key design:
+- `vendors.search_vector` is a weighted tsvector: name (A), tags (B), city (C),
+  description (D), backed by a GIN index.
+- Like the PostGIS column it is not declared on the ORM model; `setup_fulltext()`
+  adds it at startup, backfills it, and installs triggers so it stays current on
+  every vendor write and every vendor_tags insert/update/delete.
+- Search only uses it in text_mode=fulltext (or sort_by=relevance); the default
+  stays ILIKE substring matching, which also finds word fragments ("ruck").
+- Plain queries become `to_tsquery` conjunctions whose last word is a prefix term,
+  so a word still being typed matches ("pier" finds pierogi). Queries using
+  websearch syntax (quoted phrases, OR, -exclusions) go to websearch_to_tsquery.
+  Results rank with ts_rank_cd. Without PostgreSQL, search stays on ILIKE.
+"""
+
+import re
+
+from sqlalchemy import func, literal_column, text
+
+TEXT_SEARCH_CONFIG = "english"
+
+enabled = False
+
+_SETUP_STATEMENTS = [
+    "ALTER TABLE vendors ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    "CREATE INDEX IF NOT EXISTS ix_vendors_search_vector ON vendors USING GIN (search_vector)",
+    f"""
+    CREATE OR REPLACE FUNCTION vendor_search_document(
+        v_id integer, v_name text, v_city text, v_description text
+    ) RETURNS tsvector AS $$
+        SELECT
+            setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(v_name, '')), 'A') ||
+            setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(
+                (SELECT string_agg(tag, ' ') FROM vendor_tags WHERE vendor_id = v_id), ''
+            )), 'B') ||
+            setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(v_city, '')), 'C') ||
+            setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(v_description, '')), 'D')
+    $$ LANGUAGE sql STABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION vendors_sync_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := vendor_search_document(NEW.id, NEW.name, NEW.city, NEW.description);
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_vendors_sync_search_vector ON vendors",
+    """
+    CREATE TRIGGER trg_vendors_sync_search_vector
+    BEFORE INSERT OR UPDATE OF name, city, description ON vendors
+    FOR EACH ROW EXECUTE FUNCTION vendors_sync_search_vector()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION vendor_tags_sync_search_vector() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE vendors
+            SET search_vector = vendor_search_document(id, name, city, description)
+            WHERE id = OLD.vendor_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE vendors
+            SET search_vector = vendor_search_document(id, name, city, description)
+            WHERE id = NEW.vendor_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_vendor_tags_sync_search_vector ON vendor_tags",
+    """
+    CREATE TRIGGER trg_vendor_tags_sync_search_vector
+    AFTER INSERT OR UPDATE OR DELETE ON vendor_tags
+    FOR EACH ROW EXECUTE FUNCTION vendor_tags_sync_search_vector()
+    """,
+    """
+    UPDATE vendors
+    SET search_vector = vendor_search_document(id, name, city, description)
+    WHERE search_vector IS NULL
+    """,
+]
+
+
+def setup_fulltext(engine) -> bool:
+    """Install the search_vector column, index and triggers (PostgreSQL only)."""
+    global enabled
+    enabled = False
+    if engine.dialect.name != "postgresql":
+        return False
+
+    with engine.begin() as conn:
+        for stmt in _SETUP_STATEMENTS:
+            conn.execute(text(stmt))
+
+    enabled = True
+    return True
+
+
+search_vector = literal_column("vendors.search_vector")
+
+
+_WEBSEARCH_SYNTAX = re.compile(r'"|(?:^|\s)-\S|\bor\b', re.IGNORECASE)
+_WORD = re.compile(r"\w+")
+
+
+def tsquery(q: str):
+    words = _WORD.findall(q)
+    if not words or _WEBSEARCH_SYNTAX.search(q):
+        return func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, q)
+    terms = [f"'{word}'" for word in words]
+    terms[-1] += ":*"
+    return func.to_tsquery(TEXT_SEARCH_CONFIG, " & ".join(terms))
+
+
+def matches(q: str):
+    """`search_vector @@ query` predicate — served by the GIN index."""
+    return search_vector.op("@@")(tsquery(q))
+
+
+def rank(q: str):
+    """Relevance score; name hits outrank tag, city and description hits."""
+    return func.ts_rank_cd(search_vector, tsquery(q))
@@ -0,0 +1,183 @@
+"""
+Process-local typo-tolerant term index for fuzzy vendor search.
+
+Key design:
+- The dictionary holds every word of active vendors' names and tags, each mapped
+  to the vendor ids that use it.
+- Candidate generation uses a trigram inverted index (pg_trgm-style padding): a
+  dictionary term can only be within k edits of a query word if it shares enough
+  trigrams with it (q-gram lemma) and its length differs by at most k. Only
+  those few terms get the exact check.
+- The exact check is a bounded optimal-string-alignment distance, so adjacent
+  transpositions ("bahn" → "banh") count as one edit.
+- A vendor matches when every query word fuzzily matches one of its terms
+  ("perogie" → "pierogi", "bahn mi" → "banh mi"). The result is a set of vendor
+  ids that search ORs into its normal text predicate, so fuzzy search only ever
+  widens exact search (fragments like "tru" and city names still match).
+"""
+
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Set
+
+from app.services.suggest_index import normalize
+
+
+def max_edits(word: str) -> int:
+    """Edit budget by word length: short words must match exactly."""
+    n = len(word)
+    if n <= 3:
+        return 0
+    if n <= 6:
+        return 1
+    return 2
+
+
+def trigrams(word: str) -> Set[str]:
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, k: int) -> Optional[int]:
+    """Optimal string alignment distance between a and b, or None if it exceeds k."""
+    if abs(len(a) - len(b)) > k:
+        return None
+    if a == b:
+        return 0
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = cur[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+            row_min = min(row_min, cur[j])
+        if row_min > k:
+            return None
+        prev2, prev = prev, cur
+    return prev[-1] if prev[-1] <= k else None
+
+
+def terms_for_vendor(vendor) -> Set[str]:
+    words = set(normalize(vendor.name).split())
+    for t in vendor.tags:
+        words.update(normalize(t.tag).split())
+    words.discard("")
+    return words
+
+
+class FuzzyIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._term_vendors: Dict[str, Set[int]] = {}
+        self._trigram_terms: Dict[str, Set[str]] = {}
+        self._vendor_terms: Dict[int, Set[str]] = {}
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._vendor_terms)
+
+    def build(self, vendor_terms: Dict[int, Set[str]]) -> None:
+        with self._lock:
+            self._term_vendors = {}
+            self._trigram_terms = {}
+            self._vendor_terms = {}
+            for vendor_id, terms in vendor_terms.items():
+                self._add(vendor_id, terms)
+            self.ready = True
+
+    def upsert(self, vendor_id: int, terms: Set[str]) -> None:
+        with self._lock:
+            self._discard(vendor_id)
+            self._add(vendor_id, terms)
+
+    def remove(self, vendor_id: int) -> None:
+        with self._lock:
+            self._discard(vendor_id)
+
+    def _add(self, vendor_id: int, terms: Set[str]) -> None:
+        self._vendor_terms[vendor_id] = set(terms)
+        for term in terms:
+            vendors = self._term_vendors.get(term)
+            if vendors is None:
+                vendors = self._term_vendors[term] = set()
+                for tg in trigrams(term):
+                    self._trigram_terms.setdefault(tg, set()).add(term)
+            vendors.add(vendor_id)
+
+    def _discard(self, vendor_id: int) -> None:
+        for term in self._vendor_terms.pop(vendor_id, ()):
+            vendors = self._term_vendors.get(term)
+            if vendors is None:
+                continue
+            vendors.discard(vendor_id)
+            if not vendors:
+                del self._term_vendors[term]
+                for tg in trigrams(term):
+                    bucket = self._trigram_terms.get(tg)
+                    if bucket is not None:
+                        bucket.discard(term)
+                        if not bucket:
+                            del self._trigram_terms[tg]
+
+    def _similar_terms(self, word: str) -> Set[str]:
+        """Dictionary terms within max_edits(word) of word (caller holds the lock)."""
+        k = max_edits(word)
+        if k == 0:
+            return {word} if word in self._term_vendors else set()
+        grams = trigrams(word)
+        # An adjacent transposition can break up to 4 trigrams, other edits up to 3
+        need = max(1, len(grams) - 4 * k)
+        shared = Counter()
+        for tg in grams:
+            shared.update(self._trigram_terms.get(tg, ()))
+        return {
+            term for term, n in shared.items()
+            if n >= need and bounded_edit_distance(word, term, k) is not None
+        }
+
+    def candidates(self, q: str) -> Set[int]:
+        """Vendor ids where every word of q fuzzily matches one of the vendor's terms."""
+        words = normalize(q).split()
+        if not words:
+            return set()
+        result: Optional[Set[int]] = None
+        with self._lock:
+            # Rarest-looking (longest) words first, so the intersection shrinks fast
+            for word in sorted(set(words), key=len, reverse=True):
+                matched: Set[int] = set()
+                for term in self._similar_terms(word):
+                    matched |= self._term_vendors[term]
+                result = matched if result is None else result & matched
+                if not result:
+                    return set()
+        return result
+
+
+fuzzy_index = FuzzyIndex()
+
+
+def load_fuzzy_index(db) -> int:
+    """(Re)build the index from every active vendor. Returns the count."""
+    from app.models.vendor import Vendor, VendorStatus
+    from sqlalchemy.orm import selectinload
+
+    vendors = (
+        db.query(Vendor)
+        .filter(Vendor.status == VendorStatus.active)
+        .options(selectinload(Vendor.tags))
+        .all()
+    )
+    fuzzy_index.build({v.id: terms_for_vendor(v) for v in vendors})
+    return len(fuzzy_index)
+
+
+def refresh_vendor(vendor) -> None:
+    """Sync one vendor into the index after a committed write."""
+    if getattr(vendor.status, "value", vendor.status) == "active":
+        fuzzy_index.upsert(vendor.id, terms_for_vendor(vendor))
+    else:
+        fuzzy_index.remove(vendor.id)
@@ -0,0 +1,86 @@
+"""
+Archival of past VendorHoursException rows.
+
+Key design:
+- Open-status lookups only read exceptions from yesterday through the look-ahead
+  window, but vendors that post holiday or pop-up overrides for years would still
+  grow the live table without bound. A periodic job moves every exception older
+  than ARCHIVE_AFTER_DAYS into vendor_hours_exceptions_history (same columns and
+  ids) in one INSERT … SELECT + DELETE transaction.
+- Archived dates are already outside every loaded window, so no index or cache
+  needs refreshing afterwards; their derived open-range rows are deleted with them.
+  The exceptions endpoint lists them though, so the affected vendors' versions
+  (and with them the endpoint's ETags) are bumped in the same transaction, and
+  this process's vendor snapshots are dropped.
+- `ensure_exception_indexes` creates the (vendor_id, exception_date) index on
+  databases whose table predates it (create_all only adds indexes with new tables).
+"""
+
+import asyncio
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import insert, select
+
+from app.services.vendor_snapshots import vendor_snapshots
+
+ARCHIVE_AFTER_DAYS = 2
+ARCHIVE_INTERVAL_SECONDS = 6 * 60 * 60
+
+_COLUMNS = ("id", "vendor_id", "exception_date", "is_closed", "start_time_local", "end_time_local", "note")
+
+
+def ensure_exception_indexes(engine) -> None:
+    from app.models.hours import VendorHoursException
+
+    for index in VendorHoursException.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+
+def archive_past_exceptions(db, before: Optional[date] = None) -> int:
+    """Move exceptions dated before `before` to the history table. Returns how many."""
+    from app.models.hours import VendorHoursException, VendorHoursExceptionHistory, VendorOpenExceptionRange
+    from app.models.vendor import VendorVersion
+
+    if before is None:
+        before = date.today() - timedelta(days=ARCHIVE_AFTER_DAYS)
+    live = VendorHoursException.__table__
+    past = live.c.exception_date < before
+    versions = VendorVersion.__table__
+    db.execute(
+        versions.update()
+        .where(versions.c.vendor_id.in_(select(live.c.vendor_id).where(past)))
+        .values(version=versions.c.version + 1)
+    )
+    db.execute(
+        insert(VendorHoursExceptionHistory.__table__).from_select(
+            list(_COLUMNS), select(*[live.c[name] for name in _COLUMNS]).where(past)
+        )
+    )
+    moved = db.execute(live.delete().where(past)).rowcount
+    ranges = VendorOpenExceptionRange.__table__
+    db.execute(ranges.delete().where(ranges.c.local_date < before))
+    db.commit()
+    if moved:
+        vendor_snapshots.clear()
+    return moved
+
+
+def _archive_once(session_factory) -> int:
+    db = session_factory()
+    try:
+        return archive_past_exceptions(db)
+    finally:
+        db.close()
+
+
+async def run_archiver(session_factory) -> None:
+    """Background task: archive past exceptions every ARCHIVE_INTERVAL_SECONDS."""
+    while True:
+        try:
+            moved = await asyncio.to_thread(_archive_once, session_factory)
+            if moved:
+                print(f"[hours_archive] Archived {moved} past exceptions", flush=True)
+        except Exception as e:
+            print(f"[hours_archive] ERROR: {e}", flush=True)
+        await asyncio.sleep(ARCHIVE_INTERVAL_SECONDS)
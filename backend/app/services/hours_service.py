@@ -9,8 +9,13 @@ Key design:
 - Special note on midnight-spanning intervals: e.g., 22:00–02:00 — handled by splitting at midnight.
 """
 
+from collections import defaultdict
 from datetime import datetime, date, time, timedelta
-from typing import Optional, List, Tuple
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Dict, Iterable, NamedTuple, Optional, List, Tuple
+import bisect
+import weakref
 import pytz
 from dataclasses import dataclass
 
@@ -40,6 +45,7 @@ def format_hhmm(t: time) -> str:
     return t.strftime("%H:%M")
 
 
+@lru_cache(maxsize=2048)
 def format_12h(hhmm: str) -> str:
     """Convert 24h 'HH:MM' → '12:00 PM'."""
     t = parse_hhmm(hhmm)
@@ -282,3 +288,632 @@ def get_weekly_schedule_display(
                 ]
             })
     return result
+
+
+# ─── Compiled schedules ─────────────────────────────────────────────────────
+#
+# The functions above re-parse "HH:MM" strings and re-filter the raw rows on every
+# call. A CompiledSchedule groups the rows once per vendor and turns each day into
+# a sorted list of minute "pieces", each mapped to the closes_at of the interval
+# that covers it (None = closed). Weekly pieces are keyed by minute of the week
+# (Mon 00:00 = 0); exceptions become date-keyed day plans. Open/closed, closes-at
+# and opens-later-today are then bisect lookups. Day plans are compiled on first
+# use, so a single status check only pays for the days it actually looks at.
+# Midnight-spanning intervals (22:00–02:00) are normalized the same way
+# interval_contains reads them: [22:00, 24:00) and [00:00, 02:00) of that day.
+# Results are identical to compute_open_status / vendor_open_on_day_at_time /
+# get_weekly_schedule_display.
+
+MINUTES_PER_DAY = 24 * 60
+LOOKAHEAD_DAYS = 7          # open_status looks at today + the next 7 days
+EXCEPTION_WINDOW_DAYS = 14  # exceptions loaded per schedule, from yesterday on
+_UNSET = object()
+
+
+def exception_window(today: Optional[date] = None) -> Tuple[date, date]:
+    """
+    (first, last) exception dates a freshly loaded schedule needs. Starts a day
+    early because a vendor's local date can trail the server's; runs far enough
+    past the look-ahead that a cached schedule stays usable for about a week.
+    """
+    today = today or date.today()
+    return today - timedelta(days=1), today + timedelta(days=EXCEPTION_WINDOW_DAYS)
+
+
+def _as_utc(reference_utc: Optional[datetime]) -> datetime:
+    if reference_utc is None:
+        return datetime.utcnow().replace(tzinfo=pytz.utc)
+    if reference_utc.tzinfo is None:
+        return reference_utc.replace(tzinfo=pytz.utc)
+    return reference_utc
+
+
+@lru_cache(maxsize=None)
+def _zone(name: str):
+    return pytz.timezone(name)
+
+
+def offset_switch(tz, start_utc: datetime, end_utc: datetime) -> datetime:
+    """
+    First whole minute after start_utc at which tz's UTC offset differs from its
+    offset at start_utc. The caller has checked that it differs by end_utc.
+    """
+    offset = start_utc.astimezone(tz).utcoffset()
+    base = start_utc.replace(second=0, microsecond=0)
+    lo, hi = 0, int((end_utc - base) / timedelta(minutes=1)) + 1
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if (base + timedelta(minutes=mid)).astimezone(tz).utcoffset() == offset:
+            lo = mid
+        else:
+            hi = mid
+    return base + timedelta(minutes=hi)
+
+
+@lru_cache(maxsize=4096)
+def _minute_of(hhmm: str) -> int:
+    return minutes_since_midnight(hhmm)
+
+
+@dataclass
+class _DayPlan:
+    closed: bool
+    first_start: Optional[str]                 # opens_at when reached by look-ahead
+    offset: int                                # minute of week of 00:00 (0 for exceptions)
+    piece_starts: List[int]                    # offset + day minute; piece_starts[0] == offset
+    piece_closes: List[Optional[str]]          # closes_at while inside the piece
+    open_starts: List[int]                     # interval start day minutes, sorted
+    open_labels: List[str]                     # matching "HH:MM" start strings
+
+    def closes_at(self, minute: int) -> Optional[str]:
+        """closes_at of the interval open at `minute` of this day, or None if closed."""
+        return self.piece_closes[bisect.bisect_right(self.piece_starts, self.offset + minute) - 1]
+
+
+def plan_ranges(plan: _DayPlan) -> List[Tuple[int, int]]:
+    """Open [start, end) minute ranges of a day plan (offset included), adjacent pieces merged."""
+    ranges: List[Tuple[int, int]] = []
+    if plan.closed:
+        return ranges
+    ends = plan.piece_starts[1:] + [plan.offset + MINUTES_PER_DAY]
+    for start, end, closes in zip(plan.piece_starts, ends, plan.piece_closes):
+        if closes is None:
+            continue
+        if ranges and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], end)
+        else:
+            ranges.append((start, end))
+    return ranges
+
+
+def _compile_day(closed: bool, intervals: List[TimeInterval], offset: int = 0) -> _DayPlan:
+    if closed or not intervals:
+        return _DayPlan(closed, None, offset, [offset], [None], [], [])
+
+    if len(intervals) == 1:
+        # Common case: one shift a day
+        iv = intervals[0]
+        start, end = _minute_of(iv.start), _minute_of(iv.end)
+        if start < end:
+            pieces = [(0, None), (start, iv.end), (end, None)]
+        elif start > end:
+            pieces = [(0, iv.end), (end, None), (start, iv.end)]
+        else:
+            pieces = [(0, None)]
+        piece_starts, piece_closes = [], []
+        for b, closes in pieces:
+            if piece_starts and piece_starts[-1] == offset + b:
+                piece_closes[-1] = closes          # zero-length piece at 00:00
+            elif not piece_closes or piece_closes[-1] != closes:
+                piece_starts.append(offset + b)
+                piece_closes.append(closes)
+        return _DayPlan(False, iv.start, offset, piece_starts, piece_closes, [start], [iv.start])
+
+    # Split at every interval boundary; each piece takes the closes_at of the first
+    # interval (in schedule order) covering it, as the linear scan would.
+    segments = []
+    bounds = {0}
+    for order, iv in enumerate(intervals):
+        start, end = _minute_of(iv.start), _minute_of(iv.end)
+        if start < end:
+            segments.append((start, end, iv.end))
+            bounds.update((start, end))
+        elif start > end:
+            segments.append((start, MINUTES_PER_DAY, iv.end))
+            segments.append((0, end, iv.end))
+            bounds.update((start, end))
+    piece_starts, piece_closes = [], []
+    for b in sorted(bounds):
+        closes = next((c for s, e, c in segments if s <= b < e), None)
+        if piece_closes and piece_closes[-1] == closes:
+            continue
+        piece_starts.append(offset + b)
+        piece_closes.append(closes)
+
+    starts = sorted((_minute_of(iv.start), order, iv.start) for order, iv in enumerate(intervals))
+    return _DayPlan(
+        closed=False,
+        first_start=intervals[0].start,
+        offset=offset,
+        piece_starts=piece_starts,
+        piece_closes=piece_closes,
+        open_starts=[m for m, _, _ in starts],
+        open_labels=[label for _, _, label in starts],
+    )
+
+
+# Vendors often share a schedule verbatim (every stall at a market, every truck of
+# a chain). Each schedule gets a canonical key — timezone, weekly rows in evaluation
+# order and the effective exception per date, without ids — and schedules with the
+# same key share one set of lazily compiled plans. batch_open_status evaluates each
+# distinct key once. `dedup_stats` counts both so the sharing ratio is visible.
+#
+# The key is built from plain field tuples (one C-level attrgetter call per row), and
+# only the first schedule with a given key unpacks them into per-day slots, so a
+# schedule that turns out to be shared costs little more than its key.
+
+_weekly_fields = attrgetter("day_of_week", "interval_index", "is_closed", "start_time_local", "end_time_local")
+_exception_fields = attrgetter("exception_date", "is_closed", "start_time_local", "end_time_local")
+_row_order = itemgetter(0, 1)
+
+
+class _WeeklyRow(NamedTuple):
+    day_of_week: int
+    interval_index: int
+    is_closed: bool
+    start_time_local: Optional[str]
+    end_time_local: Optional[str]
+
+
+class _ExceptionRow(NamedTuple):
+    is_closed: bool
+    start_time_local: Optional[str]
+    end_time_local: Optional[str]
+
+_interned: "weakref.WeakValueDictionary[tuple, CompiledSchedule]" = weakref.WeakValueDictionary()
+dedup_stats = {"schedules": 0, "shared_schedules": 0, "statuses": 0, "shared_statuses": 0}
+
+
+def schedule_dedup_stats() -> dict:
+    """Counters plus the share of schedules and statuses served from an identical schedule."""
+    stats = dict(dedup_stats)
+    stats["distinct_schedules"] = len(_interned)
+    stats["schedule_share_rate"] = round(stats["shared_schedules"] / stats["schedules"], 4) if stats["schedules"] else 0.0
+    stats["status_share_rate"] = round(stats["shared_statuses"] / stats["statuses"], 4) if stats["statuses"] else 0.0
+    return stats
+
+
+def _schedule_key(vendor_timezone: str, weekly: List[tuple], exceptions: List[tuple]) -> tuple:
+    """
+    Canonical key from one vendor's weekly and exception field tuples. Rows are only
+    ever read sorted (stably) by interval_index, so that order is canonical; the first
+    exception per date wins, as in get_intervals_for_date.
+    """
+    weekly.sort(key=_row_order)
+    first_exceptions: dict = {}
+    for exc in exceptions:
+        first_exceptions.setdefault(exc[0], exc)
+    return vendor_timezone, tuple(weekly), tuple(sorted(first_exceptions.values()))
+
+
+class CompiledSchedule:
+    """One vendor's weekly hours and exceptions, pre-parsed for fast lookups."""
+
+    def __init__(self, vendor_id: int, vendor_timezone: str, weekly_hours: list, exceptions: list,
+                 window: Optional[Tuple[date, date]] = None):
+        # Fields are copied out of the ORM objects: schedules outlive the session that loaded them
+        self._init(vendor_id, _schedule_key(
+            vendor_timezone,
+            [_weekly_fields(h) for h in weekly_hours if h.vendor_id == vendor_id],
+            [_exception_fields(e) for e in exceptions if e.vendor_id == vendor_id],
+        ), window)
+
+    @classmethod
+    def _from_key(cls, vendor_id: int, key: tuple, window: Optional[Tuple[date, date]]) -> "CompiledSchedule":
+        schedule = cls.__new__(cls)
+        schedule._init(vendor_id, key, window)
+        return schedule
+
+    def _init(self, vendor_id: int, key: tuple, window: Optional[Tuple[date, date]]) -> None:
+        self.vendor_id = vendor_id
+        self.vendor_timezone = key[0]
+        self.window = window   # (first, last) exception dates loaded; None = all of them
+        self.key = key
+        dedup_stats["schedules"] += 1
+        canonical = _interned.get(key)
+        if canonical is not None:
+            dedup_stats["shared_schedules"] += 1
+            self._canonical = canonical
+            self._tz = canonical._tz
+            self._slots = canonical._slots
+            self._days = canonical._days
+            self._first_starts = canonical._first_starts
+            self._exceptions = canonical._exceptions
+            return
+
+        _interned[key] = self
+        self._canonical = self
+        self._tz = _zone(key[0])
+        self._slots: List[List[_WeeklyRow]] = [[] for _ in range(7)]
+        for row in key[1]:
+            self._slots[row[0]].append(_WeeklyRow._make(row))
+        self._days: List[Optional[_DayPlan]] = [None] * 7
+        self._first_starts: List[object] = [_UNSET] * 7
+        self._exceptions = {
+            exception_date: _ExceptionRow(bool(is_closed), start, end)
+            for exception_date, is_closed, start, end in key[2]
+        }
+        self._display: Optional[list] = None
+
+    @property
+    def tz(self):
+        """The vendor's pytz zone."""
+        return self._tz
+
+    def weekday_plan(self, dow: int) -> _DayPlan:
+        """The compiled weekly (exception-free) plan for a day of week."""
+        plan = self._days[dow]
+        if plan is None:
+            day_slots = self._slots[dow]
+            closed = not day_slots or any(s.is_closed for s in day_slots)
+            intervals = [] if closed else [
+                TimeInterval(s.start_time_local, s.end_time_local)
+                for s in sorted(day_slots, key=lambda x: x.interval_index)
+                if s.start_time_local and s.end_time_local
+            ]
+            plan = self._days[dow] = _compile_day(closed, intervals, dow * MINUTES_PER_DAY)
+        return plan
+
+    def _first_start(self, target_date: date) -> Optional[str]:
+        """The look-ahead's opens_at for a date, without compiling the whole day."""
+        exc = self._exceptions.get(target_date)
+        if exc is not None:
+            return self._plan(target_date).first_start
+        dow = target_date.weekday()
+        first = self._first_starts[dow]
+        if first is _UNSET:
+            day_slots = self._slots[dow]
+            first = None
+            if day_slots and not any(s.is_closed for s in day_slots):
+                timed = [s for s in day_slots if s.start_time_local and s.end_time_local]
+                if timed:
+                    first = min(timed, key=lambda x: x.interval_index).start_time_local
+            self._first_starts[dow] = first
+        return first
+
+    def day_plan(self, target_date: date) -> _DayPlan:
+        """The compiled plan for a calendar date, its exception applied if it has one."""
+        return self._plan(target_date)
+
+    def _plan(self, target_date: date) -> _DayPlan:
+        exc = self._exceptions.get(target_date)
+        if exc is None:
+            return self.weekday_plan(target_date.weekday())
+        if not isinstance(exc, _DayPlan):
+            if exc.is_closed:
+                exc = _compile_day(True, [])
+            else:
+                exc = _compile_day(False, (
+                    [TimeInterval(exc.start_time_local, exc.end_time_local)]
+                    if exc.start_time_local and exc.end_time_local else []
+                ))
+            self._exceptions[target_date] = exc
+        return exc
+
+    def open_status(self, reference_utc: Optional[datetime] = None) -> OpenStatus:
+        """Same result as compute_open_status() for this vendor."""
+        return self.open_status_local(_as_utc(reference_utc).astimezone(self._tz))
+
+    def open_status_local(self, local_now: datetime) -> OpenStatus:
+        """open_status() for a moment already converted to the vendor's timezone."""
+        current_date = local_now.date()
+        minute = local_now.hour * 60 + local_now.minute
+
+        today = self._plan(current_date)
+        if not today.closed:
+            closes_at = today.closes_at(minute)
+            if closes_at is not None:
+                return OpenStatus(
+                    is_open=True,
+                    status_label=f"Open · Closes {format_12h(closes_at)}",
+                    closes_at=closes_at,
+                    opens_at=None,
+                    next_open_day=None,
+                )
+            i = bisect.bisect_right(today.open_starts, minute)
+            if i < len(today.open_starts):
+                opens_at = today.open_labels[i]
+                return OpenStatus(
+                    is_open=False,
+                    status_label=f"Closed · Opens {format_12h(opens_at)}",
+                    closes_at=None,
+                    opens_at=opens_at,
+                    next_open_day="today",
+                )
+
+        for delta in range(1, 8):
+            next_date = current_date + timedelta(days=delta)
+            opens_at = self._first_start(next_date)
+            if opens_at is not None:
+                day_label = _day_label(current_date, next_date)
+                return OpenStatus(
+                    is_open=False,
+                    status_label=f"Closed · Opens {day_label} {format_12h(opens_at)}",
+                    closes_at=None,
+                    opens_at=opens_at,
+                    next_open_day=day_label,
+                )
+
+        return OpenStatus(
+            is_open=False,
+            status_label="Closed",
+            closes_at=None,
+            opens_at=None,
+            next_open_day=None,
+        )
+
+    def next_change_local(self, local_now: datetime) -> datetime:
+        """
+        Naive local datetime of the next minute at which open_status_local() can return
+        something different: a piece boundary (opens, closes, closes_at changes), a later
+        start today (the "Opens X" label), or local midnight (date-based labels).
+        """
+        plan = self._plan(local_now.date())
+        minute = local_now.hour * 60 + local_now.minute
+        change = MINUTES_PER_DAY
+        i = bisect.bisect_right(plan.piece_starts, plan.offset + minute)
+        if i < len(plan.piece_starts):
+            change = plan.piece_starts[i] - plan.offset
+        j = bisect.bisect_right(plan.open_starts, minute)
+        if j < len(plan.open_starts):
+            change = min(change, plan.open_starts[j])
+        midnight = datetime.combine(local_now.date(), time())
+        return midnight + timedelta(minutes=change)
+
+    def open_intervals(self, start_utc: datetime, end_utc: datetime) -> List[Tuple[datetime, datetime]]:
+        """
+        Aware-UTC [start, end) intervals inside [start_utc, end_utc) during which
+        open_status().is_open is True. Local open ranges are merged across midnight,
+        then mapped to UTC one constant-offset stretch at a time, so spring-forward
+        gaps and fall-back folds land exactly where the wall-clock check puts them.
+        """
+        tz = self._tz
+        local: List[list] = []
+        day, last_day = start_utc.astimezone(tz).date(), end_utc.astimezone(tz).date()
+        while day <= last_day:
+            plan = self._plan(day)
+            midnight = datetime.combine(day, time()) - timedelta(minutes=plan.offset)
+            for start, end in plan_ranges(plan):
+                a, b = midnight + timedelta(minutes=start), midnight + timedelta(minutes=end)
+                if local and local[-1][1] == a:
+                    local[-1][1] = b
+                else:
+                    local.append([a, b])
+            day += timedelta(days=1)
+
+        # Constant-offset stretches. DST switches are months apart, so a range that
+        # ends on its starting offset has none; otherwise probe daily and pin each
+        # switch to the minute.
+        stretches = []
+        stretch_start, offset = start_utc, start_utc.astimezone(tz).utcoffset()
+        probe = start_utc if end_utc.astimezone(tz).utcoffset() != offset else end_utc
+        while probe < end_utc:
+            probe = min(end_utc, probe + timedelta(days=1))
+            if probe.astimezone(tz).utcoffset() != offset:
+                switch = offset_switch(tz, probe - timedelta(days=1), probe)
+                stretches.append((stretch_start, switch, offset))
+                stretch_start, offset = switch, switch.astimezone(tz).utcoffset()
+        stretches.append((stretch_start, end_utc, offset))
+
+        pieces = []
+        for lo_utc, hi_utc, offset in stretches:
+            lo_naive, hi_naive = lo_utc.replace(tzinfo=None), hi_utc.replace(tzinfo=None)
+            for a, b in local:
+                lo, hi = max(a - offset, lo_naive), min(b - offset, hi_naive)
+                if lo < hi:
+                    pieces.append((lo, hi))
+
+        merged: List[list] = []
+        for lo, hi in sorted(pieces):
+            if merged and lo <= merged[-1][1]:
+                merged[-1][1] = max(hi, merged[-1][1])
+            else:
+                merged.append([lo, hi])
+        return [(lo.replace(tzinfo=pytz.utc), hi.replace(tzinfo=pytz.utc)) for lo, hi in merged]
+
+    def covers(self, reference_utc: Optional[datetime] = None) -> bool:
+        """True if the loaded exception window spans this instant's whole look-ahead."""
+        if self.window is None:
+            return True
+        today = _as_utc(reference_utc).astimezone(self._tz).date()
+        return self.window[0] <= today and today + timedelta(days=LOOKAHEAD_DAYS) <= self.window[1]
+
+    def exception_dates(self) -> List[date]:
+        return list(self._exceptions)
+
+    def is_open_on(self, target_date: date, minute: int) -> bool:
+        """Open at `minute` (local wall clock) of `target_date`, exceptions applied."""
+        plan = self._plan(target_date)
+        return not plan.closed and plan.closes_at(minute) is not None
+
+    @staticmethod
+    def next_date_for(target_dow: int) -> date:
+        """Next occurrence of target_dow from today, as vendor_open_on_day_at_time() picks it."""
+        today = date.today()
+        return today + timedelta(days=(target_dow - today.weekday()) % 7)
+
+    def is_open_on_day_at_time(self, target_dow: int, target_hhmm: str) -> bool:
+        """Same result as vendor_open_on_day_at_time() for this vendor."""
+        return self.is_open_on(self.next_date_for(target_dow), _minute_of(target_hhmm))
+
+    def weekly_display(self) -> list:
+        """Same result as get_weekly_schedule_display() for this vendor."""
+        if self._canonical is not self:
+            return self._canonical.weekly_display()
+        if self._display is None:
+            days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+            self._display = []
+            for dow, day_name in enumerate(days):
+                day_slots = sorted(
+                    (h for h in self._slots[dow] if not h.is_closed), key=lambda x: x.interval_index
+                )
+                self._display.append({
+                    "day": day_name,
+                    "dow": dow,
+                    "is_closed": not day_slots,
+                    "intervals": [
+                        {
+                            "start": s.start_time_local,
+                            "end": s.end_time_local,
+                            "start_12h": format_12h(s.start_time_local) if s.start_time_local else None,
+                            "end_12h": format_12h(s.end_time_local) if s.end_time_local else None,
+                        }
+                        for s in day_slots
+                    ],
+                })
+        return self._display
+
+
+def compile_schedule(vendor_id: int, vendor_timezone: str, weekly_hours: list, exceptions: list) -> CompiledSchedule:
+    return CompiledSchedule(vendor_id, vendor_timezone, weekly_hours, exceptions)
+
+
+# ─── Batch open status ──────────────────────────────────────────────────────
+
+def compile_schedules(vendors: list, weekly_hours: list, exceptions: list,
+                      window: Optional[Tuple[date, date]] = None) -> Dict[int, CompiledSchedule]:
+    """
+    Compile schedules for many vendors (anything with .id and .timezone) from one
+    flat list of weekly rows and one of exceptions, grouped by vendor_id in one pass.
+    `window` records which exception dates the list was filtered to, if any.
+    """
+    weekly_by_vendor: Dict[int, list] = defaultdict(list)
+    for h in weekly_hours:
+        weekly_by_vendor[h.vendor_id].append(_weekly_fields(h))
+    exceptions_by_vendor: Dict[int, list] = defaultdict(list)
+    for e in exceptions:
+        exceptions_by_vendor[e.vendor_id].append(_exception_fields(e))
+    return {
+        v.id: CompiledSchedule._from_key(
+            v.id, _schedule_key(v.timezone, weekly_by_vendor.get(v.id, []), exceptions_by_vendor.get(v.id, ())),
+            window,
+        )
+        for v in vendors
+    }
+
+
+def batch_open_status(schedules: Iterable[CompiledSchedule], reference_utc: Optional[datetime] = None) -> Dict[int, OpenStatus]:
+    """
+    OpenStatus for every schedule at one reference instant. Vendors are grouped by
+    timezone so the UTC → local conversion runs once per zone, not once per vendor,
+    and the status is computed once per distinct schedule key.
+    """
+    reference_utc = _as_utc(reference_utc)
+    by_zone: Dict[str, List[CompiledSchedule]] = defaultdict(list)
+    for schedule in schedules:
+        by_zone[schedule.vendor_timezone].append(schedule)
+
+    result = {}
+    for members in by_zone.values():
+        local_now = reference_utc.astimezone(_zone(members[0].vendor_timezone))
+        by_key: Dict[tuple, OpenStatus] = {}
+        for schedule in members:
+            status = by_key.get(schedule.key)
+            if status is None:
+                status = by_key[schedule.key] = schedule.open_status_local(local_now)
+            result[schedule.vendor_id] = status
+        dedup_stats["statuses"] += len(members)
+        dedup_stats["shared_statuses"] += len(members) - len(by_key)
+    return result
+
+
+def batch_open_intervals(schedules: Iterable[CompiledSchedule], start_utc: datetime,
+                         end_utc: datetime) -> Dict[int, List[Tuple[datetime, datetime]]]:
+    """open_intervals() for every schedule, computed once per distinct schedule key."""
+    start_utc, end_utc = _as_utc(start_utc), _as_utc(end_utc)
+    by_key: Dict[tuple, list] = {}
+    result = {}
+    for schedule in schedules:
+        intervals = by_key.get(schedule.key)
+        if intervals is None:
+            intervals = by_key[schedule.key] = schedule.open_intervals(start_utc, end_utc)
+        result[schedule.vendor_id] = intervals
+    return result
+
+
+def compute_open_statuses(
+    vendors: list,
+    weekly_hours: list,
+    exceptions: list,
+    reference_utc: Optional[datetime] = None,
+) -> Dict[int, OpenStatus]:
+    """Batch compute_open_status(): {vendor_id: OpenStatus} for every vendor."""
+    return batch_open_status(compile_schedules(vendors, weekly_hours, exceptions).values(), reference_utc)
+
+
+def load_schedules(db, vendors: list) -> Dict[int, CompiledSchedule]:
+    """
+    Load hours for many vendors in two queries and compile their schedules.
+    Only exceptions inside exception_window() are read (via the vendor/date index).
+    """
+    from app.models.hours import VendorHoursWeekly, VendorHoursException
+
+    ids = list({v.id for v in vendors})
+    if not ids:
+        return {}
+    window = exception_window()
+    weekly = db.query(VendorHoursWeekly).filter(VendorHoursWeekly.vendor_id.in_(ids)).all()
+    exceptions = (
+        db.query(VendorHoursException)
+        .filter(
+            VendorHoursException.vendor_id.in_(ids),
+            VendorHoursException.exception_date.between(*window),
+        )
+        .all()
+    )
+    return compile_schedules(vendors, weekly, exceptions, window)
+
+
+# ─── Stored schedule display ────────────────────────────────────────────────
+#
+# get_weekly_schedule_display only depends on the weekly rows, so it is rendered
+# once per edit and stored in vendor_schedule_displays; detail and status reads
+# serve the stored JSON instead of re-rendering.
+
+def store_schedule_display(vendor, weekly_hours: list) -> None:
+    """Render the vendor's weekly schedule onto its display row (the caller commits)."""
+    from app.models.hours import VendorScheduleDisplay
+
+    schedule = get_weekly_schedule_display(vendor.id, vendor.timezone, weekly_hours, [])
+    if vendor.schedule_display is None:
+        vendor.schedule_display = VendorScheduleDisplay(schedule=schedule)
+    else:
+        vendor.schedule_display.schedule = schedule
+
+
+def schedule_display(vendor, compiled: CompiledSchedule) -> list:
+    """The stored display, or one rendered from the compiled schedule if none is stored yet."""
+    stored = vendor.schedule_display
+    return stored.schedule if stored is not None else compiled.weekly_display()
+
+
+def backfill_schedule_displays(db) -> int:
+    """Store displays for vendors that have none (e.g. created before the table). Returns the count."""
+    from app.models.vendor import Vendor
+    from app.models.hours import VendorHoursWeekly
+
+    vendors = db.query(Vendor).filter(~Vendor.schedule_display.has()).all()
+    if not vendors:
+        return 0
+    weekly = (
+        db.query(VendorHoursWeekly)
+        .filter(VendorHoursWeekly.vendor_id.in_([v.id for v in vendors]))
+        .all()
+    )
+    by_vendor: Dict[int, list] = defaultdict(list)
+    for h in weekly:
+        by_vendor[h.vendor_id].append(h)
+    for v in vendors:
+        store_schedule_display(v, by_vendor.get(v.id, []))
+    db.commit()
+    return len(vendors)
@@ -0,0 +1,132 @@
+"""
+Single entry point for keeping the process-local vendor indexes in sync.
+
+Write paths call `refresh_vendor(vendor)` after a commit (or `remove_vendor(id)`
+after a delete, `refresh_vendor_hours(vendor)` after an hours write); startup
+calls `load_indexes(db)`. Each index decides for itself which vendors it holds.
+
+The indexes and caches are per process, and writes handled by another replica
+never reach these hooks here. `run_resync` therefore compares every vendor's
+version counter (bumped by every write, see vendor_versions) with the versions
+last synced every RESYNC_INTERVAL_SECONDS, re-syncs the vendors that changed and
+drops the ones that are gone. Local writes are re-synced once more, harmlessly.
+"""
+
+import asyncio
+from typing import Dict
+
+from app.services import (
+    spatial_index, suggest_index, fuzzy_index, facet_index, cluster_index, open_index, status_cache, tile_cache,
+    response_cache, vendor_snapshots,
+)
+
+
+RESYNC_INTERVAL_SECONDS = 30.0
+
+_synced_versions: Dict[int, int] = {}
+
+
+def _current_versions(db) -> Dict[int, int]:
+    from app.models.vendor import VendorVersion
+
+    return dict(db.query(VendorVersion.vendor_id, VendorVersion.version).all())
+
+
+def load_indexes(db) -> dict:
+    """Build every index from the database. Returns {index name: vendor count}."""
+    global _synced_versions
+    # Read first, so writes committed during the build are picked up by the next resync
+    versions = _current_versions(db)
+    counts = {
+        "spatial": spatial_index.load_spatial_index(db),
+        "suggest": suggest_index.load_suggest_index(db),
+        "fuzzy": fuzzy_index.load_fuzzy_index(db),
+        "facet": facet_index.load_facet_index(db),
+        "cluster": cluster_index.load_cluster_index(db),
+        "open": open_index.load_open_index(db),
+    }
+    _synced_versions = versions
+    return counts
+
+
+def resync_indexes(db) -> int:
+    """Re-sync vendors whose version changed since the last sync. Returns how many."""
+    from sqlalchemy.orm import selectinload
+    from app.models.vendor import Vendor
+
+    global _synced_versions
+    versions = _current_versions(db)
+    changed = [vid for vid, version in versions.items() if _synced_versions.get(vid) != version]
+    gone = [vid for vid in _synced_versions if vid not in versions]
+    if changed:
+        vendors = (
+            db.query(Vendor)
+            .filter(Vendor.id.in_(changed))
+            .options(
+                selectinload(Vendor.tags),
+                selectinload(Vendor.weekly_hours),
+                selectinload(Vendor.hour_exceptions),
+            )
+            .all()
+        )
+        gone += sorted(set(changed) - {v.id for v in vendors})
+        for vendor in vendors:
+            refresh_vendor(vendor)
+            refresh_vendor_hours(vendor)
+    for vendor_id in gone:
+        remove_vendor(vendor_id)
+    _synced_versions = versions
+    return len(set(changed) | set(gone))
+
+
+def _resync_once(session_factory) -> int:
+    db = session_factory()
+    try:
+        return resync_indexes(db)
+    finally:
+        db.close()
+
+
+async def run_resync(session_factory) -> None:
+    """Background task: pick up other replicas' writes every RESYNC_INTERVAL_SECONDS."""
+    while True:
+        await asyncio.sleep(RESYNC_INTERVAL_SECONDS)
+        try:
+            synced = await asyncio.to_thread(_resync_once, session_factory)
+            if synced:
+                print(f"[indexes] Re-synced {synced} vendors changed elsewhere", flush=True)
+        except Exception as e:
+            print(f"[indexes] Resync ERROR: {e}", flush=True)
+
+
+def refresh_vendor(vendor) -> None:
+    spatial_index.refresh_vendor(vendor)
+    suggest_index.refresh_vendor(vendor)
+    fuzzy_index.refresh_vendor(vendor)
+    facet_index.refresh_vendor(vendor)
+    cluster_index.refresh_vendor(vendor)
+    open_index.refresh_vendor(vendor)
+    tile_cache.refresh_vendor(vendor)
+    response_cache.refresh_vendor(vendor)
+    vendor_snapshots.refresh_vendor(vendor)
+
+
+def refresh_vendor_hours(vendor) -> None:
+    open_index.refresh_vendor_hours(vendor)
+    status_cache.refresh_vendor_hours(vendor)
+    tile_cache.refresh_vendor(vendor)
+    response_cache.refresh_vendor(vendor)
+    vendor_snapshots.refresh_vendor(vendor)
+
+
+def remove_vendor(vendor_id: int) -> None:
+    spatial_index.spatial_index.remove(vendor_id)
+    suggest_index.suggest_index.remove(vendor_id)
+    fuzzy_index.fuzzy_index.remove(vendor_id)
+    facet_index.facet_index.remove(vendor_id)
+    cluster_index.cluster_index.remove(vendor_id)
+    open_index.open_index.remove(vendor_id)
+    status_cache.status_cache.invalidate(vendor_id)
+    tile_cache.tile_cache.invalidate_vendor(vendor_id)
+    response_cache.response_cache.invalidate_vendor(vendor_id)
+    vendor_snapshots.vendor_snapshots.invalidate(vendor_id)
@@ -0,0 +1,207 @@
+"""
+Process-local index of which vendors are open in each minute-of-week slot.
+
+Key design:
+- The week (Mon 00:00 local = minute 0) is cut into SLOT_MINUTES slots. For every
+  slot there are two bitsets over vendor ids (Python ints, as in the facet index):
+  `full` — open for the whole slot — and `partial` — open for part of it. Slots are
+  in each vendor's own local time, built from its CompiledSchedule's weekly plan,
+  so the answer matches open_status() exactly.
+- Vendors are also grouped into one bitset per IANA timezone. "Open now" converts
+  the instant to local time once per zone and reads that zone's slot:
+  full members are open; partial members get an exact bisect check.
+- VendorHoursException overrides are per date: vendors with an exception on the
+  queried local date are masked out of the weekly bitsets and checked exactly.
+  Only exceptions from yesterday on are loaded; past ones can never be queried.
+- The hours endpoints call `refresh_vendor_hours`, which recompiles one vendor
+  and flips its bits; vendor writes only reload it when the timezone changed.
+"""
+
+import threading
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pytz
+
+from app.services.facet_index import to_bitmap, to_ids
+from app.services.hours_service import MINUTES_PER_DAY, CompiledSchedule, compile_schedules, exception_window
+
+SLOT_MINUTES = 15
+SLOTS_PER_WEEK = 7 * MINUTES_PER_DAY // SLOT_MINUTES
+
+
+def schedule_slots(schedule: CompiledSchedule) -> Tuple[List[int], List[int]]:
+    """(full slots, partial slots) of a schedule's weekly plan."""
+    minutes = np.zeros(7 * MINUTES_PER_DAY, dtype=bool)
+    for dow in range(7):
+        plan = schedule.weekday_plan(dow)
+        if plan.closed:
+            continue
+        ends = plan.piece_starts[1:] + [(dow + 1) * MINUTES_PER_DAY]
+        for start, end, closes in zip(plan.piece_starts, ends, plan.piece_closes):
+            if closes is not None:
+                minutes[start:end] = True
+    per_slot = minutes.reshape(SLOTS_PER_WEEK, SLOT_MINUTES)
+    full = per_slot.all(axis=1)
+    partial = per_slot.any(axis=1) & ~full
+    return np.flatnonzero(full).tolist(), np.flatnonzero(partial).tolist()
+
+
+class OpenIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._full: List[int] = [0] * SLOTS_PER_WEEK
+        self._partial: List[int] = [0] * SLOTS_PER_WEEK
+        self._zones: Dict[str, int] = {}                 # timezone → vendor bitset
+        self._overrides: Dict[date, int] = {}            # exception date → vendor bitset
+        self._schedules: Dict[int, CompiledSchedule] = {}
+        self._vendor_slots: Dict[int, Tuple[List[int], List[int]]] = {}
+        self._vendor_dates: Dict[int, Set[date]] = {}
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._schedules)
+
+    def timezone_of(self, vendor_id: int) -> Optional[str]:
+        schedule = self._schedules.get(vendor_id)
+        return schedule.vendor_timezone if schedule else None
+
+    def build(self, schedules: List[CompiledSchedule]) -> None:
+        full, partial = defaultdict(list), defaultdict(list)
+        zones, overrides = defaultdict(list), defaultdict(list)
+        vendor_slots, vendor_dates = {}, {}
+        for schedule in schedules:
+            vid = schedule.vendor_id
+            slots = vendor_slots[vid] = schedule_slots(schedule)
+            for slot in slots[0]:
+                full[slot].append(vid)
+            for slot in slots[1]:
+                partial[slot].append(vid)
+            zones[schedule.vendor_timezone].append(vid)
+            vendor_dates[vid] = set(schedule.exception_dates())
+            for d in vendor_dates[vid]:
+                overrides[d].append(vid)
+        with self._lock:
+            self._full = [to_bitmap(full.get(s, ())) for s in range(SLOTS_PER_WEEK)]
+            self._partial = [to_bitmap(partial.get(s, ())) for s in range(SLOTS_PER_WEEK)]
+            self._zones = {tz: to_bitmap(ids) for tz, ids in zones.items()}
+            self._overrides = {d: to_bitmap(ids) for d, ids in overrides.items()}
+            self._schedules = {s.vendor_id: s for s in schedules}
+            self._vendor_slots = vendor_slots
+            self._vendor_dates = vendor_dates
+            self.ready = True
+
+    def upsert(self, schedule: CompiledSchedule) -> None:
+        slots = schedule_slots(schedule)
+        with self._lock:
+            self._discard(schedule.vendor_id)
+            vid, bit = schedule.vendor_id, 1 << schedule.vendor_id
+            for slot in slots[0]:
+                self._full[slot] |= bit
+            for slot in slots[1]:
+                self._partial[slot] |= bit
+            tz = schedule.vendor_timezone
+            self._zones[tz] = self._zones.get(tz, 0) | bit
+            dates = set(schedule.exception_dates())
+            for d in dates:
+                self._overrides[d] = self._overrides.get(d, 0) | bit
+            self._schedules[vid] = schedule
+            self._vendor_slots[vid] = slots
+            self._vendor_dates[vid] = dates
+
+    def remove(self, vendor_id: int) -> None:
+        with self._lock:
+            self._discard(vendor_id)
+
+    def _discard(self, vendor_id: int) -> None:
+        schedule = self._schedules.pop(vendor_id, None)
+        if schedule is None:
+            return
+        mask = ~(1 << vendor_id)
+        full, partial = self._vendor_slots.pop(vendor_id)
+        for slot in full:
+            self._full[slot] &= mask
+        for slot in partial:
+            self._partial[slot] &= mask
+        tz = schedule.vendor_timezone
+        self._zones[tz] = self._zones.get(tz, 0) & mask
+        if not self._zones[tz]:
+            del self._zones[tz]
+        for d in self._vendor_dates.pop(vendor_id, ()):
+            bitmap = self._overrides.get(d, 0) & mask
+            if bitmap:
+                self._overrides[d] = bitmap
+            else:
+                self._overrides.pop(d, None)
+
+    def _open_in_slot(self, members: int, target_date: date, minute: int) -> int:
+        """Bitset of `members` open at `minute` of `target_date` (caller holds the lock)."""
+        slot = (target_date.weekday() * MINUTES_PER_DAY + minute) // SLOT_MINUTES
+        overridden = self._overrides.get(target_date, 0) & members
+        weekly = members & ~overridden
+        result = self._full[slot] & weekly
+        for vid in to_ids(self._partial[slot] & weekly):
+            if self._schedules[vid].is_open_on(target_date, minute):
+                result |= 1 << vid
+        for vid in to_ids(overridden):
+            if self._schedules[vid].is_open_on(target_date, minute):
+                result |= 1 << vid
+        return result
+
+    def open_now(self, reference_utc: Optional[datetime] = None) -> Set[int]:
+        """Ids of vendors open at the instant (same answer as open_status().is_open)."""
+        if reference_utc is None:
+            reference_utc = datetime.utcnow()
+        if reference_utc.tzinfo is None:
+            reference_utc = reference_utc.replace(tzinfo=pytz.utc)
+        result = 0
+        with self._lock:
+            for tz, members in self._zones.items():
+                local = reference_utc.astimezone(pytz.timezone(tz))
+                result |= self._open_in_slot(members, local.date(), local.hour * 60 + local.minute)
+        return set(to_ids(result))
+
+    def open_at(self, target_dow: int, target_hhmm: str) -> Set[int]:
+        """Ids of vendors open on the next `target_dow` at wall-clock `target_hhmm`
+        (same answer as is_open_on_day_at_time())."""
+        target_date = CompiledSchedule.next_date_for(target_dow)
+        h, m = target_hhmm.split(":")
+        with self._lock:
+            members = 0
+            for bm in self._zones.values():
+                members |= bm
+            result = self._open_in_slot(members, target_date, int(h) * 60 + int(m))
+        return set(to_ids(result))
+
+
+open_index = OpenIndex()
+
+
+def load_open_index(db) -> int:
+    """(Re)build the index from every vendor's hours. Returns the count."""
+    from app.models.vendor import Vendor
+    from app.models.hours import VendorHoursWeekly, VendorHoursException
+
+    vendors = db.query(Vendor.id, Vendor.timezone).all()
+    weekly = db.query(VendorHoursWeekly).all()
+    exceptions = db.query(VendorHoursException).filter(
+        VendorHoursException.exception_date >= exception_window()[0]
+    ).all()
+    open_index.build(list(compile_schedules(vendors, weekly, exceptions).values()))
+    return len(open_index)
+
+
+def refresh_vendor_hours(vendor) -> None:
+    """Recompile one vendor after a committed hours (or timezone) write."""
+    first = exception_window()[0]
+    exceptions = [e for e in vendor.hour_exceptions if e.exception_date >= first]
+    schedule = CompiledSchedule(vendor.id, vendor.timezone, vendor.weekly_hours, exceptions)
+    open_index.upsert(schedule)
+
+
+def refresh_vendor(vendor) -> None:
+    """Vendor writes only matter here when they add a vendor or move its timezone."""
+    if open_index.timezone_of(vendor.id) != vendor.timezone:
+        refresh_vendor_hours(vendor)
@@ -0,0 +1,151 @@
+"""
+SQL-side open-hours ranges, so open_now / open_day / open_time filter in the query.
+
+Key design:
+- vendor_open_ranges holds each vendor's weekly open ranges as local minutes of
+  the week [start, end) (Mon 00:00 = 0), taken from the CompiledSchedule's weekly
+  plans — the same pieces open_status() reads, midnight-spanning intervals included.
+- Upcoming exceptions (from yesterday on) go to vendor_open_exception_ranges as
+  local minutes of their date; a row with NULL minutes marks a date closed all day.
+  Ranges stay in local wall-clock time rather than UTC because open status is a
+  wall-clock check: a UTC range would be wrong inside a DST fold or gap.
+- "Open at local date d, minute m" is then
+      EXISTS exception range on d containing m
+      OR (NOT EXISTS exception row on d AND EXISTS weekly range containing dow(d)·1440 + m)
+  For open-now, d and m depend on the vendor's timezone, so the predicate is an OR
+  over the distinct timezones (a handful), each converting the instant once.
+- The hours endpoints call `store_open_ranges` before committing, so the ranges
+  change in the same transaction as the hours. `setup_open_ranges` fills the
+  tables on first start; search falls back to the in-memory open index until then.
+"""
+
+from datetime import date, datetime
+from typing import Optional
+
+import pytz
+from sqlalchemy import and_, exists, false, or_
+
+from app.services.hours_service import (
+    MINUTES_PER_DAY,
+    CompiledSchedule,
+    compile_schedules,
+    exception_window,
+    plan_ranges,
+)
+
+enabled = False
+
+
+def _rows(schedule: CompiledSchedule):
+    from app.models.hours import VendorOpenRange, VendorOpenExceptionRange
+
+    vid = schedule.vendor_id
+    for dow in range(7):
+        for start, end in plan_ranges(schedule.weekday_plan(dow)):
+            yield VendorOpenRange(vendor_id=vid, start_minute=start, end_minute=end)
+    first = exception_window()[0]
+    for d in schedule.exception_dates():
+        if d < first:
+            continue
+        ranges = plan_ranges(schedule.day_plan(d)) or [(None, None)]
+        for start, end in ranges:
+            yield VendorOpenExceptionRange(vendor_id=vid, local_date=d, start_minute=start, end_minute=end)
+
+
+def store_open_ranges(db, vendor) -> None:
+    """Rewrite one vendor's ranges from its current (flushed) hours. The caller commits."""
+    from app.models.hours import (
+        VendorHoursWeekly, VendorHoursException, VendorOpenRange, VendorOpenExceptionRange,
+    )
+
+    db.flush()
+    weekly = db.query(VendorHoursWeekly).filter(VendorHoursWeekly.vendor_id == vendor.id).all()
+    exceptions = db.query(VendorHoursException).filter(
+        VendorHoursException.vendor_id == vendor.id,
+        VendorHoursException.exception_date >= exception_window()[0],
+    ).all()
+    schedule = CompiledSchedule(vendor.id, vendor.timezone, weekly, exceptions)
+    db.query(VendorOpenRange).filter(VendorOpenRange.vendor_id == vendor.id).delete()
+    db.query(VendorOpenExceptionRange).filter(VendorOpenExceptionRange.vendor_id == vendor.id).delete()
+    db.add_all(list(_rows(schedule)))
+
+
+def rebuild_open_ranges(db) -> int:
+    """Regenerate both tables for every vendor. Returns the number of vendors."""
+    from app.models.vendor import Vendor
+    from app.models.hours import (
+        VendorHoursWeekly, VendorHoursException, VendorOpenRange, VendorOpenExceptionRange,
+    )
+
+    vendors = db.query(Vendor.id, Vendor.timezone).all()
+    weekly = db.query(VendorHoursWeekly).all()
+    exceptions = db.query(VendorHoursException).filter(
+        VendorHoursException.exception_date >= exception_window()[0]
+    ).all()
+    db.query(VendorOpenRange).delete()
+    db.query(VendorOpenExceptionRange).delete()
+    for schedule in compile_schedules(vendors, weekly, exceptions).values():
+        db.add_all(list(_rows(schedule)))
+    db.commit()
+    return len(vendors)
+
+
+def setup_open_ranges(db) -> bool:
+    """Fill the range tables if they have never been built, then enable SQL filtering."""
+    global enabled
+    from app.models.hours import VendorHoursWeekly, VendorHoursException, VendorOpenRange, VendorOpenExceptionRange
+
+    built = db.query(VendorOpenRange.id).first() or db.query(VendorOpenExceptionRange.id).first()
+    has_hours = db.query(VendorHoursWeekly.id).first() or db.query(VendorHoursException.id).first()
+    if has_hours and not built:
+        rebuild_open_ranges(db)
+    enabled = True
+    return True
+
+
+def _open_on(local_date: date, day_minute: int, week_minute: int):
+    from app.models.vendor import Vendor
+    from app.models.hours import VendorOpenRange, VendorOpenExceptionRange
+
+    exc = VendorOpenExceptionRange
+    has_exception = exists().where(exc.vendor_id == Vendor.id, exc.local_date == local_date)
+    exception_open = exists().where(
+        exc.vendor_id == Vendor.id,
+        exc.local_date == local_date,
+        exc.start_minute <= day_minute,
+        exc.end_minute > day_minute,
+    )
+    weekly_open = exists().where(
+        VendorOpenRange.vendor_id == Vendor.id,
+        VendorOpenRange.start_minute <= week_minute,
+        VendorOpenRange.end_minute > week_minute,
+    )
+    return or_(exception_open, and_(~has_exception, weekly_open))
+
+
+def open_now_clause(db, reference_utc: Optional[datetime] = None):
+    """SQL predicate: the vendor is open at the instant (same answer as open_status().is_open)."""
+    from app.models.vendor import Vendor
+
+    if reference_utc is None:
+        reference_utc = datetime.utcnow()
+    if reference_utc.tzinfo is None:
+        reference_utc = reference_utc.replace(tzinfo=pytz.utc)
+    clauses = []
+    for (tz,) in db.query(Vendor.timezone).distinct().all():
+        local = reference_utc.astimezone(pytz.timezone(tz))
+        minute = local.hour * 60 + local.minute
+        clauses.append(and_(
+            Vendor.timezone == tz,
+            _open_on(local.date(), minute, local.weekday() * MINUTES_PER_DAY + minute),
+        ))
+    return or_(*clauses) if clauses else false()
+
+
+def open_at_clause(target_dow: int, target_hhmm: str):
+    """SQL predicate: open on the next `target_dow` at wall-clock `target_hhmm`
+    (same answer as is_open_on_day_at_time())."""
+    target_date = CompiledSchedule.next_date_for(target_dow)
+    h, m = target_hhmm.split(":")
+    minute = int(h) * 60 + int(m)
+    return _open_on(target_date, minute, target_dow * MINUTES_PER_DAY + minute)
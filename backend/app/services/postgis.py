@@ -0,0 +1,93 @@
+"""
+Optional PostGIS support for distance search.
+
+Key design:
+- The `vendors.geog` geography(Point, 4326) column is NOT declared on the ORM model,
+  so plain PostgreSQL (or any DB without the extension) keeps working unchanged.
+- At startup `setup_postgis()` enables the extension if it can, adds the column and
+  its GiST index, backfills it, and installs a trigger that keeps it in sync with
+  latitude/longitude on every INSERT/UPDATE — whichever code path does the write.
+- Search code checks `postgis.enabled` and otherwise falls back to the
+  in-memory / bounding-box path.
+"""
+
+from sqlalchemy import func, literal_column, text
+
+from app.config import settings
+
+METERS_PER_MILE = 1609.344
+
+enabled = False
+
+_SETUP_STATEMENTS = [
+    "ALTER TABLE vendors ADD COLUMN IF NOT EXISTS geog geography(Point, 4326)",
+    "CREATE INDEX IF NOT EXISTS ix_vendors_geog ON vendors USING GIST (geog)",
+    """
+    CREATE OR REPLACE FUNCTION vendors_sync_geog() RETURNS trigger AS $$
+    BEGIN
+        IF NEW.latitude IS NULL OR NEW.longitude IS NULL THEN
+            NEW.geog := NULL;
+        ELSE
+            NEW.geog := ST_SetSRID(ST_MakePoint(NEW.longitude, NEW.latitude), 4326)::geography;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_vendors_sync_geog ON vendors",
+    """
+    CREATE TRIGGER trg_vendors_sync_geog
+    BEFORE INSERT OR UPDATE OF latitude, longitude ON vendors
+    FOR EACH ROW EXECUTE FUNCTION vendors_sync_geog()
+    """,
+    """
+    UPDATE vendors
+    SET geog = ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography
+    WHERE latitude IS NOT NULL AND longitude IS NOT NULL AND geog IS NULL
+    """,
+]
+
+
+def setup_postgis(engine) -> bool:
+    """Enable the PostGIS search mode if the extension is (or can be) installed."""
+    global enabled
+    enabled = False
+    if not settings.ENABLE_POSTGIS or engine.dialect.name != "postgresql":
+        return False
+
+    with engine.connect() as conn:
+        available = conn.execute(
+            text("SELECT 1 FROM pg_available_extensions WHERE name = 'postgis'")
+        ).first()
+        if not available:
+            return False
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
+        for stmt in _SETUP_STATEMENTS:
+            conn.execute(text(stmt))
+
+    enabled = True
+    return True
+
+
+geog = literal_column("vendors.geog")
+
+
+def point(lat: float, lng: float):
+    """Geography point for a query location."""
+    return func.geography(func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326))
+
+
+def within_miles(origin, miles: float):
+    """ST_DWithin predicate — served by the GiST index."""
+    return func.ST_DWithin(geog, origin, miles * METERS_PER_MILE)
+
+
+def distance_miles(origin):
+    return func.ST_Distance(geog, origin) / METERS_PER_MILE
+
+
+def knn_order(origin):
+    """`<->` KNN ordering expression — an index-assisted nearest-first scan."""
+    return geog.op("<->")(origin)
@@ -0,0 +1,171 @@
+"""
+Process-local cache of /api/vendors/search and /api/vendors/featured responses.
+
+Key design:
+- Keys are the endpoint plus its normalized query params. Searches whose results
+  depend on the origin (a radius, or sort_by=distance) cache a candidate set per
+  geohash cell (GEOHASH_PRECISION): every match within the radius plus the cell's
+  half-diagonal (`cell_margin_miles`) of the cell center, with its sort key. Each
+  request then keeps the candidates within the radius of its own origin, sorts
+  and pages them, so every user in the cell shares one entry and still gets
+  exactly what a fresh search from their position would return.
+- Other searches, and featured, cache pages; their results do not depend on the
+  origin, so `localize` only recomputes distance_miles for the caller.
+- Entries expire after RESPONSE_TTL_SECONDS, or earlier at the first open/close
+  transition of any vendor whose status went into the page (from the status
+  cache), so is_open labels are never served stale. Pages filtered on open hours
+  also expire at the next minute, since vendors the SQL filter excluded can open.
+- Each entry records the vendor ids it shows and the area its query covered
+  (center + radius, or everywhere). `invalidate_vendor` — called for vendor, tag,
+  hours, review and favorite writes — drops entries showing the vendor plus those
+  whose area contains its location, where it could now appear.
+- Least recently used entries are evicted past MAX_ENTRIES. Like the indexes, the
+  cache is per process: writes handled by another worker reach it through the TTL
+  or the periodic version resync (indexes.run_resync), whichever comes first.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+import pytz
+
+from app.utils.geo import geohash_bounds, geohash_encode, haversine_distance
+
+GEOHASH_PRECISION = 6
+RESPONSE_TTL_SECONDS = 60
+MAX_ENTRIES = 2000
+
+Area = Optional[Tuple[float, float, float]]   # (lat, lng, radius miles); None = everywhere
+
+
+@dataclass
+class CachedResponse:
+    items: List[dict]
+    next_cursor: Optional[str]
+    vendor_ids: Set[int]
+    area: Area
+    expires_at: float          # time.monotonic()
+    keys: Optional[List[Tuple[int, list]]] = None   # (phase, sort key) per item, for candidate sets
+
+
+def quantize(lat: float, lng: float) -> Tuple[str, float, float]:
+    """(geohash cell, center lat, center lng) for an origin."""
+    cell = geohash_encode(lat, lng, GEOHASH_PRECISION)
+    south, west, north, east = geohash_bounds(cell)
+    return cell, (south + north) / 2, (west + east) / 2
+
+
+def cell_margin_miles(lat: float) -> float:
+    """Distance from a cell's center to its farthest corner, at this latitude."""
+    south, west, north, east = geohash_bounds(geohash_encode(lat, 0.0, GEOHASH_PRECISION))
+    center_lat, center_lng = (south + north) / 2, (west + east) / 2
+    return max(haversine_distance(center_lat, center_lng, corner_lat, east) for corner_lat in (south, north))
+
+
+def localize(items: List[dict], lat: Optional[float], lng: Optional[float]) -> List[dict]:
+    """Copies of cached cards with distance_miles recomputed for (lat, lng)."""
+    if lat is None or lng is None:
+        return [dict(item) for item in items]
+    result = []
+    for item in items:
+        item = dict(item)
+        if item.get("latitude") is not None and item.get("longitude") is not None:
+            item["distance_miles"] = round(haversine_distance(lat, lng, item["latitude"], item["longitude"]), 2)
+        result.append(item)
+    return result
+
+
+def expiry(transition: Optional[datetime], minute_bound: bool = False) -> float:
+    """Monotonic expiry: the TTL, capped by the first status transition (and the next minute)."""
+    now_utc = datetime.now(pytz.utc)
+    seconds = float(RESPONSE_TTL_SECONDS)
+    if transition is not None:
+        seconds = min(seconds, (transition - now_utc).total_seconds())
+    if minute_bound:
+        next_minute = now_utc.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        seconds = min(seconds, (next_minute - now_utc).total_seconds())
+    return time.monotonic() + max(0.0, seconds)
+
+
+class ResponseCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._vendor_keys: Dict[int, Set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, items: List[dict], next_cursor: Optional[str], area: Area, expires_at: float,
+            keys: Optional[List[Tuple[int, list]]] = None) -> CachedResponse:
+        """Cache a response (not at all if expires_at has passed). Returns the entry."""
+        vendor_ids = {item["id"] for item in items}
+        entry = CachedResponse(list(items), next_cursor, vendor_ids, area, expires_at, keys)
+        if expires_at <= time.monotonic():
+            return entry
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = entry
+            for vendor_id in vendor_ids:
+                self._vendor_keys.setdefault(vendor_id, set()).add(key)
+            while len(self._entries) > MAX_ENTRIES:
+                self._drop(next(iter(self._entries)))
+        return entry
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for vendor_id in entry.vendor_ids:
+            keys = self._vendor_keys.get(vendor_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._vendor_keys[vendor_id]
+
+    def invalidate_vendor(self, vendor_id: int, lat: Optional[float] = None, lng: Optional[float] = None) -> None:
+        """Drop entries that showed the vendor or whose area contains (lat, lng)."""
+        with self._lock:
+            keys = set(self._vendor_keys.get(vendor_id, ()))
+            margin = cell_margin_miles(lat) if lat is not None else 0.0
+            for key, entry in self._entries.items():
+                if entry.area is None:
+                    keys.add(key)
+                elif lat is not None and lng is not None:
+                    center_lat, center_lng, radius = entry.area
+                    if haversine_distance(center_lat, center_lng, lat, lng) <= radius + margin:
+                        keys.add(key)
+            for key in keys:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._vendor_keys.clear()
+
+
+response_cache = ResponseCache()
+
+
+def refresh_vendor(vendor) -> None:
+    """Drop cached responses affected by a committed vendor, review, favorite or hours write."""
+    response_cache.invalidate_vendor(vendor.id, vendor.latitude, vendor.longitude)
@@ -0,0 +1,192 @@
+"""
+Process-local spatial index for vendor radius search.
+
+Key design:
+- Vendors are bucketed into a uniform lat/lng grid (CELL_DEGREES on a side).
+- Each bucket holds lightweight VendorPoint records: id, lat/lng and the card
+  fields needed to filter and rank search results without loading ORM rows.
+- The index is built once at startup and kept current by the vendor write paths
+  (create / update / delete / approve / review and favorite counters).
+- A radius query only visits the cells overlapping the query's bounding box,
+  then runs one vectorized haversine pass over the survivors — so cost scales
+  with local density, not with the size of the vendors table.
+"""
+
+import math
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.utils.geo import bounding_box, rank_by_distance
+
+CELL_DEGREES = 0.05  # ~3.5 miles of latitude per cell
+
+
+@dataclass
+class VendorPoint:
+    id: int
+    latitude: float
+    longitude: float
+    name: str
+    slug: str
+    category: str
+    status: str
+    city: Optional[str]
+    state: Optional[str]
+    average_rating: float
+    review_count: int
+    favorite_count: int
+    trending_score: float
+    cover_photo_url: Optional[str]
+    created_at: Optional[datetime]
+    tags: List[str] = field(default_factory=list)
+
+
+def _cell(lat: float, lng: float) -> Tuple[int, int]:
+    return (math.floor(lat / CELL_DEGREES), math.floor(lng / CELL_DEGREES))
+
+
+def point_from_vendor(vendor) -> Optional[VendorPoint]:
+    """Snapshot an ORM Vendor into a VendorPoint (None if it has no location)."""
+    if vendor.latitude is None or vendor.longitude is None:
+        return None
+    return VendorPoint(
+        id=vendor.id,
+        latitude=vendor.latitude,
+        longitude=vendor.longitude,
+        name=vendor.name,
+        slug=vendor.slug,
+        category=getattr(vendor.category, "value", vendor.category),
+        status=getattr(vendor.status, "value", vendor.status),
+        city=vendor.city,
+        state=vendor.state,
+        average_rating=vendor.average_rating or 0.0,
+        review_count=vendor.review_count or 0,
+        favorite_count=vendor.favorite_count or 0,
+        trending_score=vendor.trending_score or 0.0,
+        cover_photo_url=vendor.cover_photo_url,
+        created_at=vendor.created_at,
+        tags=[t.tag for t in vendor.tags],
+    )
+
+
+class SpatialIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cells: Dict[Tuple[int, int], Dict[int, VendorPoint]] = {}
+        self._points: Dict[int, VendorPoint] = {}
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def build(self, points: List[VendorPoint]) -> None:
+        cells: Dict[Tuple[int, int], Dict[int, VendorPoint]] = {}
+        by_id: Dict[int, VendorPoint] = {}
+        for p in points:
+            cells.setdefault(_cell(p.latitude, p.longitude), {})[p.id] = p
+            by_id[p.id] = p
+        with self._lock:
+            self._cells = cells
+            self._points = by_id
+            self.ready = True
+
+    def upsert(self, point: VendorPoint) -> None:
+        with self._lock:
+            self._discard(point.id)
+            self._cells.setdefault(_cell(point.latitude, point.longitude), {})[point.id] = point
+            self._points[point.id] = point
+
+    def remove(self, vendor_id: int) -> None:
+        with self._lock:
+            self._discard(vendor_id)
+
+    def _discard(self, vendor_id: int) -> None:
+        old = self._points.pop(vendor_id, None)
+        if old is None:
+            return
+        key = _cell(old.latitude, old.longitude)
+        bucket = self._cells.get(key)
+        if bucket is not None:
+            bucket.pop(vendor_id, None)
+            if not bucket:
+                del self._cells[key]
+
+    def get(self, vendor_id: int) -> Optional[VendorPoint]:
+        return self._points.get(vendor_id)
+
+    def within(
+        self,
+        lat: float,
+        lng: float,
+        miles: float,
+        status: Optional[str] = None,
+        category: Optional[str] = None,
+        tags: Optional[Set[str]] = None,
+        match_all_tags: bool = False,
+        k: Optional[int] = None,
+    ) -> List[Tuple[float, VendorPoint]]:
+        """
+        All indexed vendors within `miles` of (lat, lng), nearest first,
+        as (distance_miles, point) pairs. Optional status / category / tag
+        filters are applied on the card fields while scanning (tags match any,
+        or all with match_all_tags); `k` keeps only the k nearest.
+        """
+        min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, miles)
+        lo_r, lo_c = _cell(min_lat, min_lng)
+        hi_r, hi_c = _cell(max_lat, max_lng)
+
+        with self._lock:
+            candidates = [
+                p
+                for r in range(lo_r, hi_r + 1)
+                for c in range(lo_c, hi_c + 1)
+                for p in self._cells.get((r, c), {}).values()
+            ]
+
+        candidates = [
+            p for p in candidates
+            if (status is None or p.status == status)
+            and (category is None or p.category == category)
+            and (not tags or (tags.issubset(p.tags) if match_all_tags else not tags.isdisjoint(p.tags)))
+        ]
+        if not candidates:
+            return []
+
+        coords = np.fromiter(
+            (c for p in candidates for c in (p.latitude, p.longitude)),
+            dtype=np.float64,
+            count=2 * len(candidates),
+        ).reshape(-1, 2)
+        distances, _, order = rank_by_distance(lat, lng, coords, miles=miles, k=k)
+        return [(float(distances[i]), candidates[i]) for i in order]
+
+
+spatial_index = SpatialIndex()
+
+
+def load_spatial_index(db) -> int:
+    """(Re)build the index from every vendor with a location. Returns the count."""
+    from app.models.vendor import Vendor
+    from sqlalchemy.orm import selectinload
+
+    vendors = (
+        db.query(Vendor)
+        .filter(Vendor.latitude.isnot(None), Vendor.longitude.isnot(None))
+        .options(selectinload(Vendor.tags))
+        .all()
+    )
+    spatial_index.build([p for p in (point_from_vendor(v) for v in vendors) if p])
+    return len(spatial_index)
+
+
+def refresh_vendor(vendor) -> None:
+    """Sync one vendor into the index after a committed write."""
+    point = point_from_vendor(vendor)
+    if point is None:
+        spatial_index.remove(vendor.id)
+    else:
+        spatial_index.upsert(point)
@@ -0,0 +1,185 @@
+"""
+Process-local cache of each vendor's OpenStatus, valid until its next transition.
+
+Key design:
+- A vendor's status only changes at a few instants a week: when it opens or
+  closes, when a later start today passes, and at local midnight. For each cached
+  vendor we keep its CompiledSchedule, its current OpenStatus and the UTC instant
+  of the next such transition, and serve the status until that instant.
+- The transition is found in local wall-clock time, then mapped to UTC assuming
+  the current UTC offset holds. If pytz says the offset changes first (a DST
+  switch), the entry expires at the switch instead and is recomputed in the new
+  offset, so spring-forward gaps and fall-back folds stay correct.
+- A min-heap keyed by next-transition time drives a background sweep that
+  recomputes due entries from the cached schedule (no DB access). Heap entries
+  are invalidated lazily: an entry only counts if it still matches the cache.
+- Hours writes and vendor timezone changes invalidate a vendor's entry. Schedules
+  only hold a window of exceptions, so an entry whose window no longer covers the
+  look-ahead is dropped at its next transition and reloaded on demand.
+"""
+
+import asyncio
+import heapq
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pytz
+
+from app.services.hours_service import CompiledSchedule, OpenStatus, batch_open_status, load_schedules, offset_switch
+
+SWEEP_MAX_SLEEP_SECONDS = 60.0
+
+
+@dataclass
+class CachedStatus:
+    schedule: CompiledSchedule
+    status: OpenStatus
+    expires_at: datetime          # aware UTC: next transition
+
+
+def _utc(reference_utc: Optional[datetime]) -> datetime:
+    if reference_utc is None:
+        return datetime.now(pytz.utc)
+    if reference_utc.tzinfo is None:
+        return reference_utc.replace(tzinfo=pytz.utc)
+    return reference_utc
+
+
+def next_transition(schedule: CompiledSchedule, reference_utc: datetime,
+                    local_now: Optional[datetime] = None) -> datetime:
+    """
+    UTC instant after reference_utc at which the schedule's status can next change.
+    `local_now` is reference_utc in the schedule's zone, if the caller has it already.
+    """
+    tz = schedule.tz
+    if local_now is None:
+        local_now = reference_utc.astimezone(tz)
+    change = schedule.next_change_local(local_now)
+    candidate = reference_utc + (change - local_now.replace(tzinfo=None))
+
+    if candidate.astimezone(tz).utcoffset() != local_now.utcoffset():
+        # DST switch before the change: expire at the first whole minute with the new offset
+        candidate = offset_switch(tz, reference_utc, candidate)
+    return candidate
+
+
+class StatusCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[int, CachedStatus] = {}
+        self._heap: List[Tuple[datetime, int]] = []
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, schedule: CompiledSchedule, now: datetime, status: Optional[OpenStatus] = None,
+               local_times: Optional[Dict[str, datetime]] = None) -> CachedStatus:
+        """Cache the schedule's status at `now`; `local_times` memoizes now per zone across a batch."""
+        local_times = {} if local_times is None else local_times
+        local_now = local_times.get(schedule.vendor_timezone)
+        if local_now is None:
+            local_now = local_times[schedule.vendor_timezone] = now.astimezone(schedule.tz)
+        if status is None:
+            status = schedule.open_status_local(local_now)
+        entry = CachedStatus(schedule, status, next_transition(schedule, now, local_now))
+        self._entries[schedule.vendor_id] = entry
+        heapq.heappush(self._heap, (entry.expires_at, schedule.vendor_id))
+        return entry
+
+    def _fresh(self, vendor_id: int, now: datetime,
+               local_times: Optional[Dict[str, datetime]] = None) -> Optional[CachedStatus]:
+        """Cached entry for vendor_id, recomputed from its schedule if expired (lock held)."""
+        entry = self._entries.get(vendor_id)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            if not entry.schedule.covers(now):
+                del self._entries[vendor_id]   # exception window ran out: reload
+                return None
+            entry = self._store(entry.schedule, now, local_times=local_times)
+        return entry
+
+    def lookup(self, db, vendors: Iterable, reference_utc: Optional[datetime] = None) -> Dict[int, CachedStatus]:
+        """
+        {vendor_id: CachedStatus} for vendors (anything with .id and .timezone).
+        Only vendors never seen (or invalidated) load hours from the database.
+        """
+        now = _utc(reference_utc)
+        vendors = list(vendors)
+        result, missing = {}, []
+        local_times: Dict[str, datetime] = {}
+        with self._lock:
+            for v in vendors:
+                entry = self._fresh(v.id, now, local_times)
+                if entry is None or entry.schedule.vendor_timezone != v.timezone:
+                    missing.append(v)
+                else:
+                    result[v.id] = entry
+            self.hits += len(result)
+            self.misses += len(missing)
+        if missing:
+            loaded = load_schedules(db, missing)
+            computed = batch_open_status(loaded.values(), now)
+            with self._lock:
+                for vid, schedule in loaded.items():
+                    result[vid] = self._store(schedule, now, computed[vid], local_times)
+        return result
+
+    def statuses(self, db, vendors: Iterable, reference_utc: Optional[datetime] = None) -> Dict[int, OpenStatus]:
+        return {vid: e.status for vid, e in self.lookup(db, vendors, reference_utc).items()}
+
+    def invalidate(self, vendor_id: int) -> None:
+        with self._lock:
+            self._entries.pop(vendor_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._heap.clear()
+
+    def next_due(self) -> Optional[datetime]:
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def sweep(self, reference_utc: Optional[datetime] = None) -> int:
+        """Recompute every entry whose transition has passed. Returns how many."""
+        now = _utc(reference_utc)
+        refreshed = 0
+        local_times: Dict[str, datetime] = {}
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                expires_at, vendor_id = heapq.heappop(self._heap)
+                entry = self._entries.get(vendor_id)
+                if entry is None or entry.expires_at != expires_at:
+                    continue  # invalidated or already recomputed
+                if not entry.schedule.covers(now):
+                    del self._entries[vendor_id]   # reloaded from the DB on next lookup
+                    continue
+                self._store(entry.schedule, now, local_times=local_times)
+                refreshed += 1
+        return refreshed
+
+    async def run_sweeper(self) -> None:
+        """Background task: sleep until the earliest transition, then sweep."""
+        while True:
+            due = self.next_due()
+            delay = SWEEP_MAX_SLEEP_SECONDS
+            if due is not None:
+                delay = min(delay, max(0.0, (due - datetime.now(pytz.utc)).total_seconds()))
+            await asyncio.sleep(delay)
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"[status_cache] sweep ERROR: {e}", flush=True)
+
+
+status_cache = StatusCache()
+
+
+def refresh_vendor_hours(vendor) -> None:
+    """Drop the cached status after a committed hours write."""
+    status_cache.invalidate(vendor.id)
@@ -0,0 +1,217 @@
+"""
+Process-local prefix index for search-as-you-type suggestions.
+
+Key design:
+- Terms (vendor names and their words, tags, cities, category labels) are kept in
+  one sorted list; a prefix lookup is a bisect to the first match plus a short
+  forward scan, so no query ever touches the database.
+- Each term maps to the refs it suggests: ("vendor", id), ("tag", tag),
+  ("city", city) or ("category", value).
+- Only active vendors are indexed. Tags, cities and categories are ranked by the
+  summed popularity of the vendors carrying them; vendors by their own popularity
+  (favorites weigh more than reviews), optionally damped by distance.
+- Vendor writes call `upsert` / `remove`, which diff the vendor's old and new terms.
+"""
+
+import bisect
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.utils.geo import haversine_distance
+
+MAX_TERMS_SCANNED = 2000
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+@dataclass
+class SuggestEntry:
+    id: int
+    name: str
+    slug: str
+    category: str
+    city: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    popularity: float
+    tags: List[str] = field(default_factory=list)
+
+
+def entry_from_vendor(vendor) -> SuggestEntry:
+    return SuggestEntry(
+        id=vendor.id,
+        name=vendor.name,
+        slug=vendor.slug,
+        category=getattr(vendor.category, "value", vendor.category),
+        city=vendor.city,
+        latitude=vendor.latitude,
+        longitude=vendor.longitude,
+        popularity=(vendor.favorite_count or 0) * 2 + (vendor.review_count or 0) + 1,
+        tags=sorted({t.tag for t in vendor.tags}),
+    )
+
+
+def _refs(entry: SuggestEntry) -> List[Tuple[str, Tuple[str, object]]]:
+    """(term, ref) pairs contributed by one vendor."""
+    pairs = []
+    name = normalize(entry.name)
+    if name:
+        pairs.append((name, ("vendor", entry.id)))
+        for word in name.split(" ")[1:]:
+            pairs.append((word, ("vendor", entry.id)))
+    for tag in entry.tags:
+        pairs.append((normalize(tag), ("tag", tag)))
+    if entry.city:
+        pairs.append((normalize(entry.city), ("city", entry.city)))
+    pairs.append((normalize(entry.category.replace("_", " ")), ("category", entry.category)))
+    return [(t, r) for t, r in pairs if t]
+
+
+class SuggestIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._terms: List[str] = []                             # sorted, unique
+        self._term_refs: Dict[str, Dict[tuple, int]] = {}       # term → {ref: refcount}
+        self._entries: Dict[int, SuggestEntry] = {}
+        self._facet_count: Dict[tuple, int] = defaultdict(int)  # facet ref → vendors
+        self._facet_score: Dict[tuple, float] = defaultdict(float)
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def build(self, entries: List[SuggestEntry]) -> None:
+        with self._lock:
+            self._terms = []
+            self._term_refs = {}
+            self._entries = {}
+            self._facet_count = defaultdict(int)
+            self._facet_score = defaultdict(float)
+            for entry in entries:
+                self._add(entry, sort=False)
+            self._terms.sort()
+            self.ready = True
+
+    def upsert(self, entry: SuggestEntry) -> None:
+        with self._lock:
+            self._discard(entry.id)
+            self._add(entry)
+
+    def remove(self, vendor_id: int) -> None:
+        with self._lock:
+            self._discard(vendor_id)
+
+    def _add(self, entry: SuggestEntry, sort: bool = True) -> None:
+        self._entries[entry.id] = entry
+        for term, ref in _refs(entry):
+            refs = self._term_refs.get(term)
+            if refs is None:
+                refs = self._term_refs[term] = {}
+                if sort:
+                    bisect.insort(self._terms, term)
+                else:
+                    self._terms.append(term)
+            refs[ref] = refs.get(ref, 0) + 1
+        for ref in {r for _, r in _refs(entry) if r[0] != "vendor"}:
+            self._facet_count[ref] += 1
+            self._facet_score[ref] += entry.popularity
+
+    def _discard(self, vendor_id: int) -> None:
+        entry = self._entries.pop(vendor_id, None)
+        if entry is None:
+            return
+        for term, ref in _refs(entry):
+            refs = self._term_refs.get(term)
+            if refs is None or ref not in refs:
+                continue
+            refs[ref] -= 1
+            if refs[ref] <= 0:
+                del refs[ref]
+            if not refs:
+                del self._term_refs[term]
+                i = bisect.bisect_left(self._terms, term)
+                if i < len(self._terms) and self._terms[i] == term:
+                    del self._terms[i]
+        for ref in {r for _, r in _refs(entry) if r[0] != "vendor"}:
+            self._facet_count[ref] -= 1
+            self._facet_score[ref] -= entry.popularity
+            if self._facet_count[ref] <= 0:
+                del self._facet_count[ref]
+                del self._facet_score[ref]
+
+    def suggest(
+        self,
+        prefix: str,
+        limit: int = 5,
+        lat: Optional[float] = None,
+        lng: Optional[float] = None,
+    ) -> dict:
+        """Top `limit` vendors, tags, cities and categories whose terms start with `prefix`."""
+        prefix = normalize(prefix)
+        result = {"vendors": [], "tags": [], "cities": [], "categories": []}
+        if not prefix:
+            return result
+
+        refs: Set[tuple] = set()
+        with self._lock:
+            i = bisect.bisect_left(self._terms, prefix)
+            end = min(len(self._terms), i + MAX_TERMS_SCANNED)
+            while i < end and self._terms[i].startswith(prefix):
+                refs.update(self._term_refs[self._terms[i]])
+                i += 1
+            vendors = [self._entries[key] for kind, key in refs if kind == "vendor"]
+            facets = [
+                (kind, key, self._facet_count[(kind, key)], self._facet_score[(kind, key)])
+                for kind, key in refs if kind != "vendor"
+            ]
+
+        def vendor_score(e: SuggestEntry) -> float:
+            if lat is None or lng is None or e.latitude is None or e.longitude is None:
+                return e.popularity
+            # Proximity damping: a vendor 10 miles away counts half as much
+            return e.popularity / (1 + haversine_distance(lat, lng, e.latitude, e.longitude) / 10)
+
+        vendors.sort(key=lambda e: (-vendor_score(e), e.name))
+        result["vendors"] = [
+            {"id": e.id, "name": e.name, "slug": e.slug, "category": e.category, "city": e.city}
+            for e in vendors[:limit]
+        ]
+        facets.sort(key=lambda f: (-f[3], str(f[1])))
+        for kind, plural in (("tag", "tags"), ("city", "cities"), ("category", "categories")):
+            result[plural] = [
+                {"value": key, "count": count} for k, key, count, _ in facets if k == kind
+            ][:limit]
+        return result
+
+
+suggest_index = SuggestIndex()
+
+
+def load_suggest_index(db) -> int:
+    """(Re)build the index from every active vendor. Returns the count."""
+    from app.models.vendor import Vendor, VendorStatus
+    from sqlalchemy.orm import selectinload
+
+    vendors = (
+        db.query(Vendor)
+        .filter(Vendor.status == VendorStatus.active)
+        .options(selectinload(Vendor.tags))
+        .all()
+    )
+    suggest_index.build([entry_from_vendor(v) for v in vendors])
+    return len(suggest_index)
+
+
+def refresh_vendor(vendor) -> None:
+    """Sync one vendor into the index after a committed write."""
+    if getattr(vendor.status, "value", vendor.status) == "active":
+        suggest_index.upsert(entry_from_vendor(vendor))
+    else:
+        suggest_index.remove(vendor.id)
@@ -0,0 +1,134 @@
+"""
+Process-local cache of encoded vendor vector tiles.
+
+Key design:
+- Entries are keyed by (z, x, y) and hold the encoded tile, the ids of the vendors
+  drawn in it, and an expiry: TILE_TTL_SECONDS, capped at the first open/close
+  transition of any vendor drawn (from the status cache), so is_open is never
+  served stale. The same remaining lifetime goes out as Cache-Control max-age.
+  Least recently used tiles are evicted once MAX_TILES is reached.
+- A reverse map vendor id → tile keys lets a write drop exactly the tiles that
+  showed the vendor at its old location; the tiles covering its new location
+  (including the edge buffer of neighbouring tiles) are dropped too.
+- Vendor writes (location, status) and hours writes call `invalidate_vendor`.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+
+import pytz
+
+from app.utils.geo import mercator_project
+
+MAX_TILE_ZOOM = 22
+MAX_TILES = 5000
+TILE_TTL_SECONDS = 60
+BUFFER = 64 / 4096  # fraction of a tile drawn past each edge
+
+TileKey = Tuple[int, int, int]
+
+
+@dataclass
+class CachedTile:
+    data: bytes
+    vendor_ids: Set[int]
+    expires_at: float          # time.monotonic()
+
+    def max_age(self) -> int:
+        """Whole seconds left, for Cache-Control."""
+        return max(0, int(self.expires_at - time.monotonic()))
+
+
+def tile_ttl(transition: Optional[datetime]) -> float:
+    """Seconds a tile stays fresh: TILE_TTL_SECONDS, capped by the first status transition."""
+    seconds = float(TILE_TTL_SECONDS)
+    if transition is not None:
+        seconds = min(seconds, (transition - datetime.now(pytz.utc)).total_seconds())
+    return max(0.0, seconds)
+
+
+def tiles_for_point(lat: float, lng: float) -> Set[TileKey]:
+    """Every tile, at every zoom, whose buffered extent contains the point."""
+    mx, my = mercator_project(lat, lng)
+    keys = set()
+    for z in range(MAX_TILE_ZOOM + 1):
+        n = 1 << z
+        fx, fy = mx * n, my * n
+        for x in {math.floor(fx - BUFFER), math.floor(fx + BUFFER)}:
+            for y in {math.floor(fy - BUFFER), math.floor(fy + BUFFER)}:
+                if 0 <= x < n and 0 <= y < n:
+                    keys.add((z, x, y))
+    return keys
+
+
+class TileCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tiles: "OrderedDict[TileKey, CachedTile]" = OrderedDict()
+        self._vendor_tiles: Dict[int, Set[TileKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def get(self, key: TileKey) -> Optional[CachedTile]:
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is None:
+                return None
+            if tile.expires_at <= time.monotonic():
+                self._drop(key)
+                return None
+            self._tiles.move_to_end(key)
+            return tile
+
+    def put(self, key: TileKey, data: bytes, vendor_ids: Set[int], ttl: float = TILE_TTL_SECONDS) -> CachedTile:
+        """Cache a tile for ttl seconds (not at all if ttl has run out). Returns the entry."""
+        tile = CachedTile(data, set(vendor_ids), time.monotonic() + ttl)
+        if ttl <= 0:
+            return tile
+        with self._lock:
+            self._drop(key)
+            self._tiles[key] = tile
+            for vendor_id in vendor_ids:
+                self._vendor_tiles.setdefault(vendor_id, set()).add(key)
+            while len(self._tiles) > MAX_TILES:
+                self._drop(next(iter(self._tiles)))
+        return tile
+
+    def _drop(self, key: TileKey) -> None:
+        tile = self._tiles.pop(key, None)
+        if tile is None:
+            return
+        for vendor_id in tile.vendor_ids:
+            keys = self._vendor_tiles.get(vendor_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._vendor_tiles[vendor_id]
+
+    def invalidate_vendor(self, vendor_id: int, lat: Optional[float] = None, lng: Optional[float] = None) -> None:
+        """Drop tiles that showed the vendor, plus the tiles covering (lat, lng)."""
+        with self._lock:
+            keys = set(self._vendor_tiles.get(vendor_id, ()))
+            if lat is not None and lng is not None:
+                keys |= tiles_for_point(lat, lng)
+            for key in keys:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tiles.clear()
+            self._vendor_tiles.clear()
+
+
+tile_cache = TileCache()
+
+
+def refresh_vendor(vendor) -> None:
+    """Drop cached tiles affected by a committed vendor or hours write."""
+    tile_cache.invalidate_vendor(vendor.id, vendor.latitude, vendor.longitude)
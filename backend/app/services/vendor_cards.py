@@ -0,0 +1,93 @@
+"""
+Bulk loader for VendorSummary cards on list endpoints.
+
+Key design:
+- A card needs the vendor row, its tags and its open status. Reading `v.tags`
+  per vendor lazy-loads one query each, so a page of N cards costs N+1 round
+  trips. `CardLoader.load` instead fetches the tags of a whole batch of vendors
+  in one IN query and their statuses through the status cache (which loads any
+  uncached weekly hours and exceptions in two more IN queries).
+- A loader lives for one request. Vendors already loaded are skipped, so search
+  can call `load` once per keyset chunk and the query count stays proportional
+  to the number of chunks, not the number of vendors.
+- All list endpoints (search, featured, favorites) build cards with `card`, so
+  the VendorSummary shape is defined in one place.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from app.services.hours_service import CompiledSchedule, OpenStatus
+from app.services.status_cache import status_cache
+
+
+def load_tags(db, vendor_ids: List[int]) -> Dict[int, List[str]]:
+    """{vendor_id: [tag, ...]} for vendor_ids in one query (insertion order, like Vendor.tags)."""
+    from app.models.vendor import VendorTag
+
+    tags = defaultdict(list)
+    if vendor_ids:
+        rows = (
+            db.query(VendorTag.vendor_id, VendorTag.tag)
+            .filter(VendorTag.vendor_id.in_(vendor_ids))
+            .order_by(VendorTag.id)
+            .all()
+        )
+        for vendor_id, tag in rows:
+            tags[vendor_id].append(tag)
+    return tags
+
+
+class CardLoader:
+    def __init__(self, db, reference_utc: Optional[datetime] = None):
+        self.db = db
+        self.reference_utc = reference_utc
+        self.tags: Dict[int, List[str]] = {}
+        self.schedules: Dict[int, CompiledSchedule] = {}
+        self.statuses: Dict[int, OpenStatus] = {}
+        self.expires_at: Optional[datetime] = None   # earliest next transition among loaded statuses
+
+    def load(self, vendors: Iterable) -> None:
+        """Fetch tags and open status for every vendor not loaded yet."""
+        pending = [v for v in vendors if v.id not in self.statuses]
+        if not pending:
+            return
+        tags = load_tags(self.db, [v.id for v in pending])
+        for v in pending:
+            self.tags[v.id] = tags.get(v.id, [])
+        for vid, cached in status_cache.lookup(self.db, pending, self.reference_utc).items():
+            self.schedules[vid] = cached.schedule
+            self.statuses[vid] = cached.status
+            if self.expires_at is None or cached.expires_at < self.expires_at:
+                self.expires_at = cached.expires_at
+
+    def card(self, v, distance: Optional[float] = None) -> dict:
+        """VendorSummary dict for a loaded vendor."""
+        open_status = self.statuses[v.id]
+        return {
+            "id": v.id,
+            "name": v.name,
+            "slug": v.slug,
+            "category": v.category,
+            "status": v.status,
+            "city": v.city,
+            "state": v.state,
+            "latitude": v.latitude,
+            "longitude": v.longitude,
+            "average_rating": v.average_rating or 0.0,
+            "review_count": v.review_count or 0,
+            "favorite_count": v.favorite_count or 0,
+            "cover_photo_url": v.cover_photo_url,
+            "tags": self.tags[v.id],
+            "distance_miles": round(distance, 2) if distance is not None else None,
+            "is_open": open_status.is_open,
+            "open_status_label": open_status.status_label,
+        }
+
+    def cards(self, vendors: Iterable, distances: Optional[Dict[int, float]] = None) -> List[dict]:
+        """Load then build cards for vendors, in order."""
+        vendors = list(vendors)
+        self.load(vendors)
+        distances = distances or {}
+        return [self.card(v, distances.get(v.id)) for v in vendors]
@@ -0,0 +1,194 @@
+"""
+Process-local read-through cache of immutable vendor snapshots.
+
+Key design:
+- A `VendorSnapshot` is a read-only copy of one vendor: its columns (read as
+  attributes, like the ORM object), tags, photos, stored schedule display and the
+  vendor_versions counter it was loaded at. Snapshots are keyed by id, with a
+  slug -> id map beside them, and are shared between requests; nothing mutates them.
+- A snapshot checked within the last VENDOR_CACHE_STALENESS_SECONDS is served with
+  no SQL. Past that budget the next read re-validates it with one primary-key
+  lookup of the version, and reloads it (four small queries) only if the version
+  moved. Writes in this process drop the snapshot right after their commit, so
+  the budget only bounds how late writes from other workers are seen.
+- A load that raced with an invalidation is returned but not stored.
+- Memory is bounded by an LRU over an estimate of each snapshot's size in bytes
+  (MAX_BYTES), not by entry count, since descriptions and photo lists vary widely.
+- Write paths still load the ORM row: they modify it inside their own session.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, NamedTuple, Optional
+
+from app.config import settings
+
+MAX_BYTES = 16 * 1024 * 1024
+
+
+class StoredDisplay(NamedTuple):
+    schedule: list     # what VendorScheduleDisplay.schedule holds
+
+
+def _deep_size(value: Any) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, (dict, MappingProxyType)):
+        size += sum(_deep_size(k) + _deep_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_deep_size(v) for v in value)
+    return size
+
+
+class VendorSnapshot:
+    """Read-only vendor: column values as attributes, plus tags, photos and schedule display."""
+
+    __slots__ = ("_columns", "tags", "photos", "schedule_display", "version", "size")
+
+    def __init__(self, columns: Dict[str, Any], tags, photos, schedule_display: Optional[StoredDisplay], version: int):
+        object.__setattr__(self, "_columns", MappingProxyType(dict(columns)))
+        object.__setattr__(self, "tags", tuple(tags))
+        object.__setattr__(self, "photos", tuple(MappingProxyType(dict(p)) for p in photos))
+        object.__setattr__(self, "schedule_display", schedule_display)
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "size", _deep_size(self._columns) + _deep_size(self.tags)
+                           + _deep_size(self.photos) + _deep_size(schedule_display))
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("VendorSnapshot is read-only")
+
+    def columns(self) -> Dict[str, Any]:
+        return dict(self._columns)
+
+
+def load_snapshot(db, vendor_id: Optional[int] = None, slug: Optional[str] = None) -> Optional[VendorSnapshot]:
+    from sqlalchemy import func
+    from app.models.vendor import Vendor, VendorPhoto, VendorTag, VendorVersion
+    from app.models.hours import VendorScheduleDisplay
+
+    row = (
+        db.query(Vendor, func.coalesce(VendorVersion.version, 0))
+        .outerjoin(VendorVersion, VendorVersion.vendor_id == Vendor.id)
+        .filter(Vendor.id == vendor_id if slug is None else Vendor.slug == slug)
+        .first()
+    )
+    if row is None:
+        return None
+    vendor, version = row
+    tags = [tag for (tag,) in db.query(VendorTag.tag).filter(VendorTag.vendor_id == vendor.id).order_by(VendorTag.id)]
+    photos = [
+        {"id": p.id, "url": p.url, "caption": p.caption, "is_cover": p.is_cover, "sort_order": p.sort_order}
+        for p in db.query(VendorPhoto).filter(VendorPhoto.vendor_id == vendor.id).order_by(VendorPhoto.id)
+    ]
+    display = db.query(VendorScheduleDisplay.schedule).filter(VendorScheduleDisplay.vendor_id == vendor.id).scalar()
+    return VendorSnapshot(
+        {c.name: getattr(vendor, c.name) for c in Vendor.__table__.columns},
+        tags,
+        photos,
+        StoredDisplay(display) if display is not None else None,
+        version,
+    )
+
+
+class VendorSnapshotCache:
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, list]" = OrderedDict()   # id -> [snapshot, checked_at]
+        self._slugs: Dict[str, int] = {}
+        self._generation = 0
+        self.bytes = 0
+        self.hits = 0
+        self.validations = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, vendor_id: int) -> None:
+        entry = self._entries.pop(vendor_id, None)
+        if entry is not None:
+            snapshot = entry[0]
+            self.bytes -= snapshot.size
+            if self._slugs.get(snapshot.slug) == vendor_id:
+                del self._slugs[snapshot.slug]
+
+    def _store(self, snapshot: VendorSnapshot, now: float) -> None:
+        self._drop(snapshot.id)
+        self._entries[snapshot.id] = [snapshot, now]
+        self._slugs[snapshot.slug] = snapshot.id
+        self.bytes += snapshot.size
+        while self.bytes > self.max_bytes and len(self._entries) > 1:
+            self._drop(next(iter(self._entries)))
+
+    def get(self, db, vendor_id: Optional[int] = None, slug: Optional[str] = None) -> Optional[VendorSnapshot]:
+        """Snapshot by id or slug (None if no such vendor), within the staleness budget."""
+        from app.models.vendor import VendorVersion
+
+        now = time.monotonic()
+        with self._lock:
+            cached_id = vendor_id if slug is None else self._slugs.get(slug)
+            entry = self._entries.get(cached_id)
+            if entry is not None:
+                self._entries.move_to_end(cached_id)
+                if now - entry[1] <= settings.VENDOR_CACHE_STALENESS_SECONDS:
+                    self.hits += 1
+                    return entry[0]
+            generation = self._generation
+
+        if entry is not None:
+            snapshot = entry[0]
+            version = db.query(VendorVersion.version).filter(VendorVersion.vendor_id == snapshot.id).scalar()
+            if version == snapshot.version:
+                with self._lock:
+                    self.validations += 1
+                    if self._entries.get(snapshot.id) is entry:
+                        entry[1] = now
+                return snapshot
+
+        snapshot = load_snapshot(db, vendor_id, slug)
+        with self._lock:
+            self.misses += 1
+            if snapshot is None:
+                if cached_id is not None:
+                    self._drop(cached_id)
+            elif generation == self._generation:
+                self._store(snapshot, now)
+        return snapshot
+
+    def invalidate(self, vendor_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            self._drop(vendor_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._slugs.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "validations": self.validations,
+            "misses": self.misses,
+        }
+
+
+vendor_snapshots = VendorSnapshotCache()
+
+
+def refresh_vendor(vendor) -> None:
+    """Drop the snapshot after a committed write to the vendor or anything versioned with it."""
+    vendor_snapshots.invalidate(vendor.id)
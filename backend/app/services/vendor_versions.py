@@ -0,0 +1,104 @@
+"""
+Per-vendor version counters and the ETags derived from them.
+
+Key design:
+- vendor_versions holds one counter per vendor. Every write that changes what the
+  detail, hours or reviews endpoints return (the vendor row and its tags, weekly
+  hours and exceptions, reviews and review flags, favorite counts, moderation)
+  calls `bump_version` before its commit, so the new version becomes visible in
+  the same transaction as the data. The increment runs in SQL, so concurrent
+  writers never lose a bump.
+- Review lists also show each reviewer's username and avatar, so a profile edit
+  bumps every vendor the user has reviewed (`bump_reviewed_versions`).
+- GET handlers call `vendor_etag` first. It reads the version from the vendor's
+  snapshot (no SQL for hot vendors, else one indexed lookup). When the request's
+  If-None-Match matches, `not_modified` hands back a 304 and the handler skips its
+  own queries and serialization.
+- Bodies that carry open status also change without a write, so their ETags
+  include the vendor's next status transition from the status cache (in memory
+  once the vendor is warm). Request-dependent inputs that are not in the URL,
+  such as the viewer being an admin, are passed as `variant` parts.
+- Versions live in the database, so every worker process hands out the same
+  ETags. Tags are weak: equal versions mean equivalent, not byte-identical, bodies.
+"""
+
+from typing import Iterable, List, Optional
+
+from fastapi import Request, Response
+
+from app.services.status_cache import status_cache
+from app.services.vendor_snapshots import vendor_snapshots
+
+
+def bump_version(db, vendor_id: int) -> None:
+    """Increment a vendor's version (creating its counter if missing). The caller commits."""
+    from app.models.vendor import VendorVersion
+
+    updated = (
+        db.query(VendorVersion)
+        .filter(VendorVersion.vendor_id == vendor_id)
+        .update({VendorVersion.version: VendorVersion.version + 1}, synchronize_session=False)
+    )
+    if not updated:
+        db.add(VendorVersion(vendor_id=vendor_id, version=1))
+
+
+def bump_reviewed_versions(db, user_id: int) -> List[int]:
+    """
+    Increment the version of every vendor the user has reviewed. The caller commits,
+    then drops those vendors' snapshots. Returns the vendor ids.
+    """
+    from app.models.review import Review
+
+    vendor_ids = [vid for (vid,) in db.query(Review.vendor_id).filter(Review.user_id == user_id).distinct()]
+    for vendor_id in vendor_ids:
+        bump_version(db, vendor_id)
+    return vendor_ids
+
+
+def backfill_versions(db) -> int:
+    """Create counters for vendors that have none (e.g. created before the table). Returns the count."""
+    from app.models.vendor import Vendor, VendorVersion
+
+    missing = [vid for (vid,) in db.query(Vendor.id).filter(~Vendor.version_counter.has()).all()]
+    if missing:
+        db.add_all([VendorVersion(vendor_id=vid, version=1) for vid in missing])
+        db.commit()
+    return len(missing)
+
+
+def vendor_etag(
+    db,
+    vendor_id: Optional[int] = None,
+    slug: Optional[str] = None,
+    with_status: bool = False,
+    variant: Iterable = (),
+) -> Optional[str]:
+    """Weak ETag for a vendor's current version, or None if there is no such vendor."""
+    vendor = vendor_snapshots.get(db, vendor_id, slug)
+    if vendor is None:
+        return None
+    parts = [vendor.id, vendor.version, *variant]
+    if with_status:
+        parts.append(int(status_cache.lookup(db, [vendor])[vendor.id].expires_at.timestamp()))
+    return 'W/"v%s"' % "-".join(str(p) for p in parts)
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def not_modified(request: Request, response: Response, etag: Optional[str]) -> Optional[Response]:
+    """
+    A 304 response if If-None-Match matches etag (weak comparison). Otherwise sets
+    the ETag header on the normal response and returns None.
+    """
+    if etag is None:
+        return None
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    header = request.headers.get("if-none-match")
+    if header and (header.strip() == "*" or _opaque(etag) in {_opaque(t) for t in header.split(",")}):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -1,10 +1,15 @@
 import math
 from typing import Optional, Tuple
 
+import numpy as np
+
+EARTH_RADIUS_MILES = 3958.8
+MAX_MERCATOR_LAT = 85.05112878
+
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Returns distance in miles between two lat/lng points."""
-    R = 3958.8  # Earth radius in miles
+    R = EARTH_RADIUS_MILES
     phi1, phi2 = math.radians(lat1), math.radians(lat2)
     dphi = math.radians(lat2 - lat1)
     dlambda = math.radians(lon2 - lon1)
@@ -12,6 +17,44 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return 2 * R * math.asin(math.sqrt(a))
 
 
+def haversine_distances(lat: float, lon: float, coords: np.ndarray) -> np.ndarray:
+    """
+    Vectorized haversine: miles from (lat, lon) to every row of an (N, 2)
+    array of [lat, lng] pairs, computed in one array pass.
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    phi1 = math.radians(lat)
+    phi2 = np.radians(coords[:, 0])
+    dphi = phi2 - phi1
+    dlambda = np.radians(coords[:, 1] - lon)
+    a = np.sin(dphi / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def rank_by_distance(
+    lat: float,
+    lon: float,
+    coords: np.ndarray,
+    miles: Optional[float] = None,
+    k: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Batch distance ranking for N candidate points.
+    Returns (distances, mask, order):
+      - distances: miles to every candidate
+      - mask: True where the candidate is within `miles` (all True if miles is None)
+      - order: indices of the masked candidates, nearest first, truncated to the
+        k nearest when k is given (argpartition, so only the top k get sorted)
+    """
+    distances = haversine_distances(lat, lon, coords)
+    mask = distances <= miles if miles is not None else np.ones(distances.shape, dtype=bool)
+    idx = np.flatnonzero(mask)
+    if k is not None and k < idx.size:
+        idx = idx[np.argpartition(distances[idx], k)[:k]]
+    order = idx[np.argsort(distances[idx], kind="stable")]
+    return distances, mask, order
+
+
 def bounding_box(lat: float, lng: float, miles: float) -> Tuple[float, float, float, float]:
     """Return (min_lat, max_lat, min_lng, max_lng) for a rough bounding box."""
     lat_delta = miles / 69.0
@@ -19,6 +62,66 @@ def bounding_box(lat: float, lng: float, miles: float) -> Tuple[float, float, fl
     return (lat - lat_delta, lat + lat_delta, lng - lng_delta, lng + lng_delta)
 
 
+def mercator_project(lat: float, lng: float) -> Tuple[float, float]:
+    """WGS84 → Web Mercator unit square (x east, y south), clamped to [0, 1)."""
+    lat = max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, lat))
+    x = (lng + 180.0) / 360.0
+    s = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + s) / (1 - s)) / (4 * math.pi)
+    return min(max(x, 0.0), 1 - 1e-12), min(max(y, 0.0), 1 - 1e-12)
+
+
+def tile_bounds(z: int, x: float, y: float) -> Tuple[float, float, float, float]:
+    """(west, south, east, north) in degrees of slippy-map tile z/x/y (x, y may be fractional)."""
+    n = 1 << z
+
+    def lat(ty: float) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
+
+    return (x / n * 360.0 - 180.0, lat(y + 1), (x + 1) / n * 360.0 - 180.0, lat(y))
+
+
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(lat: float, lng: float, precision: int = 6) -> str:
+    """Standard base-32 geohash of a point (precision 6 ≈ 1.2 km × 0.6 km cells)."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, ch, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        ch <<= 1
+        if value >= mid:
+            ch |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_GEOHASH_BASE32[ch])
+            bits, ch = 0, 0
+    return "".join(chars)
+
+
+def geohash_bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """(south, west, north, east) of a geohash cell."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for c in geohash:
+        ch = _GEOHASH_BASE32.index(c)
+        for shift in range(4, -1, -1):
+            rng = lng_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if ch >> shift & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return lat_range[0], lng_range[0], lat_range[1], lng_range[1]
+
+
 def generate_slug(name: str) -> str:
     import re
     slug = name.lower().strip()
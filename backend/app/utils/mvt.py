@@ -0,0 +1,99 @@
+"""
+Minimal Mapbox Vector Tile (spec v2) encoder for point layers.
+
+Only what vendor pins need: one layer of POINT features with scalar properties,
+written straight to protobuf wire format so no protobuf runtime is required.
+"""
+
+import struct
+from typing import Dict, Iterable, List, Tuple, Union
+
+EXTENT = 4096
+
+PropValue = Union[str, bool, int, float]
+
+_MOVE_TO_ONE = (1 << 3) | 1  # command MoveTo, count 1
+_POINT = 1
+
+
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zigzag(n: int) -> int:
+    return (n << 1) ^ (n >> 63)
+
+
+def _key(field: int, wire_type: int) -> bytes:
+    return _varint((field << 3) | wire_type)
+
+
+def _bytes_field(field: int, payload: bytes) -> bytes:
+    return _key(field, 2) + _varint(len(payload)) + payload
+
+
+def _uint_field(field: int, n: int) -> bytes:
+    return _key(field, 0) + _varint(n)
+
+
+def _packed(field: int, values: Iterable[int]) -> bytes:
+    return _bytes_field(field, b"".join(_varint(v) for v in values))
+
+
+def _value(v: PropValue) -> bytes:
+    if isinstance(v, bool):
+        return _uint_field(7, int(v))
+    if isinstance(v, int):
+        return _uint_field(6, _zigzag(v))                      # sint_value
+    if isinstance(v, float):
+        return _key(3, 1) + struct.pack("<d", v)               # double_value
+    return _bytes_field(1, str(v).encode("utf-8"))             # string_value
+
+
+def encode_point_layer(
+    name: str,
+    features: List[Tuple[int, Tuple[int, int], Dict[str, PropValue]]],
+    extent: int = EXTENT,
+) -> bytes:
+    """
+    Encode one tile holding a single point layer.
+    `features` are (feature id, (x, y) in tile extent units, properties); properties
+    set to None are omitted. Returns b"" when there are no features.
+    """
+    if not features:
+        return b""
+    keys: Dict[str, int] = {}
+    values: Dict[Tuple[type, PropValue], int] = {}
+    encoded_features = []
+
+    for fid, (x, y), props in features:
+        tags = []
+        for k, v in props.items():
+            if v is None:
+                continue
+            tags.append(keys.setdefault(k, len(keys)))
+            tags.append(values.setdefault((type(v), v), len(values)))
+        encoded_features.append(_bytes_field(2, b"".join([
+            _uint_field(1, fid),
+            _packed(2, tags),
+            _uint_field(3, _POINT),
+            _packed(4, [_MOVE_TO_ONE, _zigzag(x), _zigzag(y)]),
+        ])))
+
+    layer = b"".join([
+        _uint_field(15, 2),                                    # version
+        _bytes_field(1, name.encode("utf-8")),
+        *encoded_features,
+        *(_bytes_field(3, k.encode("utf-8")) for k in keys),
+        *(_bytes_field(4, _value(v)) for _, v in values),
+        _uint_field(5, extent),
+    ])
+    return _bytes_field(3, layer)
@@ -0,0 +1,156 @@
+"""
+Fast JSON responses and negotiated compression.
+
+List endpoints build their rows themselves (vendor cards, admin rows), so running
+them back through the pydantic response_model only re-validates trusted data.
+`fast_json` serializes the rows with orjson and returns the Response directly, which
+FastAPI passes through untouched; the response_model stays on the route for the
+OpenAPI schema. Headers set on the injected `response` (X-Next-Cursor, ETag) are
+carried over.
+
+`CompressionMiddleware` compresses bodies of at least `minimum_size` bytes with
+brotli when the client accepts it and the `brotli` package is installed, otherwise
+with gzip, and leaves smaller bodies (and 304s) alone.
+"""
+
+import gzip
+import io
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESS_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def fast_json(content: Any, response: Optional[Response] = None) -> Response:
+    """orjson-encoded response for already-shaped rows, keeping `response`'s headers."""
+    result = ORJSONResponse(content)
+    if response is not None:
+        result.raw_headers.extend(
+            (name, value) for name, value in response.headers.raw if name != b"content-length"
+        )
+    return result
+
+
+def accepted_encodings(accept_encoding: str) -> set:
+    """Codings listed in an Accept-Encoding header, minus those with q=0."""
+    codings = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        if coding.strip():
+            codings.add(coding.strip())
+    return codings
+
+
+class _GzipStream:
+    def __init__(self):
+        self._buffer = io.BytesIO()
+        self._file = gzip.GzipFile(mode="wb", fileobj=self._buffer, compresslevel=GZIP_LEVEL)
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def compress(self, data: bytes) -> bytes:
+        self._file.write(data)
+        return self._drain()
+
+    def finish(self) -> bytes:
+        self._file.close()
+        return self._drain()
+
+
+class _BrotliStream:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESS_MIN_BYTES) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            codings = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+            if brotli is not None and "br" in codings:
+                await _Responder(self.app, self.minimum_size, "br", _BrotliStream)(scope, receive, send)
+                return
+            if "gzip" in codings:
+                await _Responder(self.app, self.minimum_size, "gzip", _GzipStream)(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+class _Responder:
+    """Holds back the start message until the first body chunk shows whether to compress."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int, encoding: str, stream_factory) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoding = encoding
+        self.stream_factory = stream_factory
+        self.stream = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.initial_message = message
+            self.passthrough = "content-encoding" in Headers(raw=message["headers"])
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self.started:
+            self.started = True
+            if self.passthrough or (len(body) < self.minimum_size and not more_body):
+                self.passthrough = True
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+            self.stream = self.stream_factory()
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            body = self.stream.compress(body) + (b"" if more_body else self.stream.finish())
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(body))
+            await self.send(self.initial_message)
+            await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+        elif self.passthrough:
+            await self.send(message)
+        else:
+            body = self.stream.compress(body) + (b"" if more_body else self.stream.finish())
+            await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
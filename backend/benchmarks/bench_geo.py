@@ -0,0 +1,49 @@
+"""
+Micro-benchmark: scalar haversine loop vs. vectorized batch ranking.
+Run: python benchmarks/bench_geo.py [n_candidates]
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.utils.geo import haversine_distance, rank_by_distance
+
+ORIGIN = (40.4406, -79.9959)  # Pittsburgh
+RADIUS_MILES = 25.0
+
+
+def main(n: int = 5000, repeat: int = 50):
+    rng = random.Random(42)
+    points = [(ORIGIN[0] + rng.uniform(-0.5, 0.5), ORIGIN[1] + rng.uniform(-0.5, 0.5)) for _ in range(n)]
+    coords = np.array(points, dtype=np.float64)
+
+    def scalar():
+        hits = []
+        for i, (plat, plng) in enumerate(points):
+            d = haversine_distance(ORIGIN[0], ORIGIN[1], plat, plng)
+            if d <= RADIUS_MILES:
+                hits.append((d, i))
+        hits.sort()
+        return hits
+
+    def vectorized():
+        return rank_by_distance(ORIGIN[0], ORIGIN[1], coords, miles=RADIUS_MILES)
+
+    # Same answer either way
+    _, _, order = vectorized()
+    assert [i for _, i in scalar()] == order.tolist()
+
+    t_scalar = min(timeit.repeat(scalar, number=1, repeat=repeat))
+    t_vector = min(timeit.repeat(vectorized, number=1, repeat=repeat))
+    print(f"{n} candidates within {RADIUS_MILES} mi")
+    print(f"  scalar loop : {t_scalar * 1000:8.3f} ms")
+    print(f"  vectorized  : {t_vector * 1000:8.3f} ms  ({t_scalar / t_vector:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
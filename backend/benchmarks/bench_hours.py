@@ -0,0 +1,187 @@
+"""
+Micro-benchmark: string-based hours functions vs. compiled minute-of-week schedules.
+Checks both give identical answers on random schedules first.
+Run: python benchmarks/bench_hours.py [n_vendors]
+"""
+import os
+import random
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.hours_service import (
+    batch_open_status,
+    compile_schedule,
+    compile_schedules,
+    compute_open_status,
+    compute_open_statuses,
+    get_weekly_schedule_display,
+    schedule_dedup_stats,
+    vendor_open_on_day_at_time,
+)
+
+TIMEZONES = ["America/New_York", "America/Chicago", "America/Denver", "America/Los_Angeles"]
+
+
+def _hhmm(rng: random.Random) -> str:
+    return f"{rng.randrange(24):02d}:{rng.choice([0, 15, 30, 45]):02d}"
+
+
+def random_vendor(vendor_id: int, rng: random.Random):
+    weekly = []
+    for dow in range(7):
+        roll = rng.random()
+        if roll < 0.15:
+            continue                                   # no schedule
+        if roll < 0.25:
+            weekly.append(SimpleNamespace(vendor_id=vendor_id, day_of_week=dow, is_closed=True,
+                                          start_time_local=None, end_time_local=None, interval_index=0))
+            continue
+        for idx in rng.sample(range(3), rng.randint(1, 3)):   # split shifts, any order
+            weekly.append(SimpleNamespace(vendor_id=vendor_id, day_of_week=dow, is_closed=False,
+                                          start_time_local=_hhmm(rng), end_time_local=_hhmm(rng),
+                                          interval_index=idx))
+    today = date.today()
+    exceptions = []
+    for _ in range(rng.randint(0, 4)):
+        closed = rng.random() < 0.5
+        exceptions.append(SimpleNamespace(
+            vendor_id=vendor_id,
+            exception_date=today + timedelta(days=rng.randint(-2, 9)),
+            is_closed=closed,
+            start_time_local=None if closed else _hhmm(rng),
+            end_time_local=None if closed else _hhmm(rng),
+        ))
+    return SimpleNamespace(id=vendor_id, timezone=rng.choice(TIMEZONES), weekly=weekly, exceptions=exceptions)
+
+
+def main(n: int = 500, repeat: int = 5):
+    rng = random.Random(42)
+    vendors = [random_vendor(i, rng) for i in range(1, n + 1)]
+    now = datetime.utcnow()
+    moments = [now + timedelta(minutes=rng.randrange(7 * 24 * 60)) for _ in range(20)]
+    probes = [(rng.randrange(7), _hhmm(rng)) for _ in range(20)]
+
+    # Same answers either way
+    for v in vendors:
+        compiled = compile_schedule(v.id, v.timezone, v.weekly, v.exceptions)
+        for t in moments:
+            assert compiled.open_status(t) == compute_open_status(v.id, v.timezone, v.weekly, v.exceptions, t)
+        for dow, hhmm in probes:
+            assert compiled.is_open_on_day_at_time(dow, hhmm) == vendor_open_on_day_at_time(
+                v.id, v.timezone, v.weekly, v.exceptions, dow, hhmm)
+        assert compiled.weekly_display() == get_weekly_schedule_display(v.id, v.timezone, v.weekly, v.exceptions)
+
+    def string_based():
+        for v in vendors:
+            for t in moments:
+                compute_open_status(v.id, v.timezone, v.weekly, v.exceptions, t)
+            for dow, hhmm in probes:
+                vendor_open_on_day_at_time(v.id, v.timezone, v.weekly, v.exceptions, dow, hhmm)
+            get_weekly_schedule_display(v.id, v.timezone, v.weekly, v.exceptions)
+
+    def compiled():
+        for v in vendors:
+            schedule = compile_schedule(v.id, v.timezone, v.weekly, v.exceptions)
+            for t in moments:
+                schedule.open_status(t)
+            for dow, hhmm in probes:
+                schedule.is_open_on_day_at_time(dow, hhmm)
+            schedule.weekly_display()
+
+    schedules = [compile_schedule(v.id, v.timezone, v.weekly, v.exceptions) for v in vendors]
+
+    def status_string():
+        for v in vendors:
+            for t in moments:
+                compute_open_status(v.id, v.timezone, v.weekly, v.exceptions, t)
+
+    def status_compiled():
+        for schedule in schedules:
+            for t in moments:
+                schedule.open_status(t)
+
+    all_weekly = [h for v in vendors for h in v.weekly]
+    all_exceptions = [e for v in vendors for e in v.exceptions]
+    assert compute_open_statuses(vendors, all_weekly, all_exceptions, now) == {
+        v.id: compute_open_status(v.id, v.timezone, v.weekly, v.exceptions, now) for v in vendors
+    }
+
+    def one_status_each():
+        for v in vendors:
+            compute_open_status(v.id, v.timezone, v.weekly, v.exceptions, now)
+
+    def batch():
+        compute_open_statuses(vendors, all_weekly, all_exceptions, now)
+
+    def compile_only():
+        for v in vendors:
+            compile_schedule(v.id, v.timezone, v.weekly, v.exceptions)
+
+    checks = len(moments) + len(probes) + 1
+    print(f"{n} vendors, {checks} lookups each (compile included)")
+    t_string = min(timeit.repeat(string_based, number=1, repeat=repeat))
+    t_compiled = min(timeit.repeat(compiled, number=1, repeat=repeat))
+    print(f"  string-based : {t_string * 1000:8.1f} ms")
+    print(f"  compiled     : {t_compiled * 1000:8.1f} ms  ({t_string / t_compiled:.1f}x)")
+    print(f"{n} vendors, {len(moments)} open_status calls each on already-compiled schedules")
+    t_string = min(timeit.repeat(status_string, number=1, repeat=repeat))
+    t_compiled = min(timeit.repeat(status_compiled, number=1, repeat=repeat))
+    print(f"  string-based : {t_string * 1000:8.1f} ms")
+    print(f"  compiled     : {t_compiled * 1000:8.1f} ms  ({t_string / t_compiled:.1f}x)")
+    print(f"{n} vendors, one status each ({len(TIMEZONES)} timezones)")
+    t_string = min(timeit.repeat(one_status_each, number=1, repeat=repeat))
+    t_batch = min(timeit.repeat(batch, number=1, repeat=repeat))
+    print(f"  per vendor   : {t_string * 1000:8.1f} ms")
+    print(f"  batch        : {t_batch * 1000:8.1f} ms  ({t_string / t_batch:.1f}x)")
+    # Market-style data: many vendors sharing a few identical schedules
+    templates = [random_vendor(0, rng) for _ in range(max(1, n // 40))]
+    shared = []
+    for i in range(1, n + 1):
+        t = rng.choice(templates)
+        shared.append(SimpleNamespace(
+            id=i, timezone=t.timezone,
+            weekly=[SimpleNamespace(**{**vars(h), "vendor_id": i}) for h in t.weekly],
+            exceptions=[SimpleNamespace(**{**vars(e), "vendor_id": i}) for e in t.exceptions],
+        ))
+    shared_weekly = [h for v in shared for h in v.weekly]
+    shared_exceptions = [e for v in shared for e in v.exceptions]
+    assert compute_open_statuses(shared, shared_weekly, shared_exceptions, now) == {
+        v.id: compute_open_status(v.id, v.timezone, v.weekly, v.exceptions, now) for v in shared
+    }
+
+    def shared_each():
+        for v in shared:
+            compute_open_status(v.id, v.timezone, v.weekly, v.exceptions, now)
+
+    def shared_batch():
+        compute_open_statuses(shared, shared_weekly, shared_exceptions, now)
+
+    print(f"{n} vendors sharing {len(templates)} schedules, one status each")
+    t_string = min(timeit.repeat(shared_each, number=1, repeat=repeat))
+    t_batch = min(timeit.repeat(shared_batch, number=1, repeat=repeat))
+    print(f"  per vendor   : {t_string * 1000:8.1f} ms")
+    print(f"  batch        : {t_batch * 1000:8.1f} ms  ({t_string / t_batch:.1f}x, statuses deduplicated)")
+    shared_schedules = list(compile_schedules(shared, shared_weekly, shared_exceptions).values())
+
+    def shared_compiled_each():
+        for schedule in shared_schedules:
+            schedule.open_status(now)
+
+    def shared_compiled_batch():
+        batch_open_status(shared_schedules, now)
+
+    t_each = min(timeit.repeat(shared_compiled_each, number=1, repeat=repeat))
+    t_batch = min(timeit.repeat(shared_compiled_batch, number=1, repeat=repeat))
+    print(f"  compiled, per schedule : {t_each * 1000:8.1f} ms")
+    print(f"  compiled, batch        : {t_batch * 1000:8.1f} ms  ({t_each / t_batch:.1f}x)")
+    print(f"  {schedule_dedup_stats()}")
+    t_compile = min(timeit.repeat(compile_only, number=1, repeat=repeat))
+    print(f"compiling {n} schedules: {t_compile * 1000:.1f} ms (day plans are built lazily on first lookup)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
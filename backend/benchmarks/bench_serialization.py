@@ -0,0 +1,89 @@
+"""
+Micro-benchmark: serializing a page of vendor cards through the response_model
+(pydantic validation + jsonable_encoder + json.dumps, as FastAPI does for a returned
+list) vs. the fast path (orjson straight from the card dicts), plus compression.
+Run: python benchmarks/bench_serialization.py [page_size]
+"""
+import asyncio
+import gzip
+import os
+import random
+import sys
+import timeit
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.models.vendor import VendorCategory, VendorStatus
+from app.schemas.vendor import VendorSummary
+from app.utils.responses import BROTLI_QUALITY, GZIP_LEVEL, brotli, fast_json
+
+TAGS = ["bbq", "tacos", "vegan", "pierogi", "banh-mi", "coffee", "pizza", "dessert"]
+
+
+def random_card(vendor_id: int, rng: random.Random) -> dict:
+    """A card shaped like CardLoader.card builds it."""
+    is_open = rng.random() < 0.5
+    return {
+        "id": vendor_id,
+        "name": f"Vendor {vendor_id} {rng.choice(['Taco Truck', 'BBQ Pit', 'Pierogi Cart', 'Coffee Bar'])}",
+        "slug": f"vendor-{vendor_id}",
+        "category": rng.choice(list(VendorCategory)),
+        "status": VendorStatus.active,
+        "city": rng.choice(["Pittsburgh", "Nashville", "Austin"]),
+        "state": rng.choice(["PA", "TN", "TX"]),
+        "latitude": 40.44 + rng.uniform(-0.4, 0.4),
+        "longitude": -79.99 + rng.uniform(-0.4, 0.4),
+        "average_rating": round(rng.uniform(0, 5), 1),
+        "review_count": rng.randint(0, 400),
+        "favorite_count": rng.randint(0, 200),
+        "cover_photo_url": f"https://cdn.example.com/vendors/{vendor_id}/cover.jpg",
+        "tags": rng.sample(TAGS, 3),
+        "distance_miles": round(rng.uniform(0, 25), 2),
+        "is_open": is_open,
+        "open_status_label": "Open · Closes 9:00 PM" if is_open else "Closed · Opens 11:00 AM",
+    }
+
+
+def main(n: int = 100, repeat: int = 200):
+    rng = random.Random(42)
+    page = [random_card(i + 1, rng) for i in range(n)]
+    field = create_response_field(name="Response_search_vendors", type_=List[VendorSummary])
+
+    def through_model() -> bytes:
+        content = asyncio.run(serialize_response(field=field, response_content=page))
+        return JSONResponse(content).body
+
+    def fast() -> bytes:
+        return fast_json(page).body
+
+    # Same document either way
+    body = fast()
+    assert orjson.loads(through_model()) == orjson.loads(body)
+
+    t_model = min(timeit.repeat(through_model, number=1, repeat=repeat))
+    t_fast = min(timeit.repeat(fast, number=1, repeat=repeat))
+    # asyncio.run's own overhead is not part of FastAPI's cost
+    t_loop = min(timeit.repeat(lambda: asyncio.run(asyncio.sleep(0)), number=1, repeat=repeat))
+    t_model -= t_loop
+    print(f"{n}-vendor page, {len(body)} bytes of JSON")
+    print(f"  response_model + json : {t_model * 1000:8.3f} ms")
+    print(f"  orjson fast path      : {t_fast * 1000:8.3f} ms  ({t_model / t_fast:.1f}x)")
+
+    t_gzip = min(timeit.repeat(lambda: gzip.compress(body, GZIP_LEVEL), number=1, repeat=repeat))
+    print(f"  gzip (level {GZIP_LEVEL})        : {t_gzip * 1000:8.3f} ms  -> {len(gzip.compress(body, GZIP_LEVEL))} bytes")
+    if brotli is not None:
+        t_br = min(timeit.repeat(lambda: brotli.compress(body, quality=BROTLI_QUALITY), number=1, repeat=repeat))
+        size = len(brotli.compress(body, quality=BROTLI_QUALITY))
+        print(f"  brotli (quality {BROTLI_QUALITY})    : {t_br * 1000:8.3f} ms  -> {size} bytes")
+    else:
+        print("  brotli                : not installed")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,170 @@
+"""
+Shared fixtures.
+
+The app runs against a fresh in-memory SQLite database per test. Set
+TEST_DATABASE_URL to run against PostgreSQL instead (e.g. the docker compose
+`db` service, which has PostGIS); the schema is dropped and recreated per test
+and the PostGIS / full-text setup runs as it does at startup. Every
+process-local index and cache is reset around each test.
+"""
+
+import os
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, get_db
+from app.main import app
+from app.models.user import User, UserRole
+from app.models.vendor import Vendor, VendorCategory, VendorStatus, VendorTag
+from app.services import (
+    cluster_index, facet_index, fulltext, fuzzy_index, open_index, open_ranges, postgis, spatial_index,
+    suggest_index,
+)
+from app.services.cache import cache
+from app.services.response_cache import response_cache
+from app.services.status_cache import status_cache
+from app.services.tile_cache import tile_cache
+from app.services.vendor_snapshots import vendor_snapshots
+from app.services.vendor_versions import bump_version
+from app.utils.auth import create_access_token
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+_INDEXES = [
+    spatial_index.spatial_index, suggest_index.suggest_index, fuzzy_index.fuzzy_index,
+    facet_index.facet_index, cluster_index.cluster_index, open_index.open_index,
+]
+
+
+def _reset_process_state():
+    for index in _INDEXES:
+        index.ready = False
+    for store in (response_cache, status_cache, tile_cache, vendor_snapshots, cache):
+        store.clear()
+    postgis.enabled = fulltext.enabled = open_ranges.enabled = False
+
+
+@pytest.fixture
+def engine():
+    if TEST_DATABASE_URL:
+        engine = create_engine(TEST_DATABASE_URL)
+        Base.metadata.drop_all(engine)
+    else:
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture(autouse=True)
+def process_state():
+    _reset_process_state()
+    yield
+    _reset_process_state()
+
+
+@pytest.fixture
+def client(session_factory):
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    # No `with` block: the startup lifespan (real database, background tasks) is skipped
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def count_queries(engine):
+    """Context manager yielding a list that collects every SQL statement run inside it."""
+    @contextmanager
+    def counting():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+    return counting
+
+
+@pytest.fixture
+def make_vendor(db):
+    """Insert an active vendor (versioned, like the write endpoints do) and return it."""
+    counter = iter(range(1, 1_000_000))
+
+    def make(name=None, lat=40.4406, lng=-79.9959, tags=(), **fields):
+        n = next(counter)
+        vendor = Vendor(
+            name=name or f"Vendor {n}",
+            slug=f"vendor-{n}",
+            category=fields.pop("category", VendorCategory.food_truck),
+            status=fields.pop("status", VendorStatus.active),
+            latitude=lat,
+            longitude=lng,
+            city=fields.pop("city", "Pittsburgh"),
+            timezone=fields.pop("timezone", "America/New_York"),
+            **fields,
+        )
+        db.add(vendor)
+        db.flush()
+        for tag in tags:
+            db.add(VendorTag(vendor_id=vendor.id, tag=tag))
+        bump_version(db, vendor.id)
+        db.commit()
+        return vendor
+    return make
+
+
+@pytest.fixture
+def make_user(db):
+    def make(role=UserRole.user):
+        n = db.query(User).count() + 1
+        user = User(email=f"user{n}@example.com", username=f"user{n}", hashed_password="x", role=role)
+        db.add(user)
+        db.commit()
+        return user, {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    return make
+
+
+@pytest.fixture
+def admin_headers(make_user):
+    return make_user(UserRole.admin)[1]
+
+
+@pytest.fixture
+def publish(client, admin_headers):
+    """Create a vendor through the API and approve it, as an admin does. Returns its JSON."""
+    def create(name, lat=40.4406, lng=-79.9959, **fields):
+        payload = {"name": name, "category": "food_truck", "latitude": lat, "longitude": lng, **fields}
+        response = client.post("/api/vendors", json=payload, headers=admin_headers)
+        assert response.status_code == 201
+        vendor = response.json()
+        assert client.patch(f"/api/admin/vendors/{vendor['id']}/approve", headers=admin_headers).status_code == 200
+        return vendor
+    return create
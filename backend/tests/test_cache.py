@@ -0,0 +1,296 @@
+"""
+Cache backends. RedisCache runs against a small in-process RESP server that
+implements the commands it sends; set TEST_REDIS_URL to use a real server
+instead (its keys under the test prefix are cleared).
+"""
+
+import os
+import socket
+import socketserver
+import threading
+import time
+import uuid
+
+import pytest
+
+from app.services.cache import CacheBackend, LocalCache, RedisCache, cache as app_cache, make_cache
+from app.utils.geo import haversine_distance
+
+TEST_REDIS_URL = os.environ.get("TEST_REDIS_URL")
+
+
+class _RespStore:
+    def __init__(self, password=None):
+        self.password = password
+        self.lock = threading.Lock()
+        self.data = {}   # key -> (value, expires_at or None)
+        self.commands = []
+
+    def _live(self, key):
+        entry = self.data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return entry
+
+    def run(self, args, session):
+        name, args = args[0].upper().decode(), args[1:]
+        with self.lock:
+            self.commands.append(name)
+            if name == "AUTH":
+                session["authed"] = args[0].decode() == self.password
+                return b"OK" if session["authed"] else RuntimeError("WRONGPASS invalid password")
+            if self.password and not session.get("authed"):
+                return RuntimeError("NOAUTH Authentication required.")
+            if name == "SELECT":
+                return b"OK"
+            if name == "MGET":
+                return [entry[0] if entry else None for entry in map(self._live, args)]
+            if name == "SET":
+                expires_at = None
+                if len(args) == 4 and args[2].upper() == b"PX":
+                    expires_at = time.monotonic() + int(args[3]) / 1000
+                self.data[args[0]] = (args[1], expires_at)
+                return b"OK"
+            if name == "DEL":
+                return sum(self.data.pop(k, None) is not None for k in args)
+            if name == "INCR":
+                entry = self._live(args[0])
+                value = int(entry[0]) + 1 if entry else 1
+                self.data[args[0]] = (str(value).encode(), entry[1] if entry else None)
+                return value
+            if name == "SCAN":
+                prefix = args[2].rstrip(b"*")
+                return [b"0", [k for k in list(self.data) if k.startswith(prefix) and self._live(k)]]
+            return RuntimeError(f"ERR unknown command '{name}'")
+
+
+def _reply(value) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, RuntimeError):
+        return b"-%s\r\n" % str(value).encode()
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(_reply(v) for v in value)
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        session = {}
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:-2])):
+                length = int(self.rfile.readline()[1:-2])
+                args.append(self.rfile.read(length + 2)[:-2])
+            self.wfile.write(_reply(self.server.store.run(args, session)))
+
+
+class _RespServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+@pytest.fixture
+def resp_server():
+    server = _RespServer(("127.0.0.1", 0), _RespHandler)
+    server.store = _RespStore(password="secret")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def redis_url(request):
+    if TEST_REDIS_URL:
+        return TEST_REDIS_URL
+    return _server_url(request.getfixturevalue("resp_server"))
+
+
+@pytest.fixture
+def redis_factory(redis_url):
+    prefix = f"test-{uuid.uuid4().hex}:"
+    created = []
+
+    def make():
+        backend = RedisCache(redis_url, prefix=prefix)
+        created.append(backend)
+        return backend
+    yield make
+    if created:
+        created[0].clear()
+
+
+def _server_url(server, password="secret", db=2):
+    return f"redis://:{password}@127.0.0.1:{server.server_address[1]}/{db}"
+
+
+def _unused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# ─── LocalCache ──────────────────────────────────────────────────────────────
+
+def test_local_get_set_and_stats():
+    cache = LocalCache()
+    value = {"id": 1}
+    cache.set("a", value)
+    assert cache.get("a") is value
+    assert cache.get_many(["a", "b"]) == {"a": value}
+    assert cache.stats() == {
+        "backend": "local", "hits": 2, "misses": 1, "sets": 1, "hit_rate": 0.6667, "entries": 1, "evictions": 0,
+    }
+
+
+def test_local_ttl_expires():
+    cache = LocalCache()
+    cache.set("a", 1, ttl=0.05)
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_local_invalidate_tags():
+    cache = LocalCache()
+    cache.set("a", 1, tags=["vendor:1"])
+    cache.set("b", 2, tags=["vendor:1", "vendor:2"])
+    cache.set("c", 3, tags=["vendor:2"])
+    cache.invalidate_tags(["vendor:1"])
+    assert cache.get_many(["a", "b", "c"]) == {"c": 3}
+
+
+def test_local_evicts_least_recently_used():
+    cache = LocalCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+    assert cache.evictions == 1
+
+
+def test_make_cache_picks_backend():
+    assert isinstance(make_cache(None), LocalCache)
+    assert isinstance(make_cache("redis://localhost:6379/0"), RedisCache)
+
+
+def test_incomplete_backend_fails_at_construction():
+    class ReadOnly(CacheBackend):
+        def get_many(self, keys):
+            return {}
+
+    with pytest.raises(TypeError, match="abstract"):
+        ReadOnly()
+
+
+# ─── RedisCache ──────────────────────────────────────────────────────────────
+
+def test_redis_round_trips_json(redis_factory):
+    cache = redis_factory()
+    cache.set("a", {"id": 1, "tags": ["tacos"], "rating": 4.5})
+    assert cache.get("a") == {"id": 1, "tags": ["tacos"], "rating": 4.5}
+    assert cache.get("missing") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_redis_ttl_expires(redis_factory):
+    cache = redis_factory()
+    cache.set("a", 1, ttl=0.05)
+    assert cache.get("a") == 1
+    time.sleep(0.1)
+    assert cache.get("a") is None
+
+
+def test_redis_entries_are_shared_between_instances(redis_factory):
+    writer, reader = redis_factory(), redis_factory()
+    writer.set("a", [1, 2], tags=["vendor:1"])
+    assert reader.get("a") == [1, 2]
+    reader.delete("a")
+    assert writer.get("a") is None
+
+
+def test_redis_invalidate_tags_reaches_other_instances(redis_factory):
+    writer, other = redis_factory(), redis_factory()
+    writer.set("a", 1, tags=["vendor:1"])
+    writer.set("b", 2, tags=["vendor:1", "vendor:2"])
+    writer.set("c", 3, tags=["vendor:2"])
+    other.invalidate_tags(["vendor:1"])
+    assert writer.get_many(["a", "b", "c"]) == {"c": 3}
+    # Written again after the invalidation, under the new tag version
+    writer.set("a", 4, tags=["vendor:1"])
+    assert other.get("a") == 4
+
+
+def test_redis_clear_only_drops_its_prefix(redis_url, redis_factory):
+    cache = redis_factory()
+    neighbour = RedisCache(redis_url, prefix=f"test-{uuid.uuid4().hex}:")
+    cache.set("a", 1)
+    neighbour.set("a", 2)
+    cache.clear()
+    assert cache.get("a") is None
+    assert neighbour.get("a") == 2
+    neighbour.clear()
+
+
+def test_redis_authenticates_and_selects_db(resp_server):
+    cache = RedisCache(_server_url(resp_server))
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert resp_server.store.commands[:2] == ["AUTH", "SELECT"]
+
+
+def test_redis_wrong_password_is_a_miss(resp_server):
+    cache = RedisCache(_server_url(resp_server, password="wrong"))
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert cache.errors == 2 and cache.sets == 0
+
+
+def test_redis_server_down_is_a_miss():
+    cache = RedisCache(f"redis://127.0.0.1:{_unused_port()}/0", timeout=0.2)
+    cache.set("a", 1, tags=["vendor:1"])
+    cache.invalidate_tags(["vendor:1"])
+    cache.delete("a")
+    cache.clear()
+    assert cache.get("a") is None
+    assert cache.stats() == {"backend": "redis", "hits": 0, "misses": 1, "sets": 0, "hit_rate": 0.0, "errors": 5}
+
+
+def test_redis_reuses_pooled_connections(resp_server):
+    cache = RedisCache(_server_url(resp_server), pool_size=1)
+    for i in range(5):
+        cache.set(str(i), i)
+    assert cache.get_many([str(i) for i in range(5)]) == {str(i): i for i in range(5)}
+    assert resp_server.store.commands.count("AUTH") == 1
+
+
+# ─── Vendor detail bodies ────────────────────────────────────────────────────
+
+def test_vendor_detail_is_cached_once_for_every_origin(client, publish, admin_headers):
+    vendor = publish("Smokehouse", lat=40.4406, lng=-79.9959)
+    url = f"/api/vendors/{vendor['slug']}"
+    sets, hits = app_cache.sets, app_cache.hits
+
+    origins = [(40.45, -80.0), (40.4512, -79.9871), (41.0, -78.5), (40.45, -80.0)]
+    for lat, lng in origins:
+        body = client.get(url, params={"lat": lat, "lng": lng}).json()
+        assert body["distance_miles"] == round(haversine_distance(lat, lng, 40.4406, -79.9959), 2)
+    assert client.get(url).json()["distance_miles"] is None
+    assert app_cache.sets - sets == 1
+    assert app_cache.hits - hits == len(origins)
+
+    # A write changes the ETag, so the next read renders and caches a new body
+    response = client.patch(f"/api/vendors/{vendor['id']}", json={"description": "Brisket"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert client.get(url, params={"lat": 40.45, "lng": -80.0}).json()["description"] == "Brisket"
+    assert app_cache.sets - sets == 2
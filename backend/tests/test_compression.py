@@ -0,0 +1,117 @@
+import asyncio
+import gzip
+
+import brotli
+import pytest
+
+from app.utils import responses
+from app.utils.responses import COMPRESS_MIN_BYTES, CompressionMiddleware, accepted_encodings
+
+LARGE = b'{"rows": "' + b"x" * (2 * COMPRESS_MIN_BYTES) + b'"}'
+SMALL = b'{"ok": true}'
+
+
+def _app(*chunks, headers=()):
+    async def app(scope, receive, send):
+        raw = [(b"content-type", b"application/json"), *headers]
+        if len(chunks) == 1:
+            raw.append((b"content-length", str(len(chunks[0])).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": raw})
+        for i, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+    return app
+
+
+def _call(app, accept_encoding=None):
+    """Run the middleware as the server would. Returns (headers, raw body bytes)."""
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding is not None else []
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": headers}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(CompressionMiddleware(app)(scope, receive, send))
+    start, *body = sent
+    return ({k.decode().lower(): v.decode() for k, v in start["headers"]},
+            b"".join(m.get("body", b"") for m in body))
+
+
+@pytest.mark.parametrize("accept, encoding", [
+    ("gzip, deflate, br", "br"),
+    ("br;q=1.0, gzip;q=0.8", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("GZIP", "gzip"),
+])
+def test_coding_is_negotiated_from_accept_encoding(accept, encoding):
+    headers, body = _call(_app(LARGE), accept)
+    assert headers["content-encoding"] == encoding
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["content-length"] == str(len(body))
+    assert len(body) < len(LARGE)
+    assert (brotli.decompress(body) if encoding == "br" else gzip.decompress(body)) == LARGE
+
+
+@pytest.mark.parametrize("accept", [None, "", "identity", "deflate", "gzip;q=0, br;q=0"])
+def test_unsupported_codings_get_the_plain_body(accept):
+    headers, body = _call(_app(LARGE), accept)
+    assert "content-encoding" not in headers
+    assert body == LARGE
+
+
+def test_small_bodies_are_not_compressed():
+    for payload in (SMALL, b"x" * (COMPRESS_MIN_BYTES - 1)):
+        headers, body = _call(_app(payload), "gzip, br")
+        assert "content-encoding" not in headers
+        assert headers["content-length"] == str(len(payload))
+        assert body == payload
+    headers, _ = _call(_app(b"x" * COMPRESS_MIN_BYTES), "gzip, br")
+    assert headers["content-encoding"] == "br"
+
+
+def test_streamed_bodies_are_compressed_chunk_by_chunk():
+    chunks = [b"a" * 300, b"b" * 300, b"c" * 300]
+    headers, body = _call(_app(*chunks), "gzip")
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert gzip.decompress(body) == b"".join(chunks)
+
+
+def test_encoded_responses_pass_through():
+    already = gzip.compress(LARGE)
+    headers, body = _call(_app(already, headers=[(b"content-encoding", b"gzip")]), "br")
+    assert headers["content-encoding"] == "gzip"
+    assert body == already
+
+
+def test_gzip_is_used_without_the_brotli_package(monkeypatch):
+    monkeypatch.setattr(responses, "brotli", None)
+    headers, body = _call(_app(LARGE), "br, gzip")
+    assert headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body) == LARGE
+    headers, body = _call(_app(LARGE), "br")
+    assert "content-encoding" not in headers and body == LARGE
+
+
+def test_accepted_encodings_drops_refused_codings():
+    assert accepted_encodings("gzip;q=0.5, br;q=0, identity;q=0.000, *") == {"gzip", "*"}
+
+
+def test_app_compresses_large_listings(client, make_vendor):
+    for i in range(20):
+        make_vendor(name=f"Vendor {i}", description="Smoked brisket and ribs " * 5)
+    plain = client.get("/api/vendors/search", params={"limit": 50}, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert len(plain.content) >= COMPRESS_MIN_BYTES
+
+    for encoding in ("br", "gzip"):
+        response = client.get("/api/vendors/search", params={"limit": 50}, headers={"Accept-Encoding": encoding})
+        assert response.headers["content-encoding"] == encoding
+        assert response.json() == plain.json()   # decoded by the client
+
+    small = client.get("/api/vendors/search", params={"q": "nothing matches"}, headers={"Accept-Encoding": "gzip"})
+    assert small.json() == [] and "content-encoding" not in small.headers
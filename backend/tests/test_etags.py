@@ -0,0 +1,100 @@
+import pytest
+
+from app.models.user import UserRole
+
+
+def _get(client, url, etag=None, headers=None):
+    headers = dict(headers or {})
+    if etag is not None:
+        headers["If-None-Match"] = etag
+    return client.get(url, headers=headers)
+
+
+def _etag(client, url, headers=None):
+    response = _get(client, url, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"')
+    # The tag answers its own revalidation with an empty 304
+    repeat = _get(client, url, response.headers["ETag"], headers)
+    assert repeat.status_code == 304 and repeat.content == b""
+    assert repeat.headers["ETag"] == response.headers["ETag"]
+    return response.headers["ETag"]
+
+
+@pytest.fixture
+def vendor(publish):
+    return publish("Smokehouse")
+
+
+@pytest.fixture
+def reviewer(make_user):
+    return make_user(UserRole.user)
+
+
+def _urls(vendor):
+    return [
+        f"/api/vendors/{vendor['id']}/reviews",
+        f"/api/vendors/{vendor['id']}/hours/weekly",
+        f"/api/vendors/{vendor['id']}/hours/status",
+        f"/api/vendors/{vendor['slug']}",
+    ]
+
+
+def test_every_write_path_changes_the_tags(client, vendor, reviewer, admin_headers):
+    _, headers = reviewer
+    week = [{"day_of_week": d, "start_time_local": "09:00", "end_time_local": "17:00"} for d in range(7)]
+    writes = [
+        lambda: client.patch(f"/api/vendors/{vendor['id']}", json={"description": "Brisket"}, headers=admin_headers),
+        lambda: client.put(f"/api/vendors/{vendor['id']}/hours/weekly", json=week, headers=admin_headers),
+        lambda: client.post(f"/api/vendors/{vendor['id']}/reviews", json={"rating": 5, "body": "Great"},
+                            headers=headers),
+    ]
+    for write in writes:
+        before = {url: _etag(client, url) for url in _urls(vendor)}
+        stale = before[_urls(vendor)[0]]
+        assert write().status_code in (200, 201)
+        after = {url: _etag(client, url) for url in _urls(vendor)}
+        assert all(after[url] != before[url] for url in before)
+        assert _get(client, _urls(vendor)[0], stale).status_code == 200
+
+    [review] = client.get(f"/api/vendors/{vendor['id']}/reviews").json()
+    url = f"/api/vendors/{vendor['id']}/reviews"
+    before = _etag(client, url)
+    assert client.delete(f"{url}/{review['id']}", headers=headers).status_code == 204
+    assert _etag(client, url) != before
+    assert client.get(url).json() == []
+
+
+def test_reviewer_avatar_change_changes_the_reviews_tag(client, vendor, reviewer, publish):
+    user, headers = reviewer
+    other = publish("Taco Cart")
+    for v in (vendor, other):
+        response = client.post(f"/api/vendors/{v['id']}/reviews", json={"rating": 4}, headers=headers)
+        assert response.status_code == 201
+    urls = [f"/api/vendors/{v['id']}/reviews" for v in (vendor, other)]
+    before = [_etag(client, url) for url in urls]
+
+    response = client.patch("/api/auth/me", json={"avatar_url": "https://example.com/a.png"}, headers=headers)
+    assert response.status_code == 200 and response.json()["avatar_url"] == "https://example.com/a.png"
+    for url, tag in zip(urls, before):
+        response = _get(client, url, tag)
+        assert response.status_code == 200
+        assert response.json()[0]["avatar_url"] == "https://example.com/a.png"
+        assert response.headers["ETag"] != tag
+
+
+def test_name_only_profile_edit_keeps_the_tags(client, vendor, reviewer):
+    _, headers = reviewer
+    assert client.post(f"/api/vendors/{vendor['id']}/reviews", json={"rating": 4}, headers=headers).status_code == 201
+    url = f"/api/vendors/{vendor['id']}/reviews"
+    before = _etag(client, url)
+    assert client.patch("/api/auth/me", json={"full_name": "Pat"}, headers=headers).status_code == 200
+    assert _get(client, url, before).status_code == 304
+
+
+def test_admin_and_public_review_lists_have_different_tags(client, vendor, admin_headers):
+    url = f"/api/vendors/{vendor['id']}/reviews"
+    public = _etag(client, url)
+    admin = _etag(client, url, admin_headers)
+    assert public != admin
+    assert _get(client, url, public, admin_headers).status_code == 200
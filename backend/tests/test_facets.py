@@ -0,0 +1,72 @@
+import pytest
+
+from app.services.indexes import load_indexes
+
+
+def _facets(client, **params):
+    response = client.get("/api/vendors/facets", params={"distance_miles": 0, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_facets_are_unavailable_until_the_index_is_built(db, client, make_vendor):
+    make_vendor()
+    response = client.get("/api/vendors/facets")
+    assert response.status_code == 503
+    load_indexes(db)
+    assert client.get("/api/vendors/facets").status_code == 200
+
+
+def test_facet_counts_follow_create_update_and_delete(db, client, publish, admin_headers):
+    load_indexes(db)
+    first = publish("Smokehouse", tags=["bbq", "ribs"])
+    publish("Taco Cart", category="cart", tags=["tacos"])
+    assert _facets(client) == {
+        "total": 2,
+        "categories": {"cart": 1, "food_truck": 1},
+        "tags": {"bbq": 1, "ribs": 1, "tacos": 1},
+    }
+
+    response = client.patch(f"/api/vendors/{first['id']}", json={"category": "cart", "tags": ["tacos"]},
+                            headers=admin_headers)
+    assert response.status_code == 200
+    assert _facets(client) == {"total": 2, "categories": {"cart": 2}, "tags": {"tacos": 2}}
+
+    assert client.delete(f"/api/vendors/{first['id']}", headers=admin_headers).status_code == 204
+    assert _facets(client) == {"total": 1, "categories": {"cart": 1}, "tags": {"tacos": 1}}
+
+
+def test_suspended_vendors_leave_the_counts(db, client, publish, admin_headers):
+    load_indexes(db)
+    vendor = publish("Smokehouse", tags=["bbq"])
+    assert client.patch(f"/api/admin/vendors/{vendor['id']}/suspend", headers=admin_headers).status_code == 200
+    assert _facets(client) == {"total": 0, "categories": {}, "tags": {}}
+
+
+@pytest.fixture
+def market(db, make_vendor):
+    make_vendor(name="Smokehouse", tags=["bbq", "ribs"])
+    make_vendor(name="Smoke Stack", tags=["bbq"], category="cart")
+    make_vendor(name="Taco Cart", tags=["tacos"], category="cart")
+    make_vendor(name="Far Smoke", tags=["bbq"], lat=41.5, lng=-78.0)
+    load_indexes(db)
+
+
+def test_each_facet_ignores_its_own_filter(client, market):
+    assert _facets(client, category="cart", tags="bbq") == {
+        "total": 1,
+        "categories": {"food_truck": 2, "cart": 1},
+        "tags": {"bbq": 1, "tacos": 1},
+    }
+    # With tag_mode=all, tag counts show what adding each tag would leave
+    assert _facets(client, tags="bbq", tag_mode="all") == {
+        "total": 3,
+        "categories": {"food_truck": 2, "cart": 1},
+        "tags": {"bbq": 3, "ribs": 1},
+    }
+
+
+def test_facets_apply_text_and_radius_filters(client, market):
+    assert _facets(client, q="smoke")["total"] == 3
+    near = _facets(client, q="smoke", lat=40.4406, lng=-79.9959, distance_miles=5)
+    assert near == {"total": 2, "categories": {"cart": 1, "food_truck": 1}, "tags": {"bbq": 2, "ribs": 1}}
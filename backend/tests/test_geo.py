@@ -0,0 +1,46 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.utils.geo import haversine_distance, haversine_distances, rank_by_distance
+
+
+@pytest.fixture
+def points():
+    rng = random.Random(3)
+    coords = [(rng.uniform(-89.9, 89.9), rng.uniform(-180, 180)) for _ in range(500)]
+    # Same point, near-antipodal, poles and the antimeridian
+    coords += [(40.44, -79.99), (-40.44, 100.0), (90.0, 0.0), (-90.0, 45.0), (40.44, 179.999), (40.44, -179.999)]
+    return np.array(coords, dtype=np.float64)
+
+
+@pytest.mark.parametrize("origin", [(40.44, -79.99), (0.0, 0.0), (-33.87, 151.21), (89.9, 180.0)])
+def test_vectorized_distances_equal_scalar_haversine(points, origin):
+    distances = haversine_distances(*origin, points)
+    expected = [haversine_distance(*origin, lat, lng) for lat, lng in points.tolist()]
+    assert distances.tolist() == pytest.approx(expected, rel=1e-12, abs=1e-9)
+
+
+def test_empty_and_single_point_inputs():
+    assert haversine_distances(40.0, -80.0, np.empty((0, 2))).shape == (0,)
+    assert haversine_distances(40.0, -80.0, [40.0, -80.0]).tolist() == [0.0]
+
+
+def test_rank_by_distance_masks_and_orders(points):
+    origin = (40.44, -79.99)
+    distances, mask, order = rank_by_distance(*origin, points, miles=3000)
+    expected = sorted(
+        (haversine_distance(*origin, lat, lng), i) for i, (lat, lng) in enumerate(points.tolist())
+        if haversine_distance(*origin, lat, lng) <= 3000
+    )
+    assert order.tolist() == [i for _, i in expected]
+    assert mask.sum() == len(expected)
+    assert distances[order].tolist() == pytest.approx([d for d, _ in expected])
+
+
+@pytest.mark.parametrize("k", [0, 1, 7, 10_000])
+def test_rank_by_distance_top_k_is_the_sorted_prefix(points, k):
+    _, _, full = rank_by_distance(40.44, -79.99, points)
+    _, _, top = rank_by_distance(40.44, -79.99, points, k=k)
+    assert top.tolist() == full[:k].tolist()
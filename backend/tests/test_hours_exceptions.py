@@ -0,0 +1,30 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.hours import VendorHoursException
+
+
+@pytest.fixture
+def vendor(db, make_vendor):
+    vendor = make_vendor()
+    db.add_all([
+        VendorHoursException(vendor_id=vendor.id, exception_date=date.today() + timedelta(days=i), is_closed=True)
+        for i in range(3)
+    ])
+    db.commit()
+    return vendor
+
+
+def test_exceptions_page(client, vendor):
+    response = client.get(f"/api/vendors/{vendor.id}/hours/exceptions", params={"limit": 2, "offset": 1})
+    assert response.status_code == 200
+    assert [e["exception_date"] for e in response.json()] == [
+        str(date.today() + timedelta(days=1)), str(date.today() + timedelta(days=2)),
+    ]
+
+
+@pytest.mark.parametrize("params", [{"limit": 0}, {"limit": -1}, {"limit": 501}, {"offset": -1}])
+def test_exceptions_reject_out_of_range_paging(client, vendor, params):
+    response = client.get(f"/api/vendors/{vendor.id}/hours/exceptions", params=params)
+    assert response.status_code == 422
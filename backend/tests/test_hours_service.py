@@ -0,0 +1,159 @@
+"""
+Compiled schedules and batch open status give the same answers as the
+string-based hours functions they replace.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.hours_service import (
+    compile_schedule, compute_open_status, compute_open_statuses, schedule_dedup_stats, vendor_open_on_day_at_time,
+)
+
+TIMEZONES = ["America/New_York", "America/Los_Angeles", "Europe/London", "Australia/Lord_Howe"]
+
+
+def _hhmm(rng):
+    return f"{rng.randrange(24):02d}:{rng.choice([0, 15, 30, 45]):02d}"
+
+
+def random_vendor(vendor_id, rng):
+    weekly = []
+    for dow in range(7):
+        roll = rng.random()
+        if roll < 0.15:
+            continue
+        if roll < 0.25:
+            weekly.append(SimpleNamespace(vendor_id=vendor_id, day_of_week=dow, is_closed=rng.choice([True, 1]),
+                                          start_time_local=None, end_time_local=None, interval_index=0))
+            continue
+        for idx in rng.sample(range(3), rng.randint(1, 3)):
+            weekly.append(SimpleNamespace(vendor_id=vendor_id, day_of_week=dow, is_closed=rng.choice([False, None]),
+                                          start_time_local=_hhmm(rng), end_time_local=_hhmm(rng),
+                                          interval_index=idx))
+    exceptions = []
+    for _ in range(rng.randint(0, 4)):
+        closed = rng.random() < 0.5
+        exceptions.append(SimpleNamespace(
+            vendor_id=vendor_id, exception_date=date.today() + timedelta(days=rng.randint(-2, 9)), is_closed=closed,
+            start_time_local=None if closed else _hhmm(rng), end_time_local=None if closed else _hhmm(rng),
+        ))
+    return SimpleNamespace(id=vendor_id, timezone=rng.choice(TIMEZONES), weekly=weekly, exceptions=exceptions)
+
+
+@pytest.fixture
+def vendors():
+    rng = random.Random(5)
+    distinct = [random_vendor(i, rng) for i in range(1, 121)]
+    # Copies of a few schedules under other ids, as at a market
+    shared = []
+    for i in range(121, 241):
+        t = rng.choice(distinct[:6])
+        shared.append(SimpleNamespace(
+            id=i, timezone=t.timezone,
+            weekly=[SimpleNamespace(**{**vars(h), "vendor_id": i}) for h in t.weekly],
+            exceptions=[SimpleNamespace(**{**vars(e), "vendor_id": i}) for e in t.exceptions],
+        ))
+    return distinct + shared
+
+
+def test_compiled_schedule_matches_string_functions(vendors):
+    rng = random.Random(9)
+    now = datetime.utcnow()
+    moments = [now + timedelta(minutes=rng.randrange(7 * 24 * 60)) for _ in range(15)]
+    probes = [(rng.randrange(7), _hhmm(rng)) for _ in range(15)]
+    for v in vendors:
+        schedule = compile_schedule(v.id, v.timezone, v.weekly, v.exceptions)
+        for t in moments:
+            assert schedule.open_status(t) == compute_open_status(v.id, v.timezone, v.weekly, v.exceptions, t)
+        for dow, hhmm in probes:
+            assert schedule.is_open_on_day_at_time(dow, hhmm) == vendor_open_on_day_at_time(
+                v.id, v.timezone, v.weekly, v.exceptions, dow, hhmm)
+
+
+def test_batch_status_matches_per_vendor_status(vendors):
+    weekly = [h for v in vendors for h in v.weekly]
+    exceptions = [e for v in vendors for e in v.exceptions]
+    rng = random.Random(4)
+    for _ in range(10):
+        at = datetime.utcnow() + timedelta(minutes=rng.randrange(7 * 24 * 60))
+        assert compute_open_statuses(vendors, weekly, exceptions, at) == {
+            v.id: compute_open_status(v.id, v.timezone, v.weekly, v.exceptions, at) for v in vendors
+        }
+
+
+def _stats_delta(before):
+    after = schedule_dedup_stats()
+    return {k: after[k] - before[k] for k in ("schedules", "shared_schedules", "statuses", "shared_statuses")}
+
+
+def test_dedup_stats_report_shared_schedules(vendors):
+    # A zone no other test uses, so no schedule interned earlier can match
+    vendors = [SimpleNamespace(**{**vars(v), "timezone": "Pacific/Chatham"}) for v in vendors]
+    before = schedule_dedup_stats()
+    schedules = [compile_schedule(v.id, v.timezone, v.weekly, v.exceptions) for v in vendors]
+    delta = _stats_delta(before)
+    assert delta["schedules"] == len(vendors)
+    # Every market copy, plus any random schedules that came out identical
+    distinct = {s.key for s in schedules}
+    assert delta["shared_schedules"] == len(vendors) - len(distinct) >= 120
+    assert schedule_dedup_stats()["distinct_schedules"] >= len(distinct)
+    by_key = {}
+    for s in schedules:
+        assert by_key.setdefault(s.key, s._days) is s._days
+
+    before = schedule_dedup_stats()
+    weekly = [h for v in vendors for h in v.weekly]
+    exceptions = [e for v in vendors for e in v.exceptions]
+    compute_open_statuses(vendors, weekly, exceptions)
+    assert _stats_delta(before)["shared_statuses"] >= 120
+
+
+def test_edits_do_not_leak_into_a_shared_schedule():
+    rows = [SimpleNamespace(vendor_id=vid, day_of_week=d, is_closed=False, interval_index=0,
+                            start_time_local="09:00", end_time_local="17:00") for vid in (1, 2) for d in range(7)]
+    first = compile_schedule(1, "America/New_York", rows, [])
+    second = compile_schedule(2, "America/New_York", rows, [])
+    assert second.key == first.key
+    assert first.is_open_on_day_at_time(0, "16:00") and second.is_open_on_day_at_time(0, "16:00")
+
+    # The ORM rows are edited in place, then vendor 2 recompiled
+    for h in rows:
+        if h.vendor_id == 2:
+            h.end_time_local = "12:00"
+    edited = compile_schedule(2, "America/New_York", rows, [])
+    assert edited.key != first.key
+    assert not edited.is_open_on_day_at_time(0, "16:00")
+    assert first.is_open_on_day_at_time(0, "16:00")
+    assert second.is_open_on_day_at_time(0, "16:00")
+    assert first.weekly_display() == second.weekly_display() != edited.weekly_display()
+
+
+def test_hours_put_does_not_change_a_vendor_sharing_the_schedule(client, make_vendor, admin_headers):
+    week = [{"day_of_week": d, "start_time_local": "00:00", "end_time_local": "23:59"} for d in range(7)]
+    stalls = [make_vendor(name=f"Stall {i}") for i in range(3)]
+    for stall in stalls:
+        response = client.put(f"/api/vendors/{stall.id}/hours/weekly", json=week, headers=admin_headers)
+        assert response.status_code == 200
+
+    def status(vendor):
+        response = client.get(f"/api/vendors/{vendor.id}/hours/status")
+        assert response.status_code == 200
+        return response.json()
+
+    before = schedule_dedup_stats()
+    shown = [status(stall) for stall in stalls]
+    assert _stats_delta(before)["shared_schedules"] >= 2
+    assert all(s["is_open"] for s in shown)
+
+    closed = [{"day_of_week": d, "is_closed": True} for d in range(7)]
+    response = client.put(f"/api/vendors/{stalls[0].id}/hours/weekly", json=closed, headers=admin_headers)
+    assert response.status_code == 200
+    assert not status(stalls[0])["is_open"]
+    assert [status(stall) for stall in stalls[1:]] == shown[1:]
+
+    stats = client.get("/api/admin/cache-stats", headers=admin_headers).json()["schedule_dedup"]
+    assert stats == schedule_dedup_stats()
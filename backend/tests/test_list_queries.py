@@ -0,0 +1,82 @@
+"""
+Per-request query counts for list endpoints: a page costs a constant number of
+statements however many vendors it shows (no per-vendor tag, hours or relationship loads).
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.favorite import Favorite
+from app.models.hours import VendorHoursException, VendorHoursWeekly
+from app.models.review import Review, ReviewFlag
+from app.models.user import UserRole
+from app.services.response_cache import response_cache
+from app.services.status_cache import status_cache
+from app.services.vendor_snapshots import vendor_snapshots
+
+SMALL, LARGE = 3, 30
+MAX_QUERIES = 6
+
+
+@pytest.fixture
+def populate(db, make_vendor, make_user):
+    """Add vendors with tags, hours, an exception, a flagged review and a favorite each."""
+    user, user_headers = make_user()
+    _, admin_headers = make_user(UserRole.admin)
+
+    def add(count):
+        for i in range(count):
+            vendor = make_vendor(lat=40.44 + 0.001 * i, lng=-79.99, tags=["tacos", "late-night"])
+            db.add_all([
+                VendorHoursWeekly(vendor_id=vendor.id, day_of_week=day, start_time_local="11:00", end_time_local="22:00")
+                for day in range(7)
+            ])
+            db.add(VendorHoursException(vendor_id=vendor.id, exception_date=date.today() + timedelta(days=2),
+                                        is_closed=True))
+            review = Review(user_id=user.id, vendor_id=vendor.id, rating=4, body="Good")
+            db.add(review)
+            db.flush()
+            db.add(ReviewFlag(user_id=user.id, review_id=review.id, reason="spam"))
+            db.add(Favorite(user_id=user.id, vendor_id=vendor.id))
+        db.commit()
+    return add, user_headers, admin_headers
+
+
+# (url, caller, rows on the large page)
+ENDPOINTS = [
+    ("/api/vendors/search?limit=100", "user", LARGE),
+    ("/api/vendors/search?limit=100&lat=40.44&lng=-79.99&sort_by=distance", "user", LARGE),
+    ("/api/vendors/search?limit=100&q=Vendor&sort_by=rating", "user", LARGE),
+    ("/api/vendors/featured?limit=100", "user", LARGE),
+    ("/api/favorites", "user", LARGE),
+    ("/api/admin/users?limit=200", "admin", 2),
+    ("/api/admin/vendors?limit=200", "admin", LARGE),
+    ("/api/admin/reviews/flagged?limit=200", "admin", LARGE),
+]
+
+
+def _cold_count(client, count_queries, url, headers):
+    # Count a cold request: nothing served from the status, response or snapshot caches
+    for cached in (response_cache, status_cache, vendor_snapshots):
+        cached.clear()
+    with count_queries() as statements:
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    return len(statements), response.json()
+
+
+@pytest.mark.parametrize("url, who, rows", ENDPOINTS)
+def test_list_query_count_is_independent_of_page_size(client, count_queries, populate, url, who, rows):
+    add, user_headers, admin_headers = populate
+    headers = admin_headers if who == "admin" else user_headers
+
+    add(SMALL)
+    small, body = _cold_count(client, count_queries, url, headers)
+    add(LARGE - SMALL)
+    large, body = _cold_count(client, count_queries, url, headers)
+
+    assert len(body["items"] if isinstance(body, dict) else body) == rows
+    assert large == small
+    # user lookup, vendors, tags, weekly hours, exceptions, and the endpoint's own extras
+    assert large <= MAX_QUERIES
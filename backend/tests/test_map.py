@@ -0,0 +1,74 @@
+import pytest
+
+from app.services.cluster_index import MAX_CLUSTER_ZOOM
+from app.services.indexes import load_indexes
+
+PITTSBURGH = "-80.2,40.3,-79.8,40.6"
+
+
+def _map(client, bbox=PITTSBURGH, zoom=10):
+    response = client.get("/api/vendors/map", params={"bbox": bbox, "zoom": zoom})
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.fixture
+def downtown(db, make_vendor):
+    # Three vendors a few blocks apart, one across town
+    vendors = [
+        make_vendor(lat=40.4406, lng=-79.9959),
+        make_vendor(lat=40.4416, lng=-79.9969),
+        make_vendor(lat=40.4426, lng=-79.9949),
+        make_vendor(lat=40.4700, lng=-79.9000),
+    ]
+    load_indexes(db)
+    return vendors
+
+
+def test_map_needs_the_index(client):
+    assert client.get("/api/vendors/map", params={"bbox": PITTSBURGH, "zoom": 10}).status_code == 503
+
+
+def test_low_zoom_clusters_and_high_zoom_points(client, downtown):
+    low = _map(client, zoom=5)
+    assert low["points"] == []
+    [cluster] = low["clusters"]
+    assert cluster["count"] == 4
+    assert cluster["latitude"] == pytest.approx(sum(v.latitude for v in downtown) / 4)
+    assert cluster["longitude"] == pytest.approx(sum(v.longitude for v in downtown) / 4)
+    assert 5 < cluster["expansion_zoom"] <= MAX_CLUSTER_ZOOM
+
+    split = _map(client, zoom=cluster["expansion_zoom"])
+    assert len(split["clusters"]) + len(split["points"]) > 1
+    assert sum(c["count"] for c in split["clusters"]) + len(split["points"]) == 4
+
+    high = _map(client, zoom=MAX_CLUSTER_ZOOM + 1)
+    assert high["clusters"] == []
+    assert sorted(p["id"] for p in high["points"]) == sorted(v.id for v in downtown)
+
+
+def test_viewport_limits_results(client, downtown):
+    result = _map(client, bbox="-79.92,40.46,-79.88,40.48", zoom=14)
+    assert result["clusters"] == []
+    assert [p["id"] for p in result["points"]] == [downtown[3].id]
+
+
+def test_map_follows_create_update_and_delete(db, client, publish, admin_headers):
+    load_indexes(db)
+    vendor = publish("Smokehouse", lat=40.4406, lng=-79.9959)
+    assert [p["slug"] for p in _map(client, zoom=18)["points"]] == [vendor["slug"]]
+
+    response = client.patch(f"/api/vendors/{vendor['id']}", json={"latitude": 41.5, "longitude": -78.0},
+                            headers=admin_headers)
+    assert response.status_code == 200
+    assert _map(client, zoom=18)["points"] == []
+    assert [p["id"] for p in _map(client, bbox="-78.1,41.4,-77.9,41.6", zoom=18)["points"]] == [vendor["id"]]
+
+    assert client.delete(f"/api/vendors/{vendor['id']}", headers=admin_headers).status_code == 204
+    assert _map(client, bbox="-78.1,41.4,-77.9,41.6", zoom=5) == {"zoom": 5, "clusters": [], "points": []}
+
+
+@pytest.mark.parametrize("bbox", ["1,2,3", "a,b,c,d", "-80,41,-79,40"])
+def test_bad_bbox_is_rejected(db, client, bbox):
+    load_indexes(db)
+    assert client.get("/api/vendors/map", params={"bbox": bbox, "zoom": 3}).status_code == 400
@@ -0,0 +1,185 @@
+"""
+open_now / open_day / open_time filters answer exactly as the string-based hours
+functions do, whether search scans every vendor, reads the open-slot index or
+filters on the open-range tables in SQL, for overnight hours, closed days,
+unaligned minutes and exception dates alike.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.models.hours import VendorHoursException, VendorHoursWeekly
+from app.models.vendor import Vendor
+from app.services import open_ranges
+from app.services.hours_service import compute_open_status, vendor_open_on_day_at_time
+from app.services.open_index import load_open_index, open_index
+
+STEP = timedelta(minutes=20)
+MODES = ["scan", "index", "ranges"]
+
+
+def _week(start, end, days=range(7)):
+    return [{"day_of_week": d, "start_time_local": start, "end_time_local": end} for d in days]
+
+
+@pytest.fixture
+def vendors(client, make_vendor, admin_headers):
+    """Vendor name → id, hours set through the API."""
+    today = date.today()
+    schedules = {
+        "overnight": ("America/New_York", _week("22:00", "02:00"), []),
+        "weekdays": (
+            "America/Los_Angeles",
+            _week("09:00", "17:00", range(5)) + [{"day_of_week": 5, "is_closed": True}],
+            [],
+        ),
+        "split": (
+            "Europe/London",
+            _week("11:00", "14:00") + [{**h, "interval_index": 1} for h in _week("17:00", "23:00")],
+            [
+                {"exception_date": str(today + timedelta(days=1)), "is_closed": True},
+                {"exception_date": str(today + timedelta(days=2)), "start_time_local": "08:00",
+                 "end_time_local": "10:00"},
+            ],
+        ),
+        "closed_today": (
+            "America/New_York",
+            _week("00:00", "23:59"),
+            [{"exception_date": str(d), "is_closed": True} for d in (today, today + timedelta(days=3))],
+        ),
+        "unaligned": ("Australia/Lord_Howe", _week("06:40", "18:50"), []),
+        "no_hours": ("America/Chicago", [], []),
+    }
+    ids = {}
+    for name, (tz, weekly, exceptions) in schedules.items():
+        vendor = make_vendor(name=name, timezone=tz)
+        ids[name] = vendor.id
+        response = client.put(f"/api/vendors/{vendor.id}/hours/weekly", json=weekly, headers=admin_headers)
+        assert response.status_code == 200
+        for exc in exceptions:
+            response = client.post(f"/api/vendors/{vendor.id}/hours/exceptions", json=exc, headers=admin_headers)
+            assert response.status_code == 201
+    return ids
+
+
+def _open_at_instant(db, ids, at):
+    """Ids the string-based compute_open_status reports open at the UTC instant."""
+    weekly, exceptions = db.query(VendorHoursWeekly).all(), db.query(VendorHoursException).all()
+    return {
+        v.id for v in db.query(Vendor).filter(Vendor.id.in_(ids.values()))
+        if compute_open_status(v.id, v.timezone, weekly, exceptions, at).is_open
+    }
+
+
+def _open_on_day(db, ids, dow, hhmm):
+    weekly, exceptions = db.query(VendorHoursWeekly).all(), db.query(VendorHoursException).all()
+    return {
+        v.id for v in db.query(Vendor).filter(Vendor.id.in_(ids.values()))
+        if vendor_open_on_day_at_time(v.id, v.timezone, weekly, exceptions, dow, hhmm)
+    }
+
+
+def _instants():
+    start = datetime.utcnow().replace(second=0, microsecond=0)
+    return [start + i * STEP for i in range(8 * 24 * 3)]
+
+
+def _times():
+    return [f"{m // 60:02d}:{m % 60:02d}" for m in range(0, 24 * 60, 25)]
+
+
+def _enable(mode, db):
+    if mode == "index":
+        load_open_index(db)
+    elif mode == "ranges":
+        open_ranges.setup_open_ranges(db)
+
+
+def _search_ids(client, **params):
+    response = client.get("/api/vendors/search", params={"limit": 100, **params})
+    assert response.status_code == 200
+    return {v["id"] for v in response.json()}
+
+
+def test_index_open_now_matches_string_status(db, vendors):
+    load_open_index(db)
+    for at in _instants():
+        assert open_index.open_now(at) == _open_at_instant(db, vendors, at), at
+
+
+def test_index_open_at_matches_string_check(db, vendors):
+    load_open_index(db)
+    for dow in range(7):
+        for hhmm in _times():
+            assert open_index.open_at(dow, hhmm) == _open_on_day(db, vendors, dow, hhmm), (dow, hhmm)
+
+
+def _matching(db, clause):
+    return {vid for (vid,) in db.query(Vendor.id).filter(clause)}
+
+
+def test_range_tables_open_now_matches_string_status(db, vendors):
+    for at in _instants()[::3]:
+        assert _matching(db, open_ranges.open_now_clause(db, at)) == _open_at_instant(db, vendors, at), at
+
+
+def test_range_tables_open_at_matches_string_check(db, vendors):
+    for dow in range(7):
+        for hhmm in _times():
+            assert _matching(db, open_ranges.open_at_clause(dow, hhmm)) == _open_on_day(db, vendors, dow, hhmm), (
+                dow, hhmm)
+
+
+def test_rebuilt_range_tables_match_the_ones_written_by_hours_edits(db, vendors):
+    from app.models.hours import VendorOpenExceptionRange, VendorOpenRange
+
+    def snapshot():
+        return (
+            sorted(db.query(VendorOpenRange.vendor_id, VendorOpenRange.start_minute, VendorOpenRange.end_minute)),
+            sorted(db.query(VendorOpenExceptionRange.vendor_id, VendorOpenExceptionRange.local_date,
+                            VendorOpenExceptionRange.start_minute, VendorOpenExceptionRange.end_minute),
+                   key=str),
+        )
+
+    written = snapshot()
+    open_ranges.rebuild_open_ranges(db)
+    assert snapshot() == written
+    assert written[0] and written[1]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_search_open_now_matches_string_status(db, client, vendors, mode):
+    _enable(mode, db)
+    for open_now in (True, False):
+        before = _open_at_instant(db, vendors, datetime.utcnow())
+        found = _search_ids(client, open_now=open_now)
+        after = _open_at_instant(db, vendors, datetime.utcnow())
+        expected = [ids if open_now else set(vendors.values()) - ids for ids in (before, after)]
+        assert found in expected
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_search_open_at_matches_string_check(db, client, vendors, mode):
+    _enable(mode, db)
+    for dow in range(7):
+        for hhmm in ("00:30", "01:59", "02:00", "06:45", "10:00", "16:59", "22:00", "23:30"):
+            found = _search_ids(client, open_day=dow, open_time=hhmm)
+            assert found == _open_on_day(db, vendors, dow, hhmm), (dow, hhmm)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_weekly_hours_put_refreshes_the_filter(db, client, vendors, admin_headers, mode):
+    _enable(mode, db)
+    vendor_id = vendors["weekdays"]
+    saturday = {"open_day": 5, "open_time": "12:00"}
+    assert vendor_id not in _search_ids(client, **saturday)
+
+    response = client.put(f"/api/vendors/{vendor_id}/hours/weekly", json=_week("10:00", "14:00"),
+                          headers=admin_headers)
+    assert response.status_code == 200
+    assert vendor_id in _search_ids(client, **saturday)
+    assert vendor_id not in _search_ids(client, open_day=5, open_time="15:00")
+
+    assert client.delete(f"/api/vendors/{vendor_id}/hours/weekly", headers=admin_headers).status_code == 204
+    assert vendor_id not in _search_ids(client, **saturday)
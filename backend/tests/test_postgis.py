@@ -0,0 +1,103 @@
+"""
+PostGIS distance search. The end-to-end tests need TEST_DATABASE_URL pointing at a
+database with the extension available (`docker compose up db`); the rest run anywhere.
+"""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.services import postgis
+from app.utils.geo import haversine_distance
+
+ORIGIN = (40.4406, -79.9959)
+
+
+@pytest.fixture
+def with_postgis(engine):
+    if not postgis.setup_postgis(engine):
+        pytest.skip("needs TEST_DATABASE_URL pointing at a PostGIS database")
+    return engine
+
+
+def _ring(make_vendor, count=12):
+    """Vendors due north of ORIGIN, about 0.7 miles apart."""
+    return [make_vendor(lat=ORIGIN[0] + 0.01 * i, lng=ORIGIN[1]) for i in range(count)]
+
+
+def _search(client, **params):
+    params = {"lat": ORIGIN[0], "lng": ORIGIN[1], "sort_by": "distance", **params}
+    return client.get("/api/vendors/search", params=params)
+
+
+def test_setup_is_skipped_without_postgis(engine):
+    if engine.dialect.name == "postgresql":
+        pytest.skip("SQLite only")
+    assert postgis.setup_postgis(engine) is False
+    assert postgis.enabled is False
+
+
+def test_distance_search_falls_back_without_postgis(client, make_vendor):
+    vendors = _ring(make_vendor)
+    response = _search(client, distance_miles=3, limit=3)
+    assert response.status_code == 200
+    assert [v["id"] for v in response.json()] == [v.id for v in vendors[:3]]
+
+    ids, cursor = [], None
+    while True:
+        response = _search(client, distance_miles=3, limit=3, **({"cursor": cursor} if cursor else {}))
+        ids += [v["id"] for v in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    within = [v.id for v in vendors if haversine_distance(*ORIGIN, v.latitude, v.longitude) <= 3]
+    assert ids == within
+
+
+def test_distance_page_is_one_knn_statement(engine, client, make_vendor, count_queries, monkeypatch):
+    """Radius filter, KNN ordering and LIMIT are pushed into the vendors query."""
+    if engine.dialect.name == "postgresql":
+        pytest.skip("covered end to end by test_knn_search_matches_haversine")
+    _ring(make_vendor, count=3)
+    monkeypatch.setattr(postgis, "enabled", True)
+    # SQLite cannot run the PostGIS functions: record the statement and let it fail
+    with count_queries() as statements, pytest.raises(OperationalError):
+        _search(client, distance_miles=5, limit=10)
+    knn = [s for s in statements if "<->" in s]
+    assert len(knn) == 1
+    assert "ST_DWithin" in knn[0]
+    assert "ORDER BY" in knn[0] and "LIMIT" in knn[0]
+
+
+def test_geog_column_tracks_lat_lng(with_postgis, db, make_vendor):
+    vendor = make_vendor(lat=ORIGIN[0], lng=ORIGIN[1])
+    vendor.latitude = 40.5
+    db.commit()
+    lat, lng = db.execute(
+        text("SELECT ST_Y(geog::geometry), ST_X(geog::geometry) FROM vendors WHERE id = :id"), {"id": vendor.id}
+    ).one()
+    assert (round(lat, 6), round(lng, 6)) == (40.5, ORIGIN[1])
+
+
+def test_knn_search_matches_haversine(with_postgis, client, make_vendor, count_queries):
+    vendors = _ring(make_vendor)
+    expected = [
+        v.id for v in sorted(vendors, key=lambda v: haversine_distance(*ORIGIN, v.latitude, v.longitude))
+        if haversine_distance(*ORIGIN, v.latitude, v.longitude) <= 3
+    ]
+
+    ids, cursor = [], None
+    while True:
+        with count_queries() as statements:
+            response = _search(client, distance_miles=3, limit=3, **({"cursor": cursor} if cursor else {}))
+        assert response.status_code == 200
+        page = response.json()
+        ids += [v["id"] for v in page]
+        distances = [v["distance_miles"] for v in page]
+        assert distances == sorted(distances)
+        knn = [s for s in statements if "<->" in s]
+        assert knn and all("ST_DWithin" in s and "LIMIT" in s for s in knn)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert ids == expected
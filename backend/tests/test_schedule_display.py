@@ -0,0 +1,57 @@
+from app.models.hours import VendorHoursWeekly, VendorScheduleDisplay
+from app.services.hours_service import backfill_schedule_displays, get_weekly_schedule_display
+
+
+def _week(start, end, days=range(7)):
+    return [{"day_of_week": d, "start_time_local": start, "end_time_local": end} for d in days]
+
+
+def _displays(client, vendor):
+    status = client.get(f"/api/vendors/{vendor['id']}/hours/status")
+    detail = client.get(f"/api/vendors/{vendor['slug']}")
+    assert status.status_code == 200 and detail.status_code == 200
+    assert status.json()["weekly_schedule"] == detail.json()["weekly_schedule"]
+    return status.json()["weekly_schedule"]
+
+
+def _rendered(db, vendor_id, timezone):
+    weekly = db.query(VendorHoursWeekly).filter(VendorHoursWeekly.vendor_id == vendor_id).all()
+    return get_weekly_schedule_display(vendor_id, timezone, weekly, [])
+
+
+def test_stored_display_follows_weekly_hours_edits(db, client, publish, admin_headers):
+    vendor = publish("Smokehouse")
+    assert all(day["is_closed"] for day in _displays(client, vendor))
+
+    hours = _week("11:00", "14:00", range(5)) + [{"day_of_week": 5, "is_closed": True}]
+    response = client.put(f"/api/vendors/{vendor['id']}/hours/weekly", json=hours, headers=admin_headers)
+    assert response.status_code == 200
+    shown = _displays(client, vendor)
+    assert shown == _rendered(db, vendor["id"], vendor["timezone"])
+    assert shown[0]["intervals"] == [{"start": "11:00", "end": "14:00", "start_12h": "11:00 AM", "end_12h": "2:00 PM"}]
+    assert shown[5]["is_closed"] and shown[6]["is_closed"]
+
+    response = client.put(f"/api/vendors/{vendor['id']}/hours/weekly", json=_week("17:00", "23:00", [6]),
+                          headers=admin_headers)
+    assert response.status_code == 200
+    shown = _displays(client, vendor)
+    assert shown == _rendered(db, vendor["id"], vendor["timezone"])
+    assert [day["dow"] for day in shown if not day["is_closed"]] == [6]
+
+    assert client.delete(f"/api/vendors/{vendor['id']}/hours/weekly", headers=admin_headers).status_code == 204
+    assert all(day["is_closed"] for day in _displays(client, vendor))
+
+
+def test_backfill_stores_displays_for_vendors_without_one(db, make_vendor):
+    with_hours, without_hours = make_vendor(), make_vendor()
+    db.add_all(VendorHoursWeekly(vendor_id=with_hours.id, day_of_week=d, start_time_local="08:00",
+                                 end_time_local="12:00") for d in range(3))
+    db.commit()
+    db.query(VendorScheduleDisplay).delete()
+    db.commit()
+
+    assert backfill_schedule_displays(db) == 2
+    for vendor in (with_hours, without_hours):
+        db.refresh(vendor)
+        assert vendor.schedule_display.schedule == _rendered(db, vendor.id, vendor.timezone)
+    assert backfill_schedule_displays(db) == 0
@@ -0,0 +1,102 @@
+"""
+The geohash response cache for /api/vendors/search: results are always those of the
+caller's exact origin, whether the cell's candidate set was cached or not.
+"""
+
+import random
+
+import pytest
+
+from app.services import spatial_index
+from app.services.response_cache import quantize, response_cache
+from app.utils.geo import geohash_bounds, haversine_distance
+
+RADIUS = 3.0
+
+
+@pytest.fixture
+def scattered(make_vendor):
+    rng = random.Random(7)
+    return [
+        make_vendor(lat=40.44 + rng.uniform(-0.07, 0.07), lng=-79.99 + rng.uniform(-0.09, 0.09),
+                    average_rating=rng.choice([3.0, 4.0, 5.0]))
+        for _ in range(150)
+    ]
+
+
+def _corner_origins():
+    """Two origins at opposite corners of one geohash cell."""
+    cell, _, _ = quantize(40.44, -79.99)
+    south, west, north, east = geohash_bounds(cell)
+    eps = (north - south) * 0.01
+    return (south + eps, west + eps), (north - eps, east - eps)
+
+
+def _walk(client, origin, **params):
+    rows, cursor = [], None
+    while True:
+        params_page = {"lat": origin[0], "lng": origin[1], "distance_miles": RADIUS, "limit": 20, **params}
+        if cursor:
+            params_page["cursor"] = cursor
+        response = client.get("/api/vendors/search", params=params_page)
+        assert response.status_code == 200
+        rows += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return rows
+
+
+def _within(vendors, origin):
+    return {v.id for v in vendors if haversine_distance(*origin, v.latitude, v.longitude) <= RADIUS}
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+@pytest.mark.parametrize("sort_by", ["distance", "rating", "trending"])
+def test_cell_neighbours_get_their_own_exact_results(db, client, scattered, indexed, sort_by):
+    if indexed:
+        spatial_index.load_spatial_index(db)
+    first, second = _corner_origins()
+    for origin in (first, second, first):   # miss, then hits on the cell's candidate set
+        rows = _walk(client, origin, sort_by=sort_by)
+        ids = [row["id"] for row in rows]
+        assert len(ids) == len(set(ids))
+        assert set(ids) == _within(scattered, origin)
+        for row in rows:
+            assert row["distance_miles"] == round(haversine_distance(*origin, row["latitude"], row["longitude"]), 2)
+        if sort_by == "distance":
+            distances = [row["distance_miles"] for row in rows]
+            assert distances == sorted(distances)
+    assert response_cache.hits > 0
+
+
+def test_offset_pages_match_cursor_pages(client, scattered):
+    origin, _ = _corner_origins()
+    walked = [row["id"] for row in _walk(client, origin, sort_by="rating")]
+    params = {"lat": origin[0], "lng": origin[1], "distance_miles": RADIUS, "sort_by": "rating", "limit": 20}
+    paged = []
+    for offset in range(0, len(walked), 20):
+        paged += [row["id"] for row in client.get("/api/vendors/search", params={**params, "offset": offset}).json()]
+    assert paged == walked
+
+
+def test_vendor_write_drops_the_cell_candidates(client, scattered, make_user):
+    from app.models.user import UserRole
+
+    origin, _ = _corner_origins()
+    before = {row["id"] for row in _walk(client, origin, sort_by="distance")}
+    _, admin = make_user(UserRole.admin)
+    gone = next(iter(before))
+    assert client.delete(f"/api/vendors/{gone}", headers=admin).status_code == 204
+    after = {row["id"] for row in _walk(client, origin, sort_by="distance")}
+    assert after == before - {gone}
+
+
+def test_oversized_cells_page_from_the_database(client, scattered, monkeypatch):
+    from app.api import vendors
+
+    monkeypatch.setattr(vendors, "MAX_CELL_CANDIDATES", 10)
+    origin, _ = _corner_origins()
+    for _ in range(2):
+        rows = _walk(client, origin, sort_by="distance")
+        assert {row["id"] for row in rows} == _within(scattered, origin)
+        assert [row["distance_miles"] for row in rows] == sorted(row["distance_miles"] for row in rows)
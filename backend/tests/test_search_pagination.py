@@ -0,0 +1,74 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api.vendors import _keyset_page
+
+
+def _cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def _walk(client, **params):
+    ids, cursor = [], None
+    while True:
+        response = client.get("/api/vendors/search", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        ids += [v["id"] for v in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids
+
+
+@pytest.mark.parametrize("sort_by", ["trending", "rating", "newest"])
+def test_cursor_walk_matches_offset_pages(client, make_vendor, sort_by):
+    start = datetime(2026, 1, 1)
+    for i in range(7):
+        make_vendor(average_rating=float(i % 3), review_count=i, created_at=start + timedelta(days=i % 4))
+    full = client.get("/api/vendors/search", params={"sort_by": sort_by, "limit": 100}).json()
+    assert _walk(client, sort_by=sort_by, limit=2) == [v["id"] for v in full]
+    assert len(full) == 7
+
+
+@pytest.mark.parametrize("params", [{"limit": 0}, {"limit": -1}, {"limit": 101}, {"offset": -1}])
+def test_out_of_range_page_params_are_rejected(client, make_vendor, params):
+    make_vendor()
+    assert client.get("/api/vendors/search", params=params).status_code == 422
+
+
+@pytest.mark.parametrize("sort_by, payload", [
+    ("rating", ["rating", 0, [1]]),
+    ("rating", ["rating", 0, []]),
+    ("rating", ["rating", 0, [1.0, 2, 3]]),
+    ("rating", ["rating", 0, ["x", 1]]),
+    ("rating", ["rating", 0, [1.0, "1"]]),
+    ("rating", ["rating", 0, [1.0, 1.5]]),
+    ("rating", ["rating", 0, [True, 1]]),
+    ("rating", ["rating", 0, {"a": 1}]),
+    ("rating", ["rating", 1, [1.0, 1]]),
+    ("rating", ["rating", "0", [1.0, 1]]),
+    ("rating", ["trending", 0, [1.0, 1]]),
+    ("rating", ["x", 1]),
+    ("rating", []),
+    ("newest", ["newest", 0, [5, 1]]),
+    ("newest", ["newest", 0, ["yesterday", 1]]),
+    ("trending", ["trending", 2, [1.0, 1]]),
+])
+def test_tampered_cursor_is_a_bad_request(client, make_vendor, sort_by, payload):
+    make_vendor()
+    response = client.get("/api/vendors/search", params={"sort_by": sort_by, "cursor": _cursor(payload)})
+    assert response.status_code == 400
+
+
+def test_keyset_page_stops_on_empty_chunks():
+    calls = []
+
+    def fetch(after, size):
+        calls.append(size)
+        return []
+
+    assert _keyset_page(fetch, None, lambda v, d: v, limit=5, chunk_size=0, skip=0) == ([], None, 0)
+    assert _keyset_page(fetch, None, lambda v, d: v, limit=5, chunk_size=5, skip=0) == ([], None, 0)
+    assert calls == [5]
@@ -0,0 +1,84 @@
+"""Text matching in /api/vendors/search. Full-text tests need TEST_DATABASE_URL (PostgreSQL)."""
+
+import pytest
+
+from app.services import facet_index, fulltext, fuzzy_index
+
+
+@pytest.fixture
+def with_fulltext(engine):
+    if not fulltext.setup_fulltext(engine):
+        pytest.skip("needs TEST_DATABASE_URL pointing at PostgreSQL")
+    return engine
+
+
+@pytest.fixture
+def vendors(make_vendor):
+    return {
+        "pierogi": make_vendor(name="Pierogi Palace", tags=["polish"]),
+        "truck": make_vendor(name="Taco Truck", description="Street tacos", city="Millvale"),
+        "banh": make_vendor(name="Banh Mi Stand", tags=["vietnamese"]),
+    }
+
+
+def _ids(client, **params):
+    response = client.get("/api/vendors/search", params={"limit": 100, **params})
+    assert response.status_code == 200
+    return {v["id"] for v in response.json()}
+
+
+def test_tsquery_prefixes_the_last_plain_word():
+    query = fulltext.tsquery("Taco pier")
+    assert query.name == "to_tsquery"
+    assert query.clauses.clauses[1].value == "'Taco' & 'pier':*"
+
+
+@pytest.mark.parametrize("q", ['"banh mi"', "tacos or burritos", "tacos -fish"])
+def test_tsquery_keeps_websearch_syntax(q):
+    assert fulltext.tsquery(q).name == "websearch_to_tsquery"
+
+
+@pytest.mark.parametrize("q, expected", [("pier", "pierogi"), ("ruck", "truck"), ("millv", "truck")])
+def test_default_search_matches_fragments(client, vendors, q, expected):
+    assert _ids(client, q=q) == {vendors[expected].id}
+
+
+@pytest.mark.parametrize("q, expected", [("pier", "pierogi"), ("Truck", "truck"), ("polish", "pierogi")])
+def test_fulltext_mode_matches_word_prefixes(with_fulltext, client, vendors, q, expected):
+    assert _ids(client, q=q, text_mode="fulltext") == {vendors[expected].id}
+
+
+def test_default_search_keeps_substring_matching_with_fulltext_enabled(with_fulltext, client, vendors):
+    assert _ids(client, q="ruck") == {vendors["truck"].id}
+
+
+def test_relevance_sort_ranks_name_hits_first(with_fulltext, client, make_vendor):
+    described = make_vendor(name="Corner Cart", description="the best tacos in town")
+    named = make_vendor(name="Tacos El Gordo")
+    response = client.get("/api/vendors/search", params={"q": "tacos", "sort_by": "relevance"})
+    assert [v["id"] for v in response.json()] == [named.id, described.id]
+
+
+@pytest.fixture
+def fuzzy_ready(db, vendors):
+    fuzzy_index.load_fuzzy_index(db)
+    facet_index.load_facet_index(db)
+
+
+@pytest.mark.parametrize("q, expected", [
+    ("perogie", {"pierogi"}),
+    ("bahn mi", {"banh"}),
+    ("tru", {"truck"}),
+    ("Millvale", {"truck"}),
+    ("tacos", {"truck"}),
+])
+def test_fuzzy_search_widens_exact_search(client, vendors, fuzzy_ready, q, expected):
+    exact = _ids(client, q=q)
+    fuzzy = _ids(client, q=q, fuzzy="true")
+    assert exact <= fuzzy
+    assert fuzzy == {vendors[name].id for name in expected}
+
+
+def test_fuzzy_facets_count_exact_matches(client, vendors, fuzzy_ready):
+    response = client.get("/api/vendors/facets", params={"q": "tru", "fuzzy": "true"})
+    assert response.json()["total"] == 1
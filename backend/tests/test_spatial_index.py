@@ -0,0 +1,81 @@
+"""
+The in-memory spatial grid returns what the SQL radius path returns: the same
+vendors at the same distances, with the same filters, as writes move them around.
+"""
+
+import random
+
+import pytest
+
+from app.models.vendor import VendorCategory, VendorStatus
+from app.services import spatial_index
+from app.services.indexes import refresh_vendor
+from app.services.response_cache import response_cache
+from app.utils.geo import haversine_distance
+
+ORIGIN = (40.44, -79.99)
+
+
+@pytest.fixture
+def scattered(make_vendor):
+    rng = random.Random(11)
+    return [
+        make_vendor(
+            lat=ORIGIN[0] + rng.uniform(-0.3, 0.3),
+            lng=ORIGIN[1] + rng.uniform(-0.4, 0.4),
+            category=rng.choice([VendorCategory.food_truck, VendorCategory.market_stall]),
+            status=rng.choice([VendorStatus.active] * 4 + [VendorStatus.pending]),
+            tags=rng.sample(["tacos", "bbq", "vegan"], rng.randint(0, 2)),
+            average_rating=rng.choice([3.0, 4.0, 5.0]),
+        )
+        for _ in range(120)
+    ]
+
+
+def _search(client, **params):
+    response_cache.clear()
+    response = client.get("/api/vendors/search", params={"lat": ORIGIN[0], "lng": ORIGIN[1], "limit": 100, **params})
+    assert response.status_code == 200
+    return [(v["id"], v["distance_miles"]) for v in response.json()]
+
+
+@pytest.mark.parametrize("params", [
+    {"distance_miles": 5, "sort_by": "distance"},
+    {"distance_miles": 12, "sort_by": "distance"},
+    {"distance_miles": 8, "sort_by": "rating"},
+    {"distance_miles": 8, "sort_by": "distance", "category": "market_stall"},
+    {"distance_miles": 10, "sort_by": "distance", "tags": "tacos,vegan"},
+    {"distance_miles": 10, "sort_by": "trending", "tags": "tacos,vegan", "tag_mode": "all"},
+])
+def test_grid_search_matches_sql_path(db, client, scattered, params):
+    from_sql = _search(client, **params)
+    spatial_index.load_spatial_index(db)
+    assert _search(client, **params) == from_sql
+    assert from_sql
+
+
+def test_within_matches_brute_force(db, scattered):
+    spatial_index.load_spatial_index(db)
+    hits = spatial_index.spatial_index.within(*ORIGIN, 7.5, status="active", tags={"bbq"})
+    expected = sorted(
+        (haversine_distance(*ORIGIN, v.latitude, v.longitude), v.id) for v in scattered
+        if v.status == VendorStatus.active and "bbq" in {t.tag for t in v.tags}
+        and haversine_distance(*ORIGIN, v.latitude, v.longitude) <= 7.5
+    )
+    assert [p.id for _, p in hits] == [vid for _, vid in expected]
+    assert [d for d, _ in hits] == pytest.approx([d for d, _ in expected])
+    assert spatial_index.spatial_index.within(*ORIGIN, 7.5, status="active", tags={"bbq"}, k=3) == hits[:3]
+
+
+def test_moved_and_deactivated_vendors_follow_writes(db, client, make_vendor):
+    near, far = make_vendor(lat=ORIGIN[0] + 0.01, lng=ORIGIN[1]), make_vendor(lat=41.5, lng=-78.0)
+    spatial_index.load_spatial_index(db)
+    assert [vid for vid, _ in _search(client, distance_miles=5)] == [near.id]
+
+    far.latitude, far.longitude = ORIGIN[0] - 0.02, ORIGIN[1]
+    near.status = VendorStatus.suspended
+    db.commit()
+    refresh_vendor(far)
+    refresh_vendor(near)
+    assert [vid for vid, _ in _search(client, distance_miles=5)] == [far.id]
+    assert spatial_index.spatial_index.get(far.id).latitude == pytest.approx(ORIGIN[0] - 0.02)
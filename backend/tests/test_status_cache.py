@@ -0,0 +1,151 @@
+"""
+Cached open statuses expire exactly when the string-based status would change:
+at boundary minutes, across midnight, on exception days and through DST switches.
+"""
+
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+import pytz
+
+from app.services import status_cache as status_cache_module
+from app.services.hours_service import compile_schedules, compute_open_status
+from app.services.status_cache import StatusCache, next_transition
+
+NEW_YORK = "America/New_York"
+
+
+def _week(vendor_id, start, end, days=range(7)):
+    return [SimpleNamespace(vendor_id=vendor_id, day_of_week=d, is_closed=False, interval_index=0,
+                            start_time_local=start, end_time_local=end) for d in days]
+
+
+def _exception(vendor_id, day, start=None, end=None):
+    return SimpleNamespace(vendor_id=vendor_id, exception_date=day, is_closed=start is None,
+                           start_time_local=start, end_time_local=end)
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=pytz.utc)
+
+
+@pytest.fixture
+def vendor(monkeypatch):
+    """A vendor whose hours the cache loads from these rows instead of the database."""
+    v = SimpleNamespace(id=1, timezone=NEW_YORK, weekly=[], exceptions=[])
+    monkeypatch.setattr(status_cache_module, "load_schedules",
+                        lambda db, vendors: compile_schedules(vendors, v.weekly, v.exceptions))
+    return v
+
+
+def _expected(v, at):
+    return compute_open_status(v.id, v.timezone, v.weekly, v.exceptions, at)
+
+
+def _walk(cache, v, start, end):
+    """
+    Follow the cache from start to end by sweeping at each expiry. Checks the cached
+    status against the string-based one when it is stored and just before it expires.
+    Returns [(instant, is_open)] for every recomputation.
+    """
+    entry = cache.lookup(None, [v], start)[v.id]
+    steps = [(start, entry.status.is_open)]
+    while entry.expires_at < end:
+        due = entry.expires_at
+        assert entry.status == _expected(v, due - timedelta(minutes=1)), due
+        assert cache.sweep(due - timedelta(seconds=1)) == 0
+        assert cache.sweep(due) == 1
+        entry = cache.lookup(None, [v], due)[v.id]
+        assert entry.status == _expected(v, due), due
+        steps.append((due, entry.status.is_open))
+    return steps
+
+
+def test_status_changes_at_the_boundary_minute(vendor):
+    vendor.weekly = _week(vendor.id, "09:00", "17:00")
+    cache = StatusCache()
+    # 16:59 EDT
+    entry = cache.lookup(None, [vendor], _utc(2026, 6, 10, 20, 59))[vendor.id]
+    assert entry.status.is_open and entry.status.closes_at == "17:00"
+    assert entry.expires_at == _utc(2026, 6, 10, 21, 0)
+    assert cache.next_due() == entry.expires_at
+
+    assert cache.lookup(None, [vendor], _utc(2026, 6, 10, 20, 59, 59))[vendor.id].status.is_open
+    assert cache.sweep(_utc(2026, 6, 10, 20, 59, 59)) == 0
+    assert cache.sweep(_utc(2026, 6, 10, 21, 0)) == 1
+    closed = cache.lookup(None, [vendor], _utc(2026, 6, 10, 21, 0))[vendor.id]
+    assert not closed.status.is_open
+    assert closed.status == _expected(vendor, _utc(2026, 6, 10, 21, 0))
+    assert cache.misses == 1 and cache.hits == 2
+
+
+def test_overnight_hours_stay_open_past_midnight(vendor):
+    vendor.weekly = _week(vendor.id, "22:00", "02:00")
+    steps = _walk(StatusCache(), vendor, _utc(2026, 6, 10, 12), _utc(2026, 6, 12))
+    opened = [at for at, is_open in steps if is_open]
+    closed = [at for at, is_open in steps if not is_open]
+    # Opens at 22:00 EDT, relabels at midnight, closes at 02:00
+    assert _utc(2026, 6, 11, 2) in opened and _utc(2026, 6, 11, 4) in opened
+    assert _utc(2026, 6, 11, 6) in closed
+    assert not any(_utc(2026, 6, 11, 2) < at < _utc(2026, 6, 11, 6) for at in closed)
+
+
+def test_exception_days_override_weekly_hours(vendor):
+    vendor.weekly = _week(vendor.id, "09:00", "17:00")
+    vendor.exceptions = [
+        _exception(vendor.id, date(2026, 6, 11)),
+        _exception(vendor.id, date(2026, 6, 12), "10:00", "12:00"),
+    ]
+    steps = _walk(StatusCache(), vendor, _utc(2026, 6, 10, 14), _utc(2026, 6, 14))
+    assert [at for at, is_open in steps if is_open] == [
+        _utc(2026, 6, 10, 14),
+        _utc(2026, 6, 12, 14),   # 10:00 EDT on the shortened day
+        _utc(2026, 6, 13, 13),   # back to 09:00
+    ]
+    assert _utc(2026, 6, 12, 16) in [at for at, is_open in steps if not is_open]
+
+
+def test_spring_forward_expires_at_the_switch(vendor):
+    # 2026-03-08: 02:00 EST becomes 03:00 EDT at 07:00 UTC
+    vendor.weekly = _week(vendor.id, "01:00", "04:00")
+    cache = StatusCache()
+    entry = cache.lookup(None, [vendor], _utc(2026, 3, 8, 6, 30))[vendor.id]
+    assert entry.status.is_open
+    # 04:00 local is 08:00 UTC in EDT, not the 09:00 the EST offset would give
+    assert entry.expires_at == _utc(2026, 3, 8, 7)
+
+    assert cache.sweep(_utc(2026, 3, 8, 7)) == 1
+    entry = cache.lookup(None, [vendor], _utc(2026, 3, 8, 7))[vendor.id]
+    assert entry.status.is_open
+    assert entry.expires_at == _utc(2026, 3, 8, 8)
+    assert cache.sweep(_utc(2026, 3, 8, 8)) == 1
+    assert not cache.lookup(None, [vendor], _utc(2026, 3, 8, 8))[vendor.id].status.is_open
+
+
+def test_fall_back_reopens_in_the_repeated_hour(vendor):
+    # 2026-11-01: 02:00 EDT becomes 01:00 EST at 06:00 UTC
+    vendor.weekly = _week(vendor.id, "00:00", "01:30")
+    steps = _walk(StatusCache(), vendor, _utc(2026, 11, 1, 4, 30), _utc(2026, 11, 1, 12))
+    assert steps[:4] == [
+        (_utc(2026, 11, 1, 4, 30), True),
+        (_utc(2026, 11, 1, 5, 30), False),   # 01:30 EDT
+        (_utc(2026, 11, 1, 6), True),        # 01:00 EST
+        (_utc(2026, 11, 1, 6, 30), False),   # 01:30 EST
+    ]
+
+
+def test_next_transition_maps_local_change_to_utc(vendor):
+    vendor.weekly = _week(vendor.id, "09:00", "17:00")
+    [schedule] = compile_schedules([vendor], vendor.weekly, vendor.exceptions).values()
+    assert next_transition(schedule, _utc(2026, 6, 10, 20, 59, 30)) == _utc(2026, 6, 10, 21)
+    assert next_transition(schedule, _utc(2026, 6, 10, 21)) == _utc(2026, 6, 11, 4)
+
+
+def test_invalidated_entries_are_skipped_by_the_sweep(vendor):
+    vendor.weekly = _week(vendor.id, "09:00", "17:00")
+    cache = StatusCache()
+    cache.lookup(None, [vendor], _utc(2026, 6, 10, 20))
+    cache.invalidate(vendor.id)
+    assert cache.sweep(_utc(2026, 6, 10, 21)) == 0
+    assert len(cache) == 0
@@ -0,0 +1,64 @@
+import pytest
+
+from app.services.indexes import load_indexes
+
+
+@pytest.fixture(autouse=True)
+def indexes(db):
+    load_indexes(db)
+
+
+def _suggest(client, q, **params):
+    response = client.get("/api/vendors/suggest", params={"q": q, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def _names(result):
+    return [v["name"] for v in result["vendors"]]
+
+
+def test_suggestions_follow_create_update_and_delete(client, publish, admin_headers):
+    vendor = publish("Smokehouse Express", tags=["bbq"], city="Pittsburgh")
+    assert _names(_suggest(client, "smo")) == ["Smokehouse Express"]
+    assert _names(_suggest(client, "expr")) == ["Smokehouse Express"]
+    assert _suggest(client, "bb")["tags"] == [{"value": "bbq", "count": 1}]
+
+    response = client.patch(f"/api/vendors/{vendor['id']}", json={"name": "Pierogi Palace", "tags": ["polish"]},
+                            headers=admin_headers)
+    assert response.status_code == 200
+    assert _names(_suggest(client, "smo")) == []
+    assert _suggest(client, "bb")["tags"] == []
+    assert _names(_suggest(client, "pal")) == ["Pierogi Palace"]
+
+    assert client.delete(f"/api/vendors/{vendor['id']}", headers=admin_headers).status_code == 204
+    assert _suggest(client, "pier") == {"vendors": [], "tags": [], "cities": [], "categories": []}
+
+
+def test_pending_vendors_are_not_suggested(client, admin_headers):
+    payload = {"name": "Taco Cart", "category": "cart"}
+    assert client.post("/api/vendors", json=payload, headers=admin_headers).status_code == 201
+    assert _names(_suggest(client, "taco")) == []
+
+
+def test_prefix_matches_rank_by_popularity(db, client, make_vendor):
+    make_vendor(name="Taco Town", favorite_count=1)
+    make_vendor(name="Tacos El Gordo", favorite_count=10)
+    make_vendor(name="Tack Shop", review_count=5)
+    make_vendor(name="Burger Tack", review_count=50)
+    make_vendor(name="Waffles", favorite_count=100, tags=["tacos"])
+    load_indexes(db)
+
+    assert _names(_suggest(client, "Tac")) == ["Burger Tack", "Tacos El Gordo", "Tack Shop", "Taco Town"]
+    assert _names(_suggest(client, "taco")) == ["Tacos El Gordo", "Taco Town"]
+    assert _names(_suggest(client, "tac", limit=2)) == ["Burger Tack", "Tacos El Gordo"]
+    # Tag matches suggest the tag, not the vendors carrying it
+    assert _suggest(client, "taco")["tags"] == [{"value": "tacos", "count": 1}]
+
+
+def test_nearby_vendors_rank_above_distant_ones(db, client, make_vendor):
+    make_vendor(name="Taco Near", favorite_count=5, lat=40.44, lng=-79.99)
+    make_vendor(name="Taco Far", favorite_count=6, lat=41.44, lng=-79.99)
+    load_indexes(db)
+    assert _names(_suggest(client, "taco")) == ["Taco Far", "Taco Near"]
+    assert _names(_suggest(client, "taco", lat=40.44, lng=-79.99)) == ["Taco Near", "Taco Far"]
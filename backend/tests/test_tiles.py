@@ -0,0 +1,165 @@
+import math
+import struct
+from datetime import datetime
+
+import pytz
+
+from app.models.hours import VendorHoursWeekly
+from app.services import tile_cache as tile_cache_module
+from app.services.status_cache import status_cache
+from app.utils.geo import mercator_project
+from app.utils.mvt import EXTENT
+
+LAT, LNG = 40.4406, -79.9959
+
+
+def _tile_xy(z, lat=LAT, lng=LNG):
+    mx, my = mercator_project(lat, lng)
+    return math.floor(mx * (1 << z)), math.floor(my * (1 << z))
+
+
+def _tile_url(z=12, dx=0, dy=0):
+    x, y = _tile_xy(z)
+    return f"/api/tiles/{z}/{x + dx}/{y + dy}.mvt"
+
+
+def _fields(data: bytes):
+    """(field number, value) pairs of a protobuf message: varints as ints, the rest as bytes."""
+    i = 0
+    while i < len(data):
+        key, i = _read_varint(data, i)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, i = _read_varint(data, i)
+        elif wire_type == 1:
+            value, i = data[i : i + 8], i + 8
+        else:
+            length, i = _read_varint(data, i)
+            value, i = data[i : i + length], i + length
+        yield field, value
+
+
+def _read_varint(data: bytes, i: int):
+    n = shift = 0
+    while True:
+        byte = data[i]
+        n |= (byte & 0x7F) << shift
+        shift += 7
+        i += 1
+        if byte < 0x80:
+            return n, i
+
+
+def _packed(data: bytes):
+    i, values = 0, []
+    while i < len(data):
+        value, i = _read_varint(data, i)
+        values.append(value)
+    return values
+
+
+def _unzigzag(n: int) -> int:
+    return (n >> 1) ^ -(n & 1)
+
+
+def _decode_value(data: bytes):
+    [(field, value)] = list(_fields(data))
+    if field == 1:
+        return value.decode()
+    if field == 3:
+        return struct.unpack("<d", value)[0]
+    if field == 6:
+        return _unzigzag(value)
+    if field == 7:
+        return bool(value)
+    return value
+
+
+def _decode_tile(data: bytes) -> dict:
+    """{layer name: (extent, [(feature id, (x, y), properties)])} of a point-only vector tile."""
+    layers = {}
+    for field, layer in _fields(data):
+        assert field == 3
+        parts = list(_fields(layer))
+        keys = [v.decode() for f, v in parts if f == 3]
+        values = [_decode_value(v) for f, v in parts if f == 4]
+        features = []
+        for f, raw in parts:
+            if f != 2:
+                continue
+            feature = dict(_fields(raw))
+            assert feature[3] == 1    # POINT
+            command, x, y = _packed(feature[4])
+            assert command == (1 << 3) | 1
+            tags = _packed(feature[2])
+            props = {keys[tags[i]]: values[tags[i + 1]] for i in range(0, len(tags), 2)}
+            features.append((feature[1], (_unzigzag(x), _unzigzag(y)), props))
+        fields = dict(parts)
+        assert fields[15] == 2
+        layers[fields[1].decode()] = (fields[5], features)
+    return layers
+
+
+def _max_age(response) -> int:
+    return int(response.headers["Cache-Control"].split("max-age=")[1])
+
+
+def test_tile_ttl_is_capped_by_next_transition(client, db, make_vendor, monkeypatch):
+    monkeypatch.setattr(tile_cache_module, "TILE_TTL_SECONDS", 7 * 24 * 3600)
+    vendor = make_vendor(lat=LAT, lng=LNG)
+    db.add_all([
+        VendorHoursWeekly(vendor_id=vendor.id, day_of_week=day, start_time_local="09:00", end_time_local="17:00")
+        for day in range(7)
+    ])
+    db.commit()
+
+    response = client.get(_tile_url())
+    assert response.headers["X-Tile-Cache"] == "MISS"
+    transition = status_cache.lookup(db, [vendor])[vendor.id].expires_at
+    until_transition = (transition - datetime.now(pytz.utc)).total_seconds()
+    assert 0 < until_transition <= 24 * 3600
+    assert until_transition - 5 <= _max_age(response) <= until_transition
+
+    cached = client.get(_tile_url())
+    assert cached.headers["X-Tile-Cache"] == "HIT"
+    assert _max_age(cached) <= _max_age(response)
+
+
+def test_tile_ttl_defaults_without_vendors(client):
+    response = client.get(_tile_url())
+    assert tile_cache_module.TILE_TTL_SECONDS - 1 <= _max_age(response) <= tile_cache_module.TILE_TTL_SECONDS
+
+
+def test_expired_transition_is_not_cached():
+    ttl = tile_cache_module.tile_ttl(datetime(2020, 1, 1, tzinfo=pytz.utc))
+    tile = tile_cache_module.tile_cache.put((0, 0, 0), b"x", {1}, ttl)
+    assert tile.max_age() == 0
+    assert tile_cache_module.tile_cache.get((0, 0, 0)) is None
+
+
+def test_tile_holds_the_vendor_feature_and_its_neighbours_do_not(client, db, make_vendor):
+    vendor = make_vendor(lat=LAT, lng=LNG, average_rating=4.5)
+    make_vendor(lat=LAT, lng=LNG, status="pending")
+    z = 14
+    response = client.get(_tile_url(z))
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.mapbox-vector-tile"
+
+    extent, features = _decode_tile(response.content)["vendors"]
+    assert extent == EXTENT
+    [(fid, (x, y), props)] = features
+    assert fid == vendor.id
+    assert props == {
+        "id": vendor.id, "slug": vendor.slug, "category": "food_truck", "is_open": False, "rating": 4.5,
+    }
+    # The point lands where the vendor projects inside the tile
+    mx, my = mercator_project(LAT, LNG)
+    tx, ty = _tile_xy(z)
+    assert (x, y) == (round((mx * (1 << z) - tx) * EXTENT), round((my * (1 << z) - ty) * EXTENT))
+    assert 0 <= x < EXTENT and 0 <= y < EXTENT
+
+    # Well inside the tile (not within the edge buffer), so the adjacent tiles leave it out
+    for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+        neighbour = client.get(_tile_url(z, dx, dy))
+        assert neighbour.status_code == 200
+        assert neighbour.content == b""
@@ -0,0 +1,175 @@
+"""
+Timeline intervals agree with the string-based open status minute by minute,
+including across midnight, at the window edges, on exception days and over DST.
+"""
+
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+import pytz
+
+from app.api.vendors import MAX_TIMELINE_VENDORS
+from app.models.hours import VendorHoursException, VendorHoursWeekly
+from app.services.hours_service import batch_open_intervals, compile_schedules, compute_open_status
+
+NEW_YORK = "America/New_York"
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=pytz.utc)
+
+
+def _rows(vendor_id, start, end, days=range(7)):
+    return [SimpleNamespace(vendor_id=vendor_id, day_of_week=d, is_closed=False, interval_index=0,
+                            start_time_local=start, end_time_local=end) for d in days]
+
+
+def _inside(intervals, at):
+    return any(a <= at < b for a, b in intervals)
+
+
+def _check_against_status(intervals, start, end, status_at, step=timedelta(minutes=15)):
+    assert all(start <= a < b <= end for a, b in intervals)
+    assert all(b < c for (_, b), (c, _) in zip(intervals, intervals[1:]))   # merged, in order
+    edges = [t for a, b in intervals for t in (a, a - timedelta(minutes=1), b, b - timedelta(minutes=1))]
+    at = start
+    probes = []
+    while at < end:
+        probes.append(at)
+        at += step
+    for at in probes + [t for t in edges if start <= t < end]:
+        assert _inside(intervals, at) == status_at(at).is_open, at
+
+
+def _timeline(weekly, exceptions, start, end, timezone=NEW_YORK):
+    v = SimpleNamespace(id=1, timezone=timezone)
+    intervals = batch_open_intervals(compile_schedules([v], weekly, exceptions).values(), start, end)[1]
+    _check_against_status(intervals, start, end,
+                          lambda at: compute_open_status(1, timezone, weekly, exceptions, at))
+    return intervals
+
+
+def test_overnight_hours_are_one_interval_across_midnight():
+    intervals = _timeline(_rows(1, "22:00", "02:00"), [], _utc(2026, 6, 10, 12), _utc(2026, 6, 13, 12))
+    # 22:00–02:00 EDT
+    assert intervals == [
+        (_utc(2026, 6, 11, 2), _utc(2026, 6, 11, 6)),
+        (_utc(2026, 6, 12, 2), _utc(2026, 6, 12, 6)),
+        (_utc(2026, 6, 13, 2), _utc(2026, 6, 13, 6)),
+    ]
+
+
+def test_intervals_are_clipped_to_the_window():
+    weekly = _rows(1, "09:00", "17:00")
+    # Window opens at 12:00 EDT and closes at 15:30 EDT two days later
+    intervals = _timeline(weekly, [], _utc(2026, 6, 10, 16), _utc(2026, 6, 12, 19, 30))
+    assert intervals == [
+        (_utc(2026, 6, 10, 16), _utc(2026, 6, 10, 21)),
+        (_utc(2026, 6, 11, 13), _utc(2026, 6, 11, 21)),
+        (_utc(2026, 6, 12, 13), _utc(2026, 6, 12, 19, 30)),
+    ]
+    # A window that closes exactly at opening time holds nothing of that day
+    assert _timeline(weekly, [], _utc(2026, 6, 10, 21), _utc(2026, 6, 11, 13)) == []
+
+
+def test_exceptions_replace_the_weekly_hours():
+    weekly = _rows(1, "09:00", "17:00")
+    exceptions = [
+        SimpleNamespace(vendor_id=1, exception_date=date(2026, 6, 11), is_closed=True,
+                        start_time_local=None, end_time_local=None),
+        SimpleNamespace(vendor_id=1, exception_date=date(2026, 6, 12), is_closed=False,
+                        start_time_local="20:00", end_time_local="01:00"),
+    ]
+    intervals = _timeline(weekly, exceptions, _utc(2026, 6, 10, 12), _utc(2026, 6, 14, 4))
+    assert intervals == [
+        (_utc(2026, 6, 10, 13), _utc(2026, 6, 10, 21)),
+        # 20:00–01:00 on the 12th reads as 00:00–01:00 and 20:00–24:00 of that date
+        (_utc(2026, 6, 12, 4), _utc(2026, 6, 12, 5)),
+        (_utc(2026, 6, 13, 0), _utc(2026, 6, 13, 4)),
+        (_utc(2026, 6, 13, 13), _utc(2026, 6, 13, 21)),
+    ]
+
+
+def test_dst_switches_move_the_utc_intervals():
+    # Spring forward on 2026-03-08 and fall back on 2026-11-01 in New York
+    spring = _timeline(_rows(1, "01:00", "04:00"), [], _utc(2026, 3, 7), _utc(2026, 3, 9))
+    assert spring == [(_utc(2026, 3, 7, 6), _utc(2026, 3, 7, 9)), (_utc(2026, 3, 8, 6), _utc(2026, 3, 8, 8))]
+    fall = _timeline(_rows(1, "00:00", "01:30"), [], _utc(2026, 11, 1), _utc(2026, 11, 2))
+    assert fall == [(_utc(2026, 11, 1, 4), _utc(2026, 11, 1, 5, 30)), (_utc(2026, 11, 1, 6), _utc(2026, 11, 1, 6, 30))]
+
+
+# ─── Endpoint ───────────────────────────────────────────────────────────────
+
+def _get_timeline(client, ids, **params):
+    response = client.get("/api/vendors/timeline", params={"ids": ",".join(map(str, ids)), **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def _parse(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+@pytest.fixture
+def stalls(client, make_vendor, admin_headers):
+    today = date.today()
+    schedules = {
+        "overnight": ("22:00", "02:00", []),
+        "daytime": ("09:00", "17:00", [
+            {"exception_date": str(today + timedelta(days=1)), "is_closed": True},
+            {"exception_date": str(today + timedelta(days=2)), "start_time_local": "18:00",
+             "end_time_local": "03:00"},
+        ]),
+    }
+    vendors = {}
+    for name, (start, end, exceptions) in schedules.items():
+        vendor = make_vendor(name=name, timezone="Europe/London")
+        week = [{"day_of_week": d, "start_time_local": start, "end_time_local": end} for d in range(7)]
+        assert client.put(f"/api/vendors/{vendor.id}/hours/weekly", json=week, headers=admin_headers).status_code == 200
+        for exc in exceptions:
+            response = client.post(f"/api/vendors/{vendor.id}/hours/exceptions", json=exc, headers=admin_headers)
+            assert response.status_code == 201
+        vendors[name] = vendor
+    return vendors
+
+
+def test_endpoint_intervals_match_open_status(db, client, stalls):
+    ids = [v.id for v in stalls.values()]
+    body = _get_timeline(client, ids + [999999, ids[0]])
+    start, end = _parse(body["start"]), _parse(body["end"])
+    assert end - start == timedelta(days=7)
+    assert [v["vendor_id"] for v in body["vendors"]] == ids   # unknown skipped, duplicates dropped
+
+    weekly, exceptions = db.query(VendorHoursWeekly).all(), db.query(VendorHoursException).all()
+    for entry in body["vendors"]:
+        intervals = [(_parse(i["opens_at"]), _parse(i["closes_at"])) for i in entry["intervals"]]
+        _check_against_status(intervals, start, end, lambda at: compute_open_status(
+            entry["vendor_id"], entry["timezone"], weekly, exceptions, at))
+
+    overnight = next(v for v in body["vendors"] if v["vendor_id"] == stalls["overnight"].id)
+    london = pytz.timezone("Europe/London")
+    spans_midnight = [
+        i for i in overnight["intervals"]
+        if _parse(i["opens_at"]).astimezone(london).date() != _parse(i["closes_at"]).astimezone(london).date()
+    ]
+    assert len(spans_midnight) >= 6
+
+
+def test_endpoint_days_limits_the_window(client, stalls):
+    body = _get_timeline(client, [stalls["daytime"].id], days=1)
+    start, end = _parse(body["start"]), _parse(body["end"])
+    assert end - start == timedelta(days=1)
+    assert all(start <= _parse(i["opens_at"]) < _parse(i["closes_at"]) <= end for i in body["vendors"][0]["intervals"])
+    assert client.get("/api/vendors/timeline", params={"ids": "1", "days": 8}).status_code == 422
+
+
+def test_endpoint_caps_the_number_of_vendors(client, stalls):
+    ids = list(range(1, MAX_TIMELINE_VENDORS + 1))
+    assert len(_get_timeline(client, ids)["vendors"]) == len(stalls)
+    too_many = ",".join(map(str, range(1, MAX_TIMELINE_VENDORS + 2)))
+    assert client.get("/api/vendors/timeline", params={"ids": too_many}).status_code == 400
+    # Duplicates count once
+    assert client.get("/api/vendors/timeline", params={"ids": ",".join(["1"] * (MAX_TIMELINE_VENDORS + 1))}).status_code == 200
+    assert client.get("/api/vendors/timeline", params={"ids": "1,x"}).status_code == 400
+    assert _get_timeline(client, [])["vendors"] == []
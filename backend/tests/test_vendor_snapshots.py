@@ -0,0 +1,118 @@
+import pytest
+
+from app.config import settings
+from app.models.vendor import Vendor
+from app.services.vendor_snapshots import VendorSnapshotCache, vendor_snapshots
+from app.services.vendor_versions import bump_version
+
+
+@pytest.fixture
+def snapshots():
+    return VendorSnapshotCache()
+
+
+@pytest.fixture
+def fresh(monkeypatch):
+    """Every snapshot stays within the staleness budget."""
+    monkeypatch.setattr(settings, "VENDOR_CACHE_STALENESS_SECONDS", 3600.0)
+
+
+@pytest.fixture
+def stale(monkeypatch):
+    """Every snapshot is past the staleness budget."""
+    monkeypatch.setattr(settings, "VENDOR_CACHE_STALENESS_SECONDS", -1.0)
+
+
+def _rename_elsewhere(session_factory, vendor_id, name):
+    """A write committed by another worker: versioned, but this process's snapshots are not dropped."""
+    other = session_factory()
+    try:
+        other.query(Vendor).filter(Vendor.id == vendor_id).update({Vendor.name: name})
+        bump_version(other, vendor_id)
+        other.commit()
+    finally:
+        other.close()
+
+
+def test_hit_within_budget_issues_no_sql(db, make_vendor, snapshots, count_queries, fresh):
+    vendor = make_vendor(name="Smokehouse")
+    first = snapshots.get(db, vendor.id)
+    with count_queries() as statements:
+        assert snapshots.get(db, vendor.id) is first
+        assert snapshots.get(db, slug=vendor.slug) is first
+    assert statements == []
+    assert snapshots.stats()["hits"] == 2
+
+
+def test_hit_past_budget_revalidates_with_one_query(db, make_vendor, snapshots, count_queries, stale):
+    vendor = make_vendor(name="Smokehouse")
+    first = snapshots.get(db, vendor.id)
+    with count_queries() as statements:
+        assert snapshots.get(db, vendor.id) is first
+    assert len(statements) == 1 and "vendor_versions" in statements[0]
+    assert snapshots.validations == 1 and snapshots.misses == 1
+
+
+def test_write_from_another_session_is_seen_after_the_version_bump(
+        db, session_factory, make_vendor, snapshots, monkeypatch, fresh):
+    vendor = make_vendor(name="Smokehouse")
+    old = snapshots.get(db, vendor.id)
+    _rename_elsewhere(session_factory, vendor.id, "Pierogi Palace")
+
+    request = session_factory()   # each request reads through its own session
+    try:
+        # Within the budget the old snapshot is still served
+        assert snapshots.get(request, vendor.id) is old
+
+        monkeypatch.setattr(settings, "VENDOR_CACHE_STALENESS_SECONDS", -1.0)
+        new = snapshots.get(request, vendor.id)
+        assert new.name == "Pierogi Palace" and new.version == old.version + 1
+        assert old.name == "Smokehouse"   # snapshots are never mutated
+        assert snapshots.get(request, slug=vendor.slug).name == "Pierogi Palace"
+    finally:
+        request.close()
+
+
+def test_byte_budget_evicts_the_least_recently_used(db, make_vendor, count_queries, fresh):
+    vendors = [make_vendor(name=f"Vendor {i}", description="x" * 2000) for i in range(3)]
+    sizes = [VendorSnapshotCache().get(db, v.id).size for v in vendors]
+    snapshots = VendorSnapshotCache(max_bytes=sizes[0] + sizes[1] + min(sizes) // 2)
+
+    first, second = snapshots.get(db, vendors[0].id), snapshots.get(db, vendors[1].id)
+    snapshots.get(db, vendors[0].id)   # vendors[1] is now the oldest entry
+    assert len(snapshots) == 2
+    snapshots.get(db, vendors[2].id)
+    assert len(snapshots) == 2
+    assert snapshots.bytes == sizes[0] + sizes[2] <= snapshots.max_bytes
+
+    with count_queries() as statements:
+        assert snapshots.get(db, vendors[0].id) is first
+    assert statements == []
+    with count_queries() as statements:
+        reloaded = snapshots.get(db, slug=vendors[1].slug)
+    assert statements and reloaded is not second and reloaded.id == vendors[1].id
+
+
+def test_local_writes_drop_the_snapshot(db, client, make_vendor, admin_headers, fresh):
+    vendor = make_vendor(name="Smokehouse")
+    old = vendor_snapshots.get(db, vendor.id)
+    response = client.patch(f"/api/vendors/{vendor.id}", json={"name": "Taco Cart"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert vendor_snapshots.get(db, vendor.id).name == "Taco Cart"
+    assert vendor_snapshots.get(db, vendor.id) is not old
+
+
+def test_vendor_deleted_elsewhere_is_dropped(db, session_factory, make_vendor, snapshots, stale):
+    vendor = make_vendor()
+    snapshots.get(db, vendor.id)
+    other = session_factory()
+    other.delete(other.get(Vendor, vendor.id))
+    other.commit()
+    other.close()
+
+    request = session_factory()
+    try:
+        assert snapshots.get(request, vendor.id) is None
+    finally:
+        request.close()
+    assert len(snapshots) == 0 and snapshots.bytes == 0
@@ -2,6 +2,9 @@ import axios from "axios";
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
 
+// Mapbox GL vector source template for vendor pins
+export const VENDOR_TILES_URL = `${API_URL}/api/tiles/{z}/{x}/{y}.mvt`;
+
 export const api = axios.create({
   baseURL: API_URL,
   headers: { "Content-Type": "application/json" },
@@ -64,6 +67,53 @@ export interface VendorSummary {
   open_status_label?: string;
 }
 
+export interface VendorSuggestions {
+  vendors: { id: number; name: string; slug: string; category: string; city?: string }[];
+  tags: { value: string; count: number }[];
+  cities: { value: string; count: number }[];
+  categories: { value: string; count: number }[];
+}
+
+export interface VendorFacets {
+  total: number;
+  categories: Record<string, number>;
+  tags: Record<string, number>;
+}
+
+export interface VendorMapCluster {
+  id: string;
+  count: number;
+  latitude: number;
+  longitude: number;
+  expansion_zoom: number;
+}
+
+export interface VendorMapPoint {
+  id: number;
+  slug: string;
+  name: string;
+  category: string;
+  latitude: number;
+  longitude: number;
+}
+
+export interface VendorMapView {
+  zoom: number;
+  clusters: VendorMapCluster[];
+  points: VendorMapPoint[];
+}
+
+export interface VendorOpenInterval {
+  opens_at: string;   // ISO 8601, UTC
+  closes_at: string;
+}
+
+export interface VendorTimeline {
+  start: string;
+  end: string;
+  vendors: { vendor_id: number; timezone: string; intervals: VendorOpenInterval[] }[];
+}
+
 export interface VendorDetail extends VendorSummary {
   description?: string;
   address?: string;
@@ -150,6 +200,14 @@ export const vendorApi = {
     api.get<VendorSummary[]>("/api/vendors/search", { params }),
   featured: (params?: { lat?: number; lng?: number; limit?: number }) =>
     api.get<VendorSummary[]>("/api/vendors/featured", { params }),
+  suggest: (params: { q: string; lat?: number; lng?: number; limit?: number }) =>
+    api.get<VendorSuggestions>("/api/vendors/suggest", { params }),
+  facets: (params: Record<string, unknown>) =>
+    api.get<VendorFacets>("/api/vendors/facets", { params }),
+  map: (params: { bbox: string; zoom: number }) =>
+    api.get<VendorMapView>("/api/vendors/map", { params }),
+  timeline: (ids: number[], days?: number) =>
+    api.get<VendorTimeline>("/api/vendors/timeline", { params: { ids: ids.join(","), days } }),
   getBySlug: (slug: string, params?: { lat?: number; lng?: number }) =>
     api.get<VendorDetail>(`/api/vendors/${slug}`, { params }),
   create: (data: unknown) => api.post<VendorDetail>("/api/vendors", data),